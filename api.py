@@ -0,0 +1,346 @@
+import argparse
+import asyncio
+import base64
+import binascii
+import gzip
+import hashlib
+import json
+import os
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import parse_qs
+
+from backends import BACKEND
+from changelog import ChangeFeed
+from db_pool import ConnectionPool, PoolTimeout
+from pagination import VIEW_TABLES, fetch_page
+from queries import REGISTRY, QUERIES_BY_ID
+from query_cache import ResultCache
+from query_engine import run_query
+from reservation import ReservationError, reserve
+
+# JSON API over the same tables and queries as the Streamlit app, for the mobile app and
+# partner systems. A plain ASGI application with no framework, served by any ASGI server:
+#
+#     uvicorn api:app --workers 4
+#
+# The handlers are async; every database call runs in a worker thread on a pooled
+# connection, so one slow query never holds up the event loop. Responses carry an ETag
+# (a 304 is sent when If-None-Match still matches) and are gzipped when the client accepts it
+#
+#     GET  /tables                        the tables and their columns
+#     GET  /tables/<table>?sort=&desc=1&limit=&after=
+#                                         one keyset page, "next" is the after= of the next page
+#     GET  /queries                       the 15 queries with their parameters
+#     GET  /queries/<id>?City=..&history=all&since=YYYY-MM-DD&until=YYYY-MM-DD
+#     POST /claims {"food_id", "receiver_id", "quantity", "claim_id"}
+#                                         reserves food from a listing, see reservation.py
+#     GET  /health
+
+POOL_SIZE = int(os.environ.get("FOOD_API_POOL_SIZE", "16"))
+MAX_PAGE_SIZE = 500
+
+# Bodies smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+
+# Tables by URL name, e.g. /tables/food_listings
+TABLES = {spec["table"]: spec for spec in VIEW_TABLES.values()}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class State:
+    """The connection pool and result cache of one server process, opened on first use."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool = None
+        self.cache = ResultCache(ttl=300, max_entries=512)
+        self.feed = None
+
+    def start_feed(self):
+        # Cached results are dropped when any process writes to their tables (changelog.py)
+        if self.feed is None and not BACKEND.read_only:
+            self.feed = ChangeFeed(self.fetch)
+            self.feed.subscribe(lambda change: self.cache.invalidate_tables(change["table"]),
+                                on_resync=self.cache.clear)
+            self.feed.start()
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ConnectionPool(connect=BACKEND.connect, size=POOL_SIZE)
+            return self._pool
+
+    def fetch(self, query, params=None):
+        with (self.pool.prepared(query) if params else self.pool.cursor()) as cursor:
+            cursor.execute(query, params or ())
+            return cursor.fetchall()
+
+    def cached_fetch(self, query_id, query, tables, params=None):
+        return self.cache.get_or_load(query_id, lambda: self.fetch(query, params), tables, params)
+
+    def close(self):
+        if self.feed is not None:
+            self.feed.stop()
+            self.feed = None
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+
+
+STATE = State()
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "item"):
+        # numpy scalars from the query DataFrames
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_cursor(after):
+    return base64.urlsafe_b64encode(json.dumps(after, default=_json_default).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    # A cursor is the [sort value, key] of the last row on the previous page
+    try:
+        after = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (ValueError, TypeError, binascii.Error):
+        after = None
+    if not isinstance(after, list) or len(after) != 2:
+        raise HTTPError(400, "after is not a cursor returned by this API")
+    return tuple(after)
+
+
+def _one(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+
+def _whole_number(value, name, low=None, high=None):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"{name} must be a whole number")
+    if (low is not None and number < low) or (high is not None and number > high):
+        raise HTTPError(400, f"{name} must be between {low} and {high}")
+    return number
+
+
+# Handlers, called in a worker thread with (query string values, JSON body) and returning
+# (status, payload)
+
+def list_tables(query, body):
+    return 200, {"tables": [{"name": name, "key": spec["key"], "columns": spec["columns"]}
+                            for name, spec in TABLES.items()]}
+
+
+def read_table(query, body, table):
+    spec = TABLES.get(table)
+    if spec is None:
+        raise HTTPError(404, f"No table {table}")
+
+    sort = _one(query, "sort", spec["key"])
+    descending = _one(query, "desc", "0") in ("1", "true")
+    limit = _whole_number(_one(query, "limit", "50"), "limit", 1, MAX_PAGE_SIZE)
+    after = _one(query, "after")
+    after = decode_cursor(after) if after else None
+
+    def fetch(sql, params):
+        # Pages are cached like query results and dropped by writes to the table
+        return STATE.cached_fetch(f"page:{table}:{sort}:{int(descending)}", sql, [table], params)
+
+    try:
+        rows, next_after = fetch_page(fetch, spec, sort, descending, limit, after)
+    except ValueError as e:
+        raise HTTPError(400, str(e))
+
+    return 200, {
+        "table": table,
+        "rows": [dict(zip(spec["columns"], row)) for row in rows],
+        "next": encode_cursor(next_after) if next_after else None,
+    }
+
+
+def list_queries(query, body):
+    return 200, {"queries": [{"id": spec["id"], "title": spec["title"], "params": spec.get("params", {}),
+                              "statements": [statement["id"] for statement in spec["statements"]]}
+                             for spec in REGISTRY]}
+
+
+def read_query(query, body, query_id):
+    spec = QUERIES_BY_ID.get(query_id)
+    if spec is None:
+        raise HTTPError(404, f"No query {query_id}")
+
+    params = {name: _one(query, name, default) for name, default in spec.get("params", {}).items()}
+    try:
+        window = {
+            "history": "all" if _one(query, "history") == "all" else None,
+            "since": date.fromisoformat(_one(query, "since")) if _one(query, "since") else None,
+            "until": date.fromisoformat(_one(query, "until")) if _one(query, "until") else None,
+        }
+    except ValueError:
+        raise HTTPError(400, "since and until must be dates as YYYY-MM-DD")
+
+    results = run_query(STATE.cached_fetch, spec, params, use_summaries=BACKEND.use_summaries, window=window)
+    return 200, {
+        "id": spec["id"],
+        "title": spec["title"],
+        "params": params,
+        "results": {statement_id: df.to_dict("records") for statement_id, df in results.items()},
+    }
+
+
+def create_claim(query, body):
+    if BACKEND.read_only:
+        raise HTTPError(403, f"Claims cannot be created on the {BACKEND.name} snapshot")
+    if not isinstance(body, dict):
+        raise HTTPError(400, "Expected a JSON object")
+
+    food_id = _whole_number(body.get("food_id"), "food_id")
+    receiver_id = _whole_number(body.get("receiver_id"), "receiver_id")
+    quantity = _whole_number(body.get("quantity", 1), "quantity", 1, 10 ** 6)
+    claim_id = body.get("claim_id")
+    claim_id = None if claim_id is None else _whole_number(claim_id, "claim_id")
+
+    try:
+        with STATE.pool.connection() as conn:
+            result = reserve(conn, food_id, receiver_id, quantity, claim_id=claim_id)
+    except ReservationError as e:
+        raise HTTPError(409, str(e))
+
+    # The feed would drop these within a poll; a client reading back its claim sees it now
+    STATE.cache.invalidate_tables("food_listings", "claims")
+    return 201, result
+
+
+def health(query, body):
+    return 200, {"status": "ok", "backend": BACKEND.label, "pool": STATE.pool.stats(), "cache": STATE.cache.stats(),
+                 "change_feed": STATE.feed.stats() if STATE.feed else None}
+
+
+# (method, first path segment, takes a second segment) -> handler
+ROUTES = {
+    ("GET", "tables", False): list_tables,
+    ("GET", "tables", True): read_table,
+    ("GET", "queries", False): list_queries,
+    ("GET", "queries", True): read_query,
+    ("POST", "claims", False): create_claim,
+    ("GET", "health", False): health,
+}
+
+
+def route(method, path):
+    # Returns (handler, path arguments)
+    parts = [part for part in path.split("/") if part]
+    if not parts or len(parts) > 2:
+        raise HTTPError(404, f"No route {path}")
+
+    handler = ROUTES.get((method, parts[0], len(parts) == 2))
+    if handler is None:
+        if any(key[1:] == (parts[0], len(parts) == 2) for key in ROUTES):
+            raise HTTPError(405, f"{method} is not allowed on {path}")
+        raise HTTPError(404, f"No route {path}")
+    return handler, parts[1:]
+
+
+def render(status, payload, request_headers):
+    # (status, headers, body) with an ETag over the JSON and gzip when accepted
+    body = json.dumps(payload, default=_json_default, separators=(",", ":")).encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = [(b"content-type", b"application/json"), (b"vary", b"Accept-Encoding")]
+
+    if status == 200:
+        headers += [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+        if_none_match = request_headers.get("if-none-match", "")
+        if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match == "*":
+            return 304, [(b"etag", etag.encode()), (b"vary", b"Accept-Encoding")], b""
+
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request_headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=5)
+        headers.append((b"content-encoding", b"gzip"))
+
+    headers.append((b"content-length", str(len(body)).encode()))
+    return status, headers, body
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+def _startup():
+    STATE.pool.warm(2)
+    STATE.start_feed()
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await asyncio.to_thread(_startup)
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await asyncio.to_thread(STATE.close)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+    if scope["type"] != "http":
+        return
+
+    headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope["headers"]}
+    raw_body = await _read_body(receive)
+
+    try:
+        handler, args = route(scope["method"], scope["path"])
+        query = parse_qs(scope.get("query_string", b"").decode())
+        try:
+            body = json.loads(raw_body) if raw_body else None
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        status, payload = await asyncio.to_thread(handler, query, body, *args)
+
+    except HTTPError as e:
+        status, payload = e.status, {"error": str(e)}
+    except PoolTimeout:
+        status, payload = 503, {"error": "All database connections are busy, try again"}
+    except Exception as e:
+        status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+    status, response_headers, response_body = render(status, payload, headers)
+    await send({"type": "http.response.start", "status": status, "headers": response_headers})
+    await send({"type": "http.response.body", "body": response_body})
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="server processes, each with its own pool")
+    args = parser.parse_args()
+
+    uvicorn.run("api:app", host=args.host, port=args.port, workers=args.workers)
@@ -0,0 +1,116 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from changelog import record_changes
+from crud import TABLE_COLUMNS
+from summaries import apply_deltas
+
+# Cold claims: same columns as claims plus when they were moved. No foreign keys, so listings
+# and receivers can still be deleted once their claims are history
+ARCHIVE_DDL = """
+CREATE TABLE IF NOT EXISTS claims_archive (
+    Claim_ID INT PRIMARY KEY,
+    Food_ID INT,
+    Receiver_ID INT,
+    Status VARCHAR(100),
+    Timestamp DATETIME,
+    Archived_At DATETIME,
+
+    INDEX idx_claims_archive_timestamp (Timestamp),
+    INDEX idx_claims_archive_status_food (Status, Food_ID),
+    INDEX idx_claims_archive_receiver_status (Receiver_ID, Status)
+)
+"""
+
+# Finished claims only; pending ones stay hot until they complete or the sweeper cancels them.
+# Rows another transaction holds are skipped and picked up by the next run
+ARCHIVABLE_CLAIMS_QUERY = """
+select {columns} from claims
+where Timestamp < %s and Status in ('Completed', 'Cancelled')
+order by Timestamp, Claim_ID
+limit %s
+for update skip locked
+"""
+
+
+def archive_batch(conn, before, batch_size=1000):
+    # One short transaction: copy up to batch_size old claims to claims_archive, delete them
+    # from claims and take them out of the claim summaries. Returns the number moved.
+    _, columns = TABLE_COLUMNS["claims"]
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(ARCHIVABLE_CLAIMS_QUERY.format(columns=", ".join(columns)), (before, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            conn.rollback()
+            return 0
+
+        now = datetime.now()
+        cursor.executemany(
+            f"insert into claims_archive ({', '.join(columns)}, Archived_At) "
+            f"values ({', '.join(['%s'] * (len(columns) + 1))})",
+            [tuple(row) + (now,) for row in rows],
+        )
+        cursor.execute(
+            f"delete from claims where Claim_ID in ({', '.join(['%s'] * len(rows))})",
+            tuple(row[0] for row in rows),
+        )
+
+        # Summaries describe the hot table, which is what the default dashboard reads
+        apply_deltas(cursor, "claims", [dict(zip(columns, row)) for row in rows], [])
+        record_changes(cursor, "claims", "delete", [row[0] for row in rows])
+        conn.commit()
+        return len(rows)
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+
+
+def archive_claims(conn, before, batch_size=1000, pause=0.0, log=print):
+    # Moves every finished claim made before `before` in batches; returns the per-batch reports
+    reports = []
+
+    while True:
+        start = time.perf_counter()
+        moved = archive_batch(conn, before, batch_size)
+        if not moved:
+            break
+
+        report = {"batch": len(reports) + 1, "archived": moved, "seconds": round(time.perf_counter() - start, 3)}
+        reports.append(report)
+        log(f"batch {report['batch']}: {report['archived']} claims archived in {report['seconds']}s")
+
+        if moved < batch_size:
+            break
+        # Leaves room for other writers between batches
+        time.sleep(pause)
+
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move finished claims older than a cutoff to claims_archive")
+    parser.add_argument("--older-than-days", type=int, default=90)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds to sleep between batches")
+    args = parser.parse_args()
+
+    from db_pool import mysql_connect
+
+    connection = mysql_connect()
+    cutoff = datetime.now() - timedelta(days=args.older_than_days)
+
+    try:
+        run_start = time.perf_counter()
+        batches = archive_claims(connection, cutoff, args.batch_size, args.pause)
+        print(f"Archived {sum(b['archived'] for b in batches)} claims made before {cutoff:%Y-%m-%d %H:%M} "
+              f"in {len(batches)} batches, {time.perf_counter() - run_start:.2f}s")
+
+    finally:
+        connection.close()
@@ -0,0 +1,289 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from pagination import ROW_ESTIMATE_QUERY
+
+# Where the app reads from. MySQL is the default and the only backend that takes writes;
+# "sqlite" and "duckdb" serve the read-only pages from an embedded file built from the CSVs
+# or copied from MySQL by `python backends.py build`, so the dashboard runs with no server.
+# Selected with FOOD_BACKEND=mysql|sqlite|duckdb and FOOD_DB_PATH=<file>. The app imports
+# this module on every cold start, so pandas and the loaders are only imported to build a file
+
+EMBEDDED_BACKENDS = ["sqlite", "duckdb"]
+DEFAULT_PATHS = {"sqlite": "food.sqlite", "duckdb": "food.duckdb"}
+
+# Portable versions of the migrations.py tables. City compares case-insensitively, as it
+# does under MySQL's default collation, so the P & R Filters and query3 behave the same
+EMBEDDED_SCHEMA = {
+    "providers": """Provider_ID integer primary key, Name varchar, Type varchar, Address varchar,
+        City varchar collate nocase, Contact varchar""",
+    "receivers": """Receiver_ID integer primary key, Name varchar, Type varchar,
+        City varchar collate nocase, Contact varchar""",
+    "food_listings": """Food_ID integer primary key, Food_Name varchar, Quantity integer, Expiry_Date date,
+        Provider_ID integer, Provider_Type varchar, Location varchar, Food_Type varchar, Meal_Type varchar""",
+    "claims": """Claim_ID integer primary key, Food_ID integer, Receiver_ID integer, Status varchar,
+        Timestamp timestamp""",
+    "claims_archive": """Claim_ID integer primary key, Food_ID integer, Receiver_ID integer, Status varchar,
+        Timestamp timestamp, Archived_At timestamp""",
+}
+
+DATE_COLUMNS = {"Expiry_Date", "Timestamp", "Archived_At"}
+
+# SQLite gets the lookup and join indexes of migrations.py; DuckDB scans columns and its
+# aggregates gain nothing from them, so it is left without
+SQLITE_INDEXES = [
+    ("providers", "idx_providers_city", ["City"]),
+    ("receivers", "idx_receivers_city", ["City"]),
+    ("claims", "idx_claims_status_food", ["Status", "Food_ID"]),
+    ("claims", "idx_claims_receiver_status", ["Receiver_ID", "Status"]),
+    ("claims", "idx_claims_timestamp", ["Timestamp"]),
+    ("food_listings", "idx_food_provider_quantity", ["Provider_ID", "Quantity"]),
+    ("food_listings", "idx_food_expiry", ["Expiry_Date"]),
+]
+
+# Dates go in as ISO text and come back as date/datetime, like they do from MySQL
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_converter("date", lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter("timestamp", lambda value: datetime.fromisoformat(value.decode()))
+
+
+def translate(query):
+    # The repo's SQL uses mysql.connector's %s placeholders, both embedded engines take ?
+    return query.replace("%s", "?")
+
+
+class EmbeddedCursor:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def execute(self, query, params=()):
+        self._cursor.execute(translate(query), tuple(params or ()))
+        return self
+
+    def executemany(self, query, rows):
+        self._cursor.executemany(translate(query), rows)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def close(self):
+        self._cursor.close()
+
+
+class EmbeddedConnection:
+    """Read-only DB-API connection over sqlite3 or DuckDB that accepts the repo's SQL.
+
+    cursor() takes no options, so the pool's prepared cursors and export's unbuffered
+    cursors fall back to plain ones. There are no transactions to end on a read-only file,
+    so commit and rollback do nothing.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return EmbeddedCursor(self._conn.cursor())
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self._conn.close()
+
+
+class Backend:
+    def __init__(self, name="mysql", path=None):
+        if name != "mysql" and name not in EMBEDDED_BACKENDS:
+            raise ValueError(f"Unknown backend {name}, expected mysql, {' or '.join(EMBEDDED_BACKENDS)}")
+
+        self.name = name
+        self.path = path or DEFAULT_PATHS.get(name)
+        self.read_only = name != "mysql"
+
+        # The summary tables are kept current by crud.py writes on MySQL only, the embedded
+        # file has the base tables and the queries aggregate them directly
+        self.use_summaries = not self.read_only
+
+        self._duckdb = None
+        self._lock = threading.Lock()
+
+    @property
+    def label(self):
+        return "MySQL" if self.name == "mysql" else f"{self.name} snapshot {self.path} (read-only)"
+
+    def connect(self):
+        # Zero-argument connection factory for ConnectionPool
+        if self.name == "mysql":
+            from db_pool import mysql_connect
+
+            return mysql_connect()
+
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"{self.path} not found, create it with "
+                                    f"`python backends.py build {self.name} --out {self.path}`")
+
+        if self.name == "sqlite":
+            uri = Path(self.path).resolve().as_uri() + "?mode=ro"
+            return EmbeddedConnection(sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                                      detect_types=sqlite3.PARSE_DECLTYPES))
+
+        # A DuckDB file is opened once per process; every pooled connection is a cursor on it
+        with self._lock:
+            if self._duckdb is None:
+                import duckdb
+
+                # NULLs sort as in MySQL, which keyset paging (pagination.py) relies on
+                self._duckdb = duckdb.connect(self.path, read_only=True,
+                                              config={"default_null_order": "nulls_first_on_asc_last_on_desc"})
+            return EmbeddedConnection(self._duckdb.cursor())
+
+    def row_count_query(self, table):
+        # (sql, params) for the View Tables row count: InnoDB's estimate on MySQL, an exact
+        # count on the embedded file where counting is cheap
+        if self.name == "mysql":
+            return ROW_ESTIMATE_QUERY, (table,)
+        return f"select count(*) from {table}", None
+
+
+def from_env(environ=os.environ):
+    return Backend(environ.get("FOOD_BACKEND", "mysql").lower(), environ.get("FOOD_DB_PATH"))
+
+
+BACKEND = from_env()
+
+
+def _create(conn):
+    cursor = conn.cursor()
+    for table, columns in EMBEDDED_SCHEMA.items():
+        cursor.execute(f"create table {table} ({columns})")
+    cursor.close()
+
+
+def _append(conn, name, table, frame):
+    import pandas as pd
+
+    if frame.empty:
+        return
+    if name == "duckdb":
+        for column in DATE_COLUMNS.intersection(frame.columns):
+            frame[column] = pd.to_datetime(frame[column])
+        conn.append(table, frame)
+    else:
+        rows = frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+        conn.executemany(f"insert into {table} values ({', '.join(['?'] * len(frame.columns))})", rows)
+
+
+def _copy_csv(conn, name, data_dir, chunksize, log):
+    # Same checks as the MySQL bulk load, rejected rows are counted and left out
+    import pandas as pd
+
+    from bulk_loader import TABLE_SPECS
+    from validation import ValidationState, validate_chunk
+
+    state = ValidationState()
+    for spec in TABLE_SPECS:
+        loaded = rejected = 0
+        for chunk in pd.read_csv(os.path.join(data_dir, spec["csv"]), chunksize=chunksize):
+            accepted, bad = validate_chunk(chunk, spec, state)
+            _append(conn, name, spec["table"], accepted.reset_index(drop=True))
+            loaded += len(accepted)
+            rejected += len(bad)
+        log(f"{spec['table']}: {loaded} rows copied, {rejected} rejected")
+
+
+def _copy_mysql(conn, name, source, chunksize, log):
+    import pandas as pd
+
+    from export import iter_chunks, table_source
+
+    for table in EMBEDDED_SCHEMA:
+        query, params, columns = table_source(table)
+        copied = 0
+        for rows in iter_chunks(source, query, params, chunksize):
+            _append(conn, name, table, pd.DataFrame(rows, columns=columns))
+            copied += len(rows)
+        log(f"{table}: {copied} rows copied")
+
+
+def build(name, path, source="csv", data_dir=".", chunksize=100000, log=print):
+    # Writes a fresh file next to `path` and swaps it in when complete, so a running app
+    # never opens a half-built snapshot. source is "csv" or "mysql"
+    if name not in EMBEDDED_BACKENDS:
+        raise ValueError(f"Can only build {' or '.join(EMBEDDED_BACKENDS)} files")
+
+    start = time.perf_counter()
+    building = f"{path}.building"
+    for leftover in (building, f"{building}.wal"):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+
+    if name == "duckdb":
+        import duckdb
+
+        conn = duckdb.connect(building)
+    else:
+        conn = sqlite3.connect(building)
+
+    try:
+        _create(conn)
+        if source == "mysql":
+            from db_pool import mysql_connect
+
+            mysql = mysql_connect()
+            try:
+                _copy_mysql(conn, name, mysql, chunksize, log)
+            finally:
+                mysql.close()
+        else:
+            _copy_csv(conn, name, data_dir, chunksize, log)
+
+        if name == "sqlite":
+            for table, index, columns in SQLITE_INDEXES:
+                conn.execute(f"create index {index} on {table} ({', '.join(columns)})")
+            conn.execute("analyze")
+            conn.commit()
+
+    finally:
+        conn.close()
+
+    os.replace(building, path)
+    log(f"Built {path} in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the embedded read-only database for the dashboard")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("backend", choices=EMBEDDED_BACKENDS)
+    parser.add_argument("--out", help="file to write (default food.sqlite / food.duckdb)")
+    parser.add_argument("--source", choices=["csv", "mysql"], default="csv",
+                        help="the four CSV files or a snapshot of the MySQL tables")
+    parser.add_argument("--data-dir", default=".", help="CSV directory for --source csv")
+    parser.add_argument("--chunksize", type=int, default=100000)
+    args = parser.parse_args()
+
+    build(args.backend, args.out or DEFAULT_PATHS[args.backend], args.source, args.data_dir, args.chunksize)
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+from bulk_loader import TABLE_SPECS
+from changelog import record_changes
+from crud import TABLE_COLUMNS, fetch_rows, release_reservations
+from summaries import apply_deltas
+from validation import KeySet, ValidationState, validate_chunk
+
+# Many inserts, updates and deletes on one table applied as a single transaction. A batch is
+# a DataFrame of text cells: an Operation column (insert, update or delete) plus the table's
+# columns. Inserts give every column, updates give the key and the columns to change (blank
+# cells keep their value) and deletes only need the key. Every row is checked before anything
+# is written, and one bad row means nothing is applied
+
+OPERATIONS = ["insert", "update", "delete"]
+
+# The bulk load checks, with dates in the formats the CRUD forms use
+BATCH_SPECS = {
+    spec["table"]: dict(spec, dates={column: (target, target) for column, (_, target) in spec["dates"].items()})
+    for spec in TABLE_SPECS
+}
+
+PAST_TENSE = {"insert": "inserted", "update": "updated", "delete": "deleted"}
+
+
+def batch_template(table):
+    # Empty batch with the expected header, for the download button and the editable grid
+    _, columns = TABLE_COLUMNS[table]
+    return pd.DataFrame(columns=["Operation"] + columns, dtype=str)
+
+
+def _blank(value):
+    return value is None or (isinstance(value, float) and np.isnan(value)) or str(value).strip() == ""
+
+
+def _full_row(batch, position, columns, current):
+    # The row as it will be written: the batch's non-blank cells over the current values
+    row = {}
+    for column in columns:
+        if column in batch.columns and not _blank(batch.at[position, column]):
+            row[column] = str(batch.at[position, column]).strip()
+        else:
+            row[column] = None if current.get(column) is None else str(current[column])
+    return row
+
+
+def _existing_keys(cursor, table, keys):
+    # Keys of `table` among `keys`, read on the batch's transaction
+    key, _ = TABLE_COLUMNS[table]
+    found = KeySet()
+    keys = sorted(set(keys))
+    for start in range(0, len(keys), 1000):
+        part = keys[start:start + 1000]
+        cursor.execute(f"select {key} from {table} where {key} in ({', '.join(['%s'] * len(part))})", tuple(part))
+        found.add([row[0] for row in cursor.fetchall()])
+    return found
+
+
+def _execute_rows(cursor, table, operations):
+    # The statements of a batch, all rows of a kind in one executemany
+    key, columns = TABLE_COLUMNS[table]
+    inserts = [values for operation, values in operations if operation == "insert"]
+    updates = [values for operation, values in operations if operation == "update"]
+    deletes = [values for operation, values in operations if operation == "delete"]
+
+    if inserts:
+        cursor.executemany(
+            f"insert into {table} ({', '.join(columns)}) values ({', '.join(['%s'] * len(columns))})", inserts)
+    if updates:
+        assignments = ", ".join(f"{column} = %s" for column in columns if column != key)
+        cursor.executemany(f"update {table} set {assignments} where {key} = %s",
+                           [values[1:] + values[:1] for values in updates])
+    if deletes:
+        cursor.executemany(f"delete from {table} where {key} = %s", [values[:1] for values in deletes])
+
+
+def apply_batch(conn, table, batch):
+    # Returns (outcome per batch row as a DataFrame, whether the batch was committed).
+    # Row numbers start at 1 for the first batch row
+    key, columns = TABLE_COLUMNS[table]
+    spec = BATCH_SPECS[table]
+
+    batch = batch.reset_index(drop=True)
+    outcomes = pd.DataFrame({
+        "Row": np.arange(1, len(batch) + 1),
+        "Operation": batch.get("Operation", pd.Series([""] * len(batch))).fillna("").astype(str)
+                          .str.strip().str.lower(),
+        "Key": batch.get(key, pd.Series([None] * len(batch))),
+        "Outcome": "",
+        "Message": "",
+    })
+
+    def reject(mask, message):
+        mask = np.asarray(mask, dtype=bool)
+        outcomes.loc[mask, "Message"] = np.where(outcomes.loc[mask, "Message"] == "", message,
+                                                 outcomes.loc[mask, "Message"] + "; " + message)
+
+    operations = outcomes["Operation"]
+    reject(~operations.isin(OPERATIONS), f"Operation must be one of {', '.join(OPERATIONS)}")
+
+    keys = pd.to_numeric(outcomes["Key"], errors="coerce")
+    bad_key = keys.isna() | (keys != keys.round())
+    reject(bad_key, f"{key} is not a whole number")
+    keys = keys.where(~bad_key).astype("Int64")
+    outcomes["Key"] = keys
+    reject(keys.duplicated(keep=False) & keys.notna(), f"{key} appears more than once in the batch")
+
+    cursor = conn.cursor()
+    try:
+        # Rows to update or delete are locked until the batch commits or rolls back
+        valid_keys = [int(value) for value in keys.dropna()]
+        old_rows = {row[key]: row for row in fetch_rows(cursor, table, valid_keys)}
+        exists = keys.map(lambda value: pd.notna(value) and int(value) in old_rows).astype(bool)
+        reject((operations == "insert") & exists, f"{key} already exists")
+        reject(operations.isin(["update", "delete"]) & ~exists & keys.notna(), f"{key} not found")
+
+        # Inserts and updates become full rows (updates filled in from the current row) and go
+        # through the same checks as a bulk load
+        writes = (operations.isin(["insert", "update"]) & keys.notna()).to_numpy()
+        positions = np.flatnonzero(writes)
+        full_rows = pd.DataFrame(
+            [_full_row(batch, position, columns, old_rows.get(int(keys[position]), {})) for position in positions],
+            columns=columns, index=positions, dtype=object)
+
+        accepted = full_rows.iloc[0:0]
+        if len(full_rows):
+            parents = {}
+            for column, parent in spec.get("foreign_keys", {}).items():
+                values = pd.to_numeric(full_rows[column], errors="coerce").dropna()
+                parents[parent] = _existing_keys(cursor, parent, [int(value) for value in values])
+
+            state = ValidationState()
+            state.accepted.update(parents)
+            accepted, rejected = validate_chunk(full_rows, spec, state)
+            for position, reason in zip(rejected.index, rejected["Reject_Reason"]):
+                reject(np.arange(len(batch)) == position, reason)
+
+        if (outcomes["Message"] != "").any():
+            conn.rollback()
+            outcomes["Outcome"] = np.where(outcomes["Message"] != "", "rejected", "not applied")
+            return outcomes, False
+
+        # Plain Python values in the database formats, in batch order
+        rows = accepted.astype(object).where(accepted.notna(), None)
+        values_at = dict(zip(rows.index, rows.itertuples(index=False, name=None)))
+        ordered = [(operation, values_at.get(position, (int(keys[position]),)))
+                   for position, operation in enumerate(operations)]
+
+        try:
+            if table == "claims":
+                # Pending claims cancelled or deleted by the batch give their food back
+                status = columns.index("Status")
+                release_reservations(cursor, {values[0]: values[status] if operation == "update" else None
+                                              for operation, values in ordered if operation in ("update", "delete")})
+            _execute_rows(cursor, table, ordered)
+            old = [old_rows[values[0]] for operation, values in ordered if operation in ("update", "delete")]
+            new = [dict(zip(columns, values)) for operation, values in ordered if operation in ("insert", "update")]
+            apply_deltas(cursor, table, old, new)
+            for operation in OPERATIONS:
+                record_changes(cursor, table, operation, [values[0] for kind, values in ordered if kind == operation])
+            conn.commit()
+
+        except Exception as e:
+            conn.rollback()
+            messages = _failing_rows(conn, table, ordered)
+            outcomes["Message"] = messages if messages else f"Batch failed: {e}"
+            outcomes["Outcome"] = np.where(pd.Series(messages or [""] * len(batch)) != "", "failed", "rolled back")
+            return outcomes, False
+
+        outcomes["Outcome"] = operations.map(PAST_TENSE)
+        return outcomes, True
+
+    finally:
+        cursor.close()
+
+
+def _failing_rows(conn, table, ordered):
+    # After a failed batch: replays it one row at a time in a transaction that is always
+    # rolled back, to find which rows the database refuses. Returns a message per batch row
+    messages = [""] * len(ordered)
+    cursor = conn.cursor()
+    try:
+        for position, operation in enumerate(ordered):
+            try:
+                _execute_rows(cursor, table, [operation])
+            except Exception as e:
+                messages[position] = str(e)
+    finally:
+        conn.rollback()
+        cursor.close()
+
+    return messages if any(messages) else None
@@ -0,0 +1,288 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from bulk_loader import TABLE_SPECS, load_all
+from crud import delete_row, insert_row, update_field
+from pagination import VIEW_TABLES, fetch_page
+from queries import REGISTRY
+from query_engine import bind_params, statement_params, statement_sql
+
+# Synthetic FOOD data at production-like sizes and timings of the queries, the bulk load,
+# CRUD writes and View Tables paging against a scratch database. Results are written as
+# JSON tagged with the git commit so runs can be compared across commits
+
+# Scale name -> number of food listings and claims; providers and receivers are a tenth of that
+SCALES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+CHUNK_ROWS = 500_000
+
+FOOD_NAMES = ["Bread", "Soup", "Fruits", "Vegetables", "Dairy", "Rice", "Pasta", "Salad", "Chicken", "Fish"]
+PROVIDER_TYPES = ["Restaurant", "Supermarket", "Grocery Store", "Catering Service"]
+RECEIVER_TYPES = ["NGO", "Individual", "Shelter", "Charity"]
+FOOD_TYPES = ["Vegetarian", "Non-Vegetarian", "Vegan"]
+MEAL_TYPES = ["Breakfast", "Lunch", "Dinner", "Snacks"]
+STATUSES = ["Completed", "Pending", "Cancelled"]
+PHONE_FORMATS = ["+1-{a}-{b}-{c}", "({a}){b}-{c}", "{a}.{b}.{c}", "001-{a}-{b}-{c}x{e}", "{a}{b}{c}"]
+
+
+def zipf_weights(count, exponent=1.1):
+    # A few cities and providers get most of the rows, like real listing data
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+
+def _phones(rng, count):
+    parts = rng.integers(0, 10_000, size=(count, 4))
+    formats = rng.integers(0, len(PHONE_FORMATS), size=count)
+    return [
+        PHONE_FORMATS[f].format(a=f"{a % 1000:03d}", b=f"{b % 1000:03d}", c=f"{c:04d}", e=e % 1000)
+        for f, (a, b, c, e) in zip(formats, parts)
+    ]
+
+
+def generate(scale, out_dir, seed=42):
+    # Writes the four CSV files in the same layout as the shipped ones; returns the row counts
+    rng = np.random.default_rng(seed)
+    rows = SCALES[scale]
+    people = max(100, rows // 10)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {spec["table"]: os.path.join(out_dir, spec["csv"]) for spec in TABLE_SPECS}
+
+    cities = np.array([f"City {i}" for i in range(max(50, people // 20))])
+    city_weights = zipf_weights(len(cities))
+
+    provider_city = rng.choice(len(cities), size=people, p=city_weights)
+    provider_type = rng.choice(len(PROVIDER_TYPES), size=people, p=[0.4, 0.3, 0.2, 0.1])
+    pd.DataFrame({
+        "Provider_ID": np.arange(1, people + 1),
+        "Name": [f"Provider {i}" for i in range(1, people + 1)],
+        "Type": np.array(PROVIDER_TYPES)[provider_type],
+        "Address": [f"{i} Market Street" for i in range(1, people + 1)],
+        "City": cities[provider_city],
+        "Contact": _phones(rng, people),
+    }).to_csv(paths["providers"], index=False)
+
+    pd.DataFrame({
+        "Receiver_ID": np.arange(1, people + 1),
+        "Name": [f"Receiver {i}" for i in range(1, people + 1)],
+        "Type": rng.choice(RECEIVER_TYPES, size=people),
+        "City": cities[rng.choice(len(cities), size=people, p=city_weights)],
+        "Contact": _phones(rng, people),
+    }).to_csv(paths["receivers"], index=False)
+
+    # Listings and claims are written a chunk at a time so 10M rows fit in memory
+    provider_weights = zipf_weights(people, exponent=0.9)
+    base_day = np.datetime64("2025-03-01")
+
+    for start in range(0, rows, CHUNK_ROWS):
+        count = min(CHUNK_ROWS, rows - start)
+        providers = rng.choice(people, size=count, p=provider_weights)
+        expiry = base_day + rng.integers(-30, 30, size=count).astype("timedelta64[D]")
+
+        pd.DataFrame({
+            "Food_ID": np.arange(start + 1, start + count + 1),
+            "Food_Name": rng.choice(FOOD_NAMES, size=count),
+            "Quantity": rng.integers(1, 51, size=count),
+            "Expiry_Date": pd.to_datetime(expiry).strftime("%m/%d/%Y"),
+            "Provider_ID": providers + 1,
+            "Provider_Type": np.array(PROVIDER_TYPES)[provider_type[providers]],
+            "Location": cities[provider_city[providers]],
+            "Food_Type": rng.choice(FOOD_TYPES, size=count),
+            "Meal_Type": rng.choice(MEAL_TYPES, size=count),
+        }).to_csv(paths["food_listings"], index=False, mode="w" if start == 0 else "a", header=start == 0)
+
+        minutes = rng.integers(-90 * 24 * 60, 0, size=count).astype("timedelta64[m]")
+        pd.DataFrame({
+            "Claim_ID": np.arange(start + 1, start + count + 1),
+            "Food_ID": rng.integers(1, rows + 1, size=count),
+            "Receiver_ID": rng.choice(people, size=count, p=zipf_weights(people, exponent=0.7)) + 1,
+            "Status": rng.choice(STATUSES, size=count, p=[0.4, 0.3, 0.3]),
+            "Timestamp": pd.to_datetime(base_day + minutes).strftime("%m/%d/%Y %H:%M"),
+        }).to_csv(paths["claims"], index=False, mode="w" if start == 0 else "a", header=start == 0)
+
+    return {"providers": people, "receivers": people, "food_listings": rows, "claims": rows}
+
+
+def _timings(samples):
+    samples_ms = sorted(s * 1000 for s in samples)
+    return {
+        "runs": len(samples_ms),
+        "min_ms": round(samples_ms[0], 3),
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "p95_ms": round(samples_ms[min(len(samples_ms) - 1, int(0.95 * len(samples_ms)))], 3),
+        "max_ms": round(samples_ms[-1], 3),
+    }
+
+
+def _run(conn, query, params=()):
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.rollback()
+
+
+def bench_queries(conn, repeat=5):
+    # Every registry statement, on the base tables and (where it has one) on its summary
+    results = {}
+    for spec in REGISTRY:
+        values = bind_params(spec)
+        for statement in spec["statements"]:
+            variants = [("base", False)] + ([("summary", True)] if statement.get("summary_sql") else [])
+            for variant, use_summaries in variants:
+                query = statement_sql(statement, use_summaries)
+                params = statement_params(statement, values)
+
+                samples, rows = [], 0
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    rows = len(_run(conn, query, params))
+                    samples.append(time.perf_counter() - start)
+
+                results[f"{statement['id']}:{variant}"] = dict(_timings(samples), rows=rows)
+    return results
+
+
+def bench_crud(conn, count=200):
+    # Insert, update and delete of claims on rows above the generated ids, one commit each
+    def fetch(query, params=()):
+        return _run(conn, query, params)
+
+    first_id = fetch("select coalesce(max(Claim_ID), 0) from claims")[0][0] + 1
+    food_id = fetch("select min(Food_ID) from food_listings")[0][0]
+    receiver_id = fetch("select min(Receiver_ID) from receivers")[0][0]
+    samples = {"insert": [], "update": [], "delete": []}
+
+    def timed(operation, write, *args):
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        try:
+            write(cursor, "claims", *args)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        samples[operation].append(time.perf_counter() - start)
+
+    for claim_id in range(first_id, first_id + count):
+        timed("insert", insert_row, (claim_id, food_id, receiver_id, "Pending", datetime.now()))
+    for claim_id in range(first_id, first_id + count):
+        timed("update", update_field, claim_id, "Status", "Completed")
+    for claim_id in range(first_id, first_id + count):
+        timed("delete", delete_row, claim_id)
+
+    return {operation: _timings(values) for operation, values in samples.items()}
+
+
+def bench_view_tables(conn, pages=10, page_size=50):
+    # First page and walking `pages` pages deep, sorted by key and by another column
+    results = {}
+    for spec in VIEW_TABLES.values():
+        for sort_column in (spec["key"], spec["columns"][-1]):
+            samples, after = [], None
+            for _ in range(pages):
+                start = time.perf_counter()
+                _, after = fetch_page(lambda q, p=None: _run(conn, q, p or ()), spec, sort_column, False,
+                                      page_size, after)
+                samples.append(time.perf_counter() - start)
+                if after is None:
+                    break
+            results[f"{spec['table']}:{sort_column}"] = dict(_timings(samples), first_page_ms=round(samples[0] * 1000, 3))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def prepare_database(database, data_dir, log=print):
+    # Fresh scratch database with the current migrations, loaded from the generated CSVs
+    from db_pool import mysql_connect
+    from migrations import migrate
+
+    server = mysql_connect(database=None)
+    cursor = server.cursor()
+    cursor.execute(f"drop database if exists {database}")
+    cursor.execute(f"create database {database}")
+    cursor.close()
+    server.close()
+
+    conn = mysql_connect(database=database)
+    migrate(conn, log=log)
+
+    start = time.perf_counter()
+    # load_all also rebuilds the summary tables, so the time includes them
+    reports = load_all(conn, data_dir, reject_dir=os.path.join(data_dir, "rejected"), on_duplicate="ignore")
+    total = time.perf_counter() - start
+
+    load = {
+        report["table"]: dict(report, rows_per_second=round(report["loaded"] / report["seconds"])
+                              if report["seconds"] else None)
+        for report in reports
+    }
+    load["total_seconds"] = round(total, 3)
+    return conn, load
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic FOOD data and benchmark against it")
+    parser.add_argument("command", choices=["generate", "run"])
+    parser.add_argument("--scale", choices=list(SCALES), default="10k")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", help="CSV directory (default bench_data/<scale>)")
+    parser.add_argument("--database", default="FOOD_BENCH", help="scratch database, dropped and recreated")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query")
+    parser.add_argument("--crud-ops", type=int, default=200)
+    parser.add_argument("--results", default="bench_results", help="directory for the JSON results")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or os.path.join("bench_data", args.scale)
+
+    if args.command == "generate" or not os.path.exists(os.path.join(data_dir, "claims_data.csv")):
+        generate_start = time.perf_counter()
+        counts = generate(args.scale, data_dir, args.seed)
+        print(f"Generated {counts} in {data_dir} in {time.perf_counter() - generate_start:.1f}s")
+        if args.command == "generate":
+            raise SystemExit
+
+    connection, load_results = prepare_database(args.database, data_dir)
+    print(f"Loaded in {load_results['total_seconds']}s")
+
+    results = {
+        "commit": git_commit(),
+        "scale": args.scale,
+        "seed": args.seed,
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "load": load_results,
+        "queries": bench_queries(connection, args.repeat),
+        "crud": bench_crud(connection, args.crud_ops),
+        "view_tables": bench_view_tables(connection),
+    }
+    connection.close()
+
+    os.makedirs(args.results, exist_ok=True)
+    path = os.path.join(args.results, f"{results['scale']}-{results['commit']}-{datetime.now():%Y%m%d%H%M%S}.json")
+    with open(path, "w") as handle:
+        json.dump(results, handle, indent=2)
+
+    for name, timing in results["queries"].items():
+        print(f"{name:<24} median {timing['median_ms']:>10} ms  rows {timing['rows']}")
+    print(f"Results written to {path}")
@@ -0,0 +1,180 @@
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from summaries import rebuild
+from validation import ValidationState, database_keys, validate_chunk
+
+# CSV sources in foreign key order: parents are loaded before the tables that reference them.
+# The checks validation.py runs: "integers" columns must be whole numbers, "foreign_keys" must
+# exist in the parent table, plus "non_negative", "allowed" values, "phones" and "dates"
+TABLE_SPECS = [
+    {
+        "table": "providers",
+        "csv": "providers_data.csv",
+        "columns": ["Provider_ID", "Name", "Type", "Address", "City", "Contact"],
+        "key": "Provider_ID",
+        "dates": {},
+        "phones": ["Contact"],
+    },
+    {
+        "table": "receivers",
+        "csv": "receivers_data.csv",
+        "columns": ["Receiver_ID", "Name", "Type", "City", "Contact"],
+        "key": "Receiver_ID",
+        "dates": {},
+        "phones": ["Contact"],
+    },
+    {
+        "table": "food_listings",
+        "csv": "food_listings_data.csv",
+        "columns": ["Food_ID", "Food_Name", "Quantity", "Expiry_Date", "Provider_ID",
+                    "Provider_Type", "Location", "Food_Type", "Meal_Type"],
+        "key": "Food_ID",
+        # column: (format in the CSV, format MySQL expects)
+        "dates": {"Expiry_Date": ("%m/%d/%Y", "%Y-%m-%d")},
+        "integers": ["Quantity", "Provider_ID"],
+        "non_negative": ["Quantity"],
+        "foreign_keys": {"Provider_ID": "providers"},
+    },
+    {
+        "table": "claims",
+        "csv": "claims_data.csv",
+        "columns": ["Claim_ID", "Food_ID", "Receiver_ID", "Status", "Timestamp"],
+        "key": "Claim_ID",
+        "dates": {"Timestamp": ("%m/%d/%Y %H:%M", "%Y-%m-%d %H:%M:%S")},
+        "integers": ["Food_ID", "Receiver_ID"],
+        "allowed": {"Status": ["Pending", "Completed", "Cancelled"]},
+        "foreign_keys": {"Food_ID": "food_listings", "Receiver_ID": "receivers"},
+    },
+]
+
+
+def insert_statement(spec, on_duplicate="reject", placeholder="%s"):
+    columns = spec["columns"]
+    values = ", ".join([placeholder] * len(columns))
+    verb = "INSERT IGNORE" if on_duplicate == "ignore" else "INSERT"
+    query = f"{verb} INTO {spec['table']} ({', '.join(columns)}) VALUES ({values})"
+
+    # Nightly snapshot reloads overwrite rows that are already present
+    if on_duplicate == "replace":
+        updates = ", ".join(f"{col} = VALUES({col})" for col in columns if col != spec["key"])
+        query += f" ON DUPLICATE KEY UPDATE {updates}"
+
+    return query
+
+
+def prepare_chunk(chunk, spec, state):
+    # Whole-column validation; rows failing any check are rejected before reaching the database
+    accepted, rejected = validate_chunk(chunk, spec, state)
+
+    # Plain Python objects with None for NULL, which every DB-API driver accepts
+    accepted = accepted.astype(object).where(accepted.notna(), None)
+    return list(accepted.itertuples(index=False, name=None)), rejected
+
+
+def write_rejects(rejected, path):
+    if rejected.empty:
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    rejected.to_csv(path, mode="a", index=False, header=not os.path.exists(path))
+
+
+def insert_batch(conn, query, rows):
+    # Returns the rows the database refused together with the error text
+    cursor = conn.cursor()
+    try:
+        try:
+            cursor.executemany(query, rows)
+            conn.commit()
+            return []
+
+        except Exception:
+            conn.rollback()
+
+        # The batch failed as a whole, retry row by row to isolate the bad records
+        failed = []
+        for row in rows:
+            try:
+                cursor.execute(query, row)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                failed.append((row, str(e)))
+
+        return failed
+
+    finally:
+        cursor.close()
+
+
+def load_table(conn, spec, data_dir=".", chunksize=50000, batch_size=1000,
+               reject_dir="rejected", on_duplicate="reject", placeholder="%s", state=None):
+    start = time.perf_counter()
+    state = state or ValidationState()
+    query = insert_statement(spec, on_duplicate, placeholder)
+    reject_path = os.path.join(reject_dir, f"{spec['table']}_rejected.csv")
+
+    if os.path.exists(reject_path):
+        os.remove(reject_path)
+
+    loaded = 0
+    rejected_count = 0
+
+    # Stream the CSV so memory stays bounded by the chunk size
+    for chunk in pd.read_csv(os.path.join(data_dir, spec["csv"]), chunksize=chunksize):
+        rows, rejected = prepare_chunk(chunk, spec, state)
+        write_rejects(rejected, reject_path)
+        rejected_count += len(rejected)
+
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            failed = insert_batch(conn, query, batch)
+
+            if failed:
+                failed_df = pd.DataFrame([row for row, _ in failed], columns=spec["columns"])
+                failed_df["Record"] = None
+                failed_df["Reject_Reason"] = [error for _, error in failed]
+                write_rejects(failed_df, reject_path)
+
+            loaded += len(batch) - len(failed)
+            rejected_count += len(failed)
+
+    return {
+        "table": spec["table"],
+        "loaded": loaded,
+        "rejected": rejected_count,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def load_all(conn, data_dir=".", **options):
+    # Foreign keys may point at rows loaded earlier in this run or already in the database
+    state = ValidationState(database_keys(conn, {spec["table"]: spec["key"] for spec in TABLE_SPECS}))
+    reports = [load_table(conn, spec, data_dir, state=state, **options) for spec in TABLE_SPECS]
+
+    # Bulk inserts bypass crud.py, so the dashboard summaries are recomputed once at the end
+    rebuild(conn)
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk load the four CSV files into the FOOD database")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--chunksize", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--reject-dir", default="rejected")
+    parser.add_argument("--on-duplicate", choices=["reject", "ignore", "replace"], default="reject")
+    args = parser.parse_args()
+
+    from db_pool import mysql_connect
+
+    connection = mysql_connect()
+    for report in load_all(connection, args.data_dir, chunksize=args.chunksize, batch_size=args.batch_size,
+                           reject_dir=args.reject_dir, on_duplicate=args.on_duplicate):
+        print(f"{report['table']}: {report['loaded']} loaded, {report['rejected']} rejected "
+              f"in {report['seconds']}s")
+
+    connection.close()
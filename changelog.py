@@ -0,0 +1,306 @@
+import argparse
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+# Ordered log of committed row changes (an outbox). Every write path appends one entry per
+# changed row on its own cursor, so the entry commits or rolls back with the write itself.
+# A ChangeFeed tails the log and hands each change to its subscribers: caches drop what the
+# changed table feeds and the in-memory indexes re-read the row. Writes made by other
+# processes (the API, the sweeper, another app server) reach every process the same way,
+# and only this small table is read to find them, never the base tables
+
+CHANGE_LOG_DDL = """
+CREATE TABLE IF NOT EXISTS change_log (
+    Change_ID BIGINT AUTO_INCREMENT PRIMARY KEY,
+    Table_Name VARCHAR(64) NOT NULL,
+    Row_Key INT NOT NULL,
+    Operation VARCHAR(10) NOT NULL,
+    Changed_At DATETIME(3) NOT NULL,
+
+    INDEX idx_change_log_changed (Changed_At)
+)
+"""
+
+CHANGES_AFTER = """
+select Change_ID, Table_Name, Row_Key, Operation, Changed_At from change_log
+where Change_ID > %s
+order by Change_ID
+limit %s
+"""
+
+CHANGES_IN_RANGES = """
+select Change_ID, Table_Name, Row_Key, Operation, Changed_At from change_log
+where {ranges}
+"""
+
+LAST_CHANGE = "select coalesce(max(Change_ID), 0) from change_log"
+
+# Ids are handed out when a transaction inserts its entries but show up when it commits, so
+# a skipped id may still arrive from a slower transaction. Skipped ids are looked for again
+# for this long. After that they most likely belong to rolled back transactions, but a
+# longer transaction cannot be told apart, so the subscribers are asked to resync
+GAP_WAIT = 60.0
+
+# Skipped ids are tracked as ranges, so a large transaction committing late costs one range.
+# At most MAX_GAPS ranges are kept (dropping one also resyncs the subscribers), and they are
+# looked for GAP_BATCH ranges per query
+MAX_GAPS = 1000
+GAP_BATCH = 200
+
+log = logging.getLogger("food.change_feed")
+
+OPERATIONS = ("insert", "update", "delete")
+
+
+def record_changes(cursor, table, operation, keys):
+    # Appends one entry per key; call on the cursor of the write, before its commit
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown change operation {operation}")
+    keys = list(keys)
+    if not keys:
+        return
+
+    now = datetime.now()
+    cursor.executemany(
+        "insert into change_log (Table_Name, Row_Key, Operation, Changed_At) values (%s, %s, %s, %s)",
+        [(table, key, operation, now) for key in keys],
+    )
+
+
+class ChangeFeed:
+    """Delivers change_log entries in id order to callbacks subscribed in this process.
+
+    A background thread polls for entries past the last one delivered; a writer calls
+    poll() right after its commit so its own change is applied before the page reruns.
+    Each change is a dict with "id", "table", "key", "operation" and "changed_at". When
+    changes may have been missed, each subscriber's on_resync() is called instead, to
+    reload what it keeps from the tables.
+    """
+
+    def __init__(self, fetch, interval=0.5, batch_size=1000, history=50):
+        # fetch(query, params) -> rows
+        self._fetch = fetch
+        self.interval = interval
+        self.batch_size = batch_size
+
+        self._subscribers = {}
+        self._next_token = 0
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # Changes already in the log are part of the state every subscriber loads
+        self.position = self._fetch(LAST_CHANGE, None)[0][0]
+
+        # Skipped change ids not seen yet: [(first, last, time to stop looking for them)]
+        self._gaps = []
+
+        self.recent = deque(maxlen=history)
+        self.delivered = 0
+        self.errors = 0
+        self.polls = 0
+        self.expired_gaps = 0
+        self.resyncs = 0
+
+    def subscribe(self, callback, tables=None, on_resync=None):
+        # Returns a token for unsubscribe; `tables` limits the changes passed to callback
+        with self._lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (callback, None if tables is None else set(tables), on_resync)
+            return self._next_token
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def _dispatch(self, change):
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback, tables, _ in subscribers:
+            if tables is None or change["table"] in tables:
+                try:
+                    callback(change)
+                except Exception:
+                    # One failing subscriber must not hold back the others or the feed
+                    self.errors += 1
+
+    def _deliver(self, row):
+        change_id, table, key, operation, changed_at = row
+        change = {"id": change_id, "table": table, "key": key, "operation": operation, "changed_at": changed_at}
+        self._dispatch(change)
+        self.recent.append(change)
+
+    def _resync(self, reason):
+        log.warning("Changes may have been missed (%s), resyncing subscribers", reason)
+        self.resyncs += 1
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for _, _, on_resync in subscribers:
+            if on_resync is not None:
+                try:
+                    on_resync()
+                except Exception:
+                    self.errors += 1
+                    log.exception("Resync of a change feed subscriber failed")
+
+    def _skip(self, first, last):
+        # Ids first..last were passed over by the change just read
+        self._gaps.append((first, last, time.monotonic() + GAP_WAIT))
+        if len(self._gaps) > MAX_GAPS:
+            dropped = self._gaps[:-MAX_GAPS]
+            self._gaps = self._gaps[-MAX_GAPS:]
+            self.expired_gaps += sum(last - first + 1 for first, last, _ in dropped)
+            self._resync(f"more than {MAX_GAPS} ranges of skipped change ids")
+
+    def _fill_gaps(self):
+        # Late commits of skipped ids are delivered out of order; subscribers re-read rows by
+        # key, so the order of changes to different rows does not matter to them
+        now = time.monotonic()
+        expired = [gap for gap in self._gaps if gap[2] <= now]
+        if expired:
+            self._gaps = [gap for gap in self._gaps if gap[2] > now]
+            missing = sum(last - first + 1 for first, last, _ in expired)
+            self.expired_gaps += missing
+            self._resync(f"{missing} change ids from {expired[0][0]} not committed within {GAP_WAIT:.0f}s")
+
+        found = []
+        for start in range(0, len(self._gaps), GAP_BATCH):
+            part = self._gaps[start:start + GAP_BATCH]
+            ranges = " or ".join(["Change_ID between %s and %s"] * len(part))
+            rows = self._fetch(CHANGES_IN_RANGES.format(ranges=ranges),
+                               tuple(bound for first, last, _ in part for bound in (first, last)))
+            for row in sorted(rows):
+                found.append(row[0])
+                self._deliver(row)
+
+        if found:
+            found.sort()
+            self._gaps = [piece for gap in self._gaps for piece in _without(gap, found)]
+        return len(found)
+
+    def poll(self):
+        # Delivers every change past the current position, and skipped ones that have since
+        # committed; returns how many there were
+        with self._poll_lock:
+            self.polls += 1
+            delivered = self._fill_gaps()
+            while True:
+                rows = self._fetch(CHANGES_AFTER, (self.position, self.batch_size))
+                for row in rows:
+                    if row[0] > self.position + 1:
+                        self._skip(self.position + 1, row[0] - 1)
+                    self._deliver(row)
+                    self.position = row[0]
+                delivered += len(rows)
+                if len(rows) < self.batch_size:
+                    break
+
+            self.delivered += delivered
+            return delivered
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                # The database is unreachable for now; the next poll picks up where this one stopped
+                self.errors += 1
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="change-feed", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self):
+        last = self.recent[-1]["changed_at"] if self.recent else None
+        return {
+            "position": self.position,
+            "subscribers": len(self._subscribers),
+            "delivered": self.delivered,
+            "polls": self.polls,
+            "waiting_for": sum(last - first + 1 for first, last, _ in self._gaps),
+            "expired_gaps": self.expired_gaps,
+            "resyncs": self.resyncs,
+            "errors": self.errors,
+            "last_change_age_s": round((datetime.now() - last).total_seconds(), 1) if last else None,
+        }
+
+
+def _without(gap, found):
+    # The parts of a (first, last, until) gap left once the sorted ids in `found` are taken out
+    first, last, until = gap
+    pieces, start = [], first
+    for change_id in found[bisect.bisect_left(found, first):bisect.bisect_right(found, last)]:
+        if change_id > start:
+            pieces.append((start, change_id - 1, until))
+        start = change_id + 1
+    if start <= last:
+        pieces.append((start, last, until))
+    return pieces
+
+
+def trim(conn, keep_hours=24, batch_size=5000, log=print):
+    # Deletes entries older than keep_hours in small batches. Every running feed has read
+    # them long before, since feeds poll every second or so
+    cutoff = datetime.now() - timedelta(hours=keep_hours)
+    cursor = conn.cursor()
+    deleted = 0
+    try:
+        while True:
+            cursor.execute("delete from change_log where Changed_At < %s order by Change_ID limit %s",
+                           (cutoff, batch_size))
+            conn.commit()
+            deleted += cursor.rowcount
+            if cursor.rowcount < batch_size:
+                break
+    finally:
+        cursor.close()
+
+    log(f"Removed {deleted} change_log entries older than {cutoff:%Y-%m-%d %H:%M}")
+    return deleted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or trim the change log")
+    parser.add_argument("command", choices=["tail", "trim"])
+    parser.add_argument("--keep-hours", type=float, default=24.0, help="trim: entries to keep")
+    parser.add_argument("--interval", type=float, default=0.5, help="tail: seconds between polls")
+    args = parser.parse_args()
+
+    from db_pool import mysql_connect
+    from query_engine import connection_fetch
+
+    connection = mysql_connect()
+    if args.command == "trim":
+        trim(connection, args.keep_hours)
+    else:
+        # Prints changes as they are committed, until interrupted
+        connection_query = connection_fetch(connection)
+
+        def fetch_changes(query, params):
+            # A fresh snapshot each poll under REPEATABLE READ
+            connection.commit()
+            return connection_query(None, query, None, params)
+
+        feed = ChangeFeed(fetch_changes, interval=args.interval)
+        feed.subscribe(lambda change: print(f"{change['changed_at']:%H:%M:%S.%f} #{change['id']} "
+                                            f"{change['operation']} {change['table']} {change['key']}"))
+        try:
+            while True:
+                feed.poll()
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            pass
+    connection.close()
@@ -0,0 +1,102 @@
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from profiling import trace
+from query_engine import make_chart
+
+
+def data_version(df):
+    # Content hash of a query result; a chart is re-rendered only when its data changes
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """Rendered chart images keyed by chart id and data version, bounded by count and bytes."""
+
+    def __init__(self, max_entries=64, max_bytes=32 * 1024 * 1024, image_format="png", dpi=100):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.image_format = image_format
+        self.dpi = dpi
+
+        self._images = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.renders = 0
+        self.figures_open = 0
+        self.render_ms_total = 0.0
+        self.render_ms_last = 0.0
+
+    def render(self, chart_id, chart, df):
+        key = (chart_id, data_version(df))
+
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+
+        start = time.perf_counter()
+        with trace("plot", chart_id):
+            fig = make_chart(chart, df)
+        with self._lock:
+            self.figures_open += 1
+
+        try:
+            buffer = io.BytesIO()
+            with trace("savefig", chart_id):
+                fig.savefig(buffer, format=self.image_format, dpi=self.dpi)
+            image = buffer.getvalue()
+
+        finally:
+            # Drop the artists right away instead of waiting for garbage collection
+            fig.clear()
+            with self._lock:
+                self.figures_open -= 1
+
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.renders += 1
+            self.render_ms_total += elapsed
+            self.render_ms_last = elapsed
+
+            # Older data versions stay until the LRU limits push them out: other sessions may
+            # still show this chart with other parameters or claims windows. A render racing
+            # this one for the same key replaces its image
+            if key in self._images:
+                self._bytes -= len(self._images.pop(key))
+            self._images[key] = image
+            self._bytes += len(image)
+
+            while self._images and (len(self._images) > self.max_entries or self._bytes > self.max_bytes):
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= len(evicted)
+
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._images.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._images),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "renders": self.renders,
+                "figures_open": self.figures_open,
+                "avg_render_ms": self.render_ms_total / self.renders if self.renders else 0.0,
+                "last_render_ms": self.render_ms_last,
+            }
@@ -0,0 +1,80 @@
+import argparse
+from datetime import date, timedelta
+
+from crud import delete_row, insert_row
+from db_pool import ConnectionPool, mysql_connect
+from sweeper import sweep
+
+# Checks the date bounds of a sweep: listings that expired the day before --since and on the
+# cutoff itself keep their pending claims, those from --since up to the day before the cutoff
+# lose them. Runs against a scratch database (benchmark.py's by default) and removes what it
+# created
+
+
+def run_write(pool, write, table, *args):
+    with pool.cursor(commit=True) as cursor:
+        write(cursor, table, *args)
+
+
+def run_check(pool, since, cutoff):
+    with pool.cursor() as cursor:
+        cursor.execute("select (select coalesce(max(Food_ID), 0) + 1 from food_listings), "
+                       "(select coalesce(max(Claim_ID), 0) + 1 from claims)")
+        food_id, claim_id = cursor.fetchone()
+        cursor.execute("select min(Provider_ID) from providers")
+        provider_id = cursor.fetchone()[0]
+        cursor.execute("select min(Receiver_ID) from receivers")
+        receiver_id = cursor.fetchone()[0]
+
+    # Expiry date -> whether its pending claim should be cancelled
+    expected = {
+        since - timedelta(days=1): False,
+        since: True,
+        cutoff - timedelta(days=1): True,
+        cutoff: False,
+    }
+    created = []
+    for i, expiry in enumerate(expected):
+        run_write(pool, insert_row, "food_listings", (
+            food_id + i, "Sweeper Check Bread", 1, expiry, provider_id,
+            "Restaurant", "Sweeper Check City", "Vegetarian", "Lunch",
+        ))
+        run_write(pool, insert_row, "claims", (claim_id + i, food_id + i, receiver_id, "Pending", f"{since} 12:00:00"))
+        created.append((food_id + i, claim_id + i, expiry))
+
+    try:
+        with pool.connection() as conn:
+            sweep(conn, cutoff=cutoff, since=since, log=lambda message: None)
+
+        results = {}
+        with pool.cursor() as cursor:
+            for listing_id, listing_claim, expiry in created:
+                cursor.execute("select Status from claims where Claim_ID = %s", (listing_claim,))
+                cancelled = cursor.fetchone()[0] == "Cancelled"
+                results[expiry.isoformat()] = "ok" if cancelled == expected[expiry] else (
+                    "cancelled, should be left" if cancelled else "left, should be cancelled")
+        return results
+
+    finally:
+        for listing_id, listing_claim, _ in created:
+            run_write(pool, delete_row, "claims", listing_claim)
+            run_write(pool, delete_row, "food_listings", listing_id)
+        with pool.cursor(commit=True) as cursor:
+            cursor.execute("delete from claim_audit where Claim_ID in "
+                           f"({', '.join(['%s'] * len(created))})", tuple(claim for _, claim, _ in created))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the --since and --cutoff bounds of the expiry sweeper")
+    parser.add_argument("--database", default="FOOD_BENCH", help="database to run against (see benchmark.py)")
+    parser.add_argument("--since", type=date.fromisoformat, default=date(2000, 1, 10))
+    parser.add_argument("--cutoff", type=date.fromisoformat, default=date(2000, 1, 20))
+    args = parser.parse_args()
+
+    connection_pool = ConnectionPool(lambda: mysql_connect(database=args.database), size=2)
+    report = run_check(connection_pool, args.since, args.cutoff)
+    connection_pool.close()
+
+    for expiry, outcome in report.items():
+        print(f"listing expiring {expiry}: {outcome}")
+    raise SystemExit(0 if all(outcome == "ok" for outcome in report.values()) else 1)
@@ -0,0 +1,107 @@
+from collections import defaultdict
+
+from changelog import record_changes
+from summaries import apply_deltas
+
+# Table: (primary key, columns in insert order)
+TABLE_COLUMNS = {
+    "providers": ("Provider_ID", ["Provider_ID", "Name", "Type", "Address", "City", "Contact"]),
+    "receivers": ("Receiver_ID", ["Receiver_ID", "Name", "Type", "City", "Contact"]),
+    "food_listings": ("Food_ID", ["Food_ID", "Food_Name", "Quantity", "Expiry_Date", "Provider_ID",
+                                  "Provider_Type", "Location", "Food_Type", "Meal_Type"]),
+    "claims": ("Claim_ID", ["Claim_ID", "Food_ID", "Receiver_ID", "Status", "Timestamp"]),
+}
+
+# Every write below runs on the caller's cursor, so the base row, its summary deltas and
+# its change_log entry commit (or roll back) in the same transaction
+
+
+def fetch_rows(cursor, table, keys, lock=True):
+    # Current rows as dicts; `for update` stops a concurrent write slipping between read and delta
+    key, columns = TABLE_COLUMNS[table]
+    if not keys:
+        return []
+
+    query = f"select {', '.join(columns)} from {table} where {key} in ({', '.join(['%s'] * len(keys))})"
+    cursor.execute(query + (" for update" if lock else ""), tuple(keys))
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def release_reservations(cursor, new_statuses):
+    # Reservations (reservation.py) take food off a listing and keep the amount in
+    # claims.Quantity. A Pending claim that is cancelled or deleted gives it back to the
+    # listing. `new_statuses` is {Claim_ID: new Status, or None for a delete}; call before
+    # the claims write, on its cursor. Returns the quantity given back
+    claim_ids = [claim_id for claim_id, status in new_statuses.items() if status in (None, "Cancelled")]
+    if not claim_ids:
+        return 0
+
+    cursor.execute(
+        f"select Food_ID, Quantity from claims where Claim_ID in ({', '.join(['%s'] * len(claim_ids))}) "
+        "and Status = 'Pending' and Quantity > 0 for update",
+        tuple(claim_ids),
+    )
+    given = defaultdict(int)
+    for food_id, quantity in cursor.fetchall():
+        given[food_id] += quantity
+    if not given:
+        return 0
+
+    old_rows = fetch_rows(cursor, "food_listings", list(given))
+    cursor.executemany("update food_listings set Quantity = Quantity + %s where Food_ID = %s",
+                       [(quantity, food_id) for food_id, quantity in given.items()])
+    # The claim no longer holds any food, so a later cancel cannot give it back twice
+    cursor.execute(f"update claims set Quantity = 0 where Claim_ID in ({', '.join(['%s'] * len(claim_ids))})",
+                   tuple(claim_ids))
+
+    apply_deltas(cursor, "food_listings", old_rows,
+                 [dict(row, Quantity=(row["Quantity"] or 0) + given[row["Food_ID"]]) for row in old_rows])
+    record_changes(cursor, "food_listings", "update", [row["Food_ID"] for row in old_rows])
+    return sum(given.values())
+
+
+def insert_row(cursor, table, values):
+    _, columns = TABLE_COLUMNS[table]
+    cursor.execute(
+        f"insert into {table} ({', '.join(columns)}) values ({', '.join(['%s'] * len(columns))})",
+        tuple(values),
+    )
+    rowcount = cursor.rowcount
+    apply_deltas(cursor, table, [], [dict(zip(columns, values))])
+    record_changes(cursor, table, "insert", [values[0]])
+    return rowcount
+
+
+def update_field(cursor, table, key_value, field, value):
+    key, columns = TABLE_COLUMNS[table]
+
+    # The field name is part of the SQL text, so only real columns are accepted
+    if field not in columns or field == key:
+        raise ValueError(f"{field} is not an updatable column of {table}")
+
+    if table == "claims" and field == "Status":
+        release_reservations(cursor, {key_value: value})
+
+    old_rows = fetch_rows(cursor, table, [key_value])
+    cursor.execute(f"update {table} set {field} = %s where {key} = %s", (value, key_value))
+    rowcount = cursor.rowcount
+
+    new_rows = [dict(row, **{field: value}) for row in old_rows]
+    apply_deltas(cursor, table, old_rows, new_rows)
+    record_changes(cursor, table, "update", [row[key] for row in old_rows])
+    return rowcount
+
+
+def delete_row(cursor, table, key_value):
+    key, _ = TABLE_COLUMNS[table]
+
+    if table == "claims":
+        release_reservations(cursor, {key_value: None})
+
+    old_rows = fetch_rows(cursor, table, [key_value])
+    cursor.execute(f"delete from {table} where {key} = %s", (key_value,))
+    rowcount = cursor.rowcount
+
+    apply_deltas(cursor, table, old_rows, [])
+    record_changes(cursor, table, "delete", [row[key] for row in old_rows])
+    return rowcount
@@ -0,0 +1,229 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from queue import Queue, Empty
+
+# MySQL settings used by the Streamlit app (same server as the notebook)
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "Aries@123",
+    "database": "FOOD",
+}
+
+
+def mysql_connect(**overrides):
+    # Overrides select another database (e.g. benchmark.py's scratch one) on the same server
+    import mysql.connector
+
+    return mysql.connector.connect(**dict(DB_CONFIG, **overrides))
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """A bounded pool of warm database connections shared by all sessions.
+
+    ``connect`` is any zero-argument callable returning a DB-API connection,
+    so a sqlite3 connection factory can stand in for MySQL when testing.
+    """
+
+    def __init__(self, connect=mysql_connect, size=5, timeout=10.0, ping_after=30.0, max_statements=32):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self.max_statements = max_statements
+
+        # Server-side prepared statements cached per connection: id(conn) -> {sql: cursor}
+        self._statements = {}
+
+        # Idle connections are stored with the time they were last returned
+        self._idle = Queue(maxsize=size)
+        self._lock = threading.Lock()
+
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._replaced = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _open(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _discard(self, conn):
+        with self._lock:
+            self._created -= 1
+            self._statements.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _healthy(conn):
+        try:
+            # mysql.connector has a cheap ping, anything else gets a trivial select
+            if hasattr(conn, "ping"):
+                conn.ping(reconnect=False)
+            else:
+                check = conn.cursor()
+                check.execute("select 1")
+                check.fetchall()
+                check.close()
+            return True
+        except Exception:
+            return False
+
+    def warm(self, count=None):
+        # Open connections up front so the first page views skip the handshake
+        count = self.size if count is None else min(count, self.size)
+        while self._created < count:
+            conn = self._open()
+            if conn is None:
+                break
+            self._idle.put((conn, time.monotonic()))
+
+    def acquire(self):
+        start = time.perf_counter()
+        conn = None
+
+        while conn is None:
+            try:
+                conn, last_used = self._idle.get_nowait()
+            except Empty:
+                conn = self._open()
+                if conn is not None:
+                    break
+                try:
+                    conn, last_used = self._idle.get(timeout=self.timeout)
+                except Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise PoolTimeout(f"No database connection free after {self.timeout}s")
+
+            # Only connections that sat idle for a while are health checked
+            if time.monotonic() - last_used > self.ping_after and not self._healthy(conn):
+                self._discard(conn)
+                with self._lock:
+                    self._replaced += 1
+                conn = None
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+        return conn
+
+    def release(self, conn, broken=False):
+        with self._lock:
+            self._in_use -= 1
+
+        if broken:
+            self._discard(conn)
+        else:
+            self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            broken = not self._healthy(conn)
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    @contextmanager
+    def cursor(self, commit=False):
+        # Every request gets its own cursor; the transaction is always closed
+        # before the connection goes back so pooled reads never see stale snapshots
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                if commit:
+                    conn.commit()
+                else:
+                    conn.rollback()
+            except Exception:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+                raise
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def prepared(self, query):
+        # Reuses the connection's prepared statement for this SQL so the server parses and
+        # plans it once per connection instead of once per request
+        with self.connection() as conn:
+            statements = self._statements.setdefault(id(conn), OrderedDict())
+            cursor = statements.get(query)
+
+            if cursor is None:
+                try:
+                    cursor = conn.cursor(prepared=True)
+                except TypeError:
+                    # Drivers without server-side prepare (sqlite3) cache statements themselves
+                    cursor = conn.cursor()
+                statements[query] = cursor
+
+                while len(statements) > self.max_statements:
+                    _, oldest = statements.popitem(last=False)
+                    oldest.close()
+            else:
+                statements.move_to_end(query)
+
+            try:
+                yield cursor
+            except Exception:
+                statements.pop(query, None)
+                cursor.close()
+                raise
+            finally:
+                conn.rollback()
+
+    def close(self):
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "open": self._created,
+                "in_use": self._in_use,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "replaced": self._replaced,
+                "avg_wait_ms": (self._wait_total / self._checkouts * 1000) if self._checkouts else 0.0,
+                "max_wait_ms": self._wait_max * 1000,
+            }
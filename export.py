@@ -0,0 +1,193 @@
+import argparse
+import csv
+import gzip
+import io
+import os
+import time
+from datetime import date
+
+from crud import TABLE_COLUMNS
+from queries import QUERIES_BY_ID, STATEMENTS_BY_ID
+from query_engine import bind_params, statement_params, statement_sql
+
+# Streams tables and registry statements to CSV or Parquet a chunk of rows at a time, so
+# memory stays bounded by chunk_rows whatever the size of the result
+
+# Download choices offered by the app: label -> (format, compression)
+EXPORT_FORMATS = {
+    "CSV": ("csv", None),
+    "CSV (gzip)": ("csv", "gzip"),
+    "Parquet": ("parquet", "snappy"),
+}
+
+# Tables that can be exported whole, with their columns in table order
+EXPORT_TABLES = dict(TABLE_COLUMNS, claims_archive=(
+    "Claim_ID", ["Claim_ID", "Food_ID", "Receiver_ID", "Status", "Timestamp", "Archived_At"]))
+
+
+def table_source(table):
+    # (sql, params, columns); ordered by key so repeated snapshots diff cleanly
+    key, columns = EXPORT_TABLES[table]
+    return f"select {', '.join(columns)} from {table} order by {key}", (), columns
+
+
+def query_source(statement_id, params=None, window=None, use_summaries=True):
+    statement = STATEMENTS_BY_ID[statement_id]
+    spec = next(spec for spec in QUERIES_BY_ID.values() if statement in spec["statements"])
+    return (
+        statement_sql(statement, use_summaries, window),
+        statement_params(statement, bind_params(spec, params)),
+        statement["columns"],
+    )
+
+
+def export_filename(name, fmt="csv", compression=None):
+    if fmt == "parquet":
+        return f"{name}.parquet"
+    return f"{name}.csv.gz" if compression == "gzip" else f"{name}.csv"
+
+
+def iter_chunks(conn, query, params=(), chunk_rows=10000):
+    # mysql.connector cursors are unbuffered unless asked otherwise, so fetchmany pulls rows
+    # off the socket as they are needed instead of materializing the whole result
+    try:
+        cursor = conn.cursor(buffered=False)
+    except TypeError:
+        cursor = conn.cursor()
+
+    try:
+        cursor.execute(query, params or ())
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield rows
+
+    finally:
+        cursor.close()
+        conn.rollback()
+
+
+def write_csv(chunks, columns, out, compression=None):
+    # `out` is a binary file object; it is left open for the caller
+    raw = gzip.GzipFile(fileobj=out, mode="wb") if compression == "gzip" else out
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+
+    text.flush()
+    text.detach()
+    if raw is not out:
+        raw.close()
+
+
+def write_parquet(chunks, columns, out, compression="snappy"):
+    # pyarrow is optional and only needed for Parquet; every chunk becomes one row group
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    import pandas as pd
+
+    writer = None
+    try:
+        for rows in chunks:
+            df = pd.DataFrame(rows, columns=columns)
+            if writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writer = pq.ParquetWriter(out, table.schema, compression=compression)
+            else:
+                table = pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+
+        if writer is None:
+            # An empty result still gets a readable file with the column names
+            empty = pa.Table.from_pandas(pd.DataFrame(columns=columns), preserve_index=False)
+            writer = pq.ParquetWriter(out, empty.schema, compression=compression)
+            writer.write_table(empty)
+
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export(conn, source, out, fmt="csv", compression=None, chunk_rows=10000):
+    # Writes the (sql, params, columns) source to the binary file object or path `out`.
+    # Returns {"rows", "chunks", "seconds"}
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, "wb") as handle:
+            return export(conn, source, handle, fmt, compression, chunk_rows)
+
+    query, params, columns = source
+    start = time.perf_counter()
+    counts = {"rows": 0, "chunks": 0}
+
+    def counted(chunks):
+        for rows in chunks:
+            counts["rows"] += len(rows)
+            counts["chunks"] += 1
+            yield rows
+
+    chunks = counted(iter_chunks(conn, query, params, chunk_rows))
+
+    if fmt == "parquet":
+        write_parquet(chunks, columns, out, compression or "snappy")
+    else:
+        write_csv(chunks, columns, out, compression)
+
+    return dict(counts, seconds=round(time.perf_counter() - start, 3))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream tables and registry query results to CSV or Parquet")
+    parser.add_argument("names", nargs="+", help="table names, statement ids (query1_1) or query ids (query1)")
+    parser.add_argument("--out", default="exports", help="output directory")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--compression", choices=["gzip", "snappy", "zstd"],
+                        help="gzip for CSV; snappy (default), gzip or zstd for Parquet")
+    parser.add_argument("--chunk-rows", type=int, default=10000)
+    parser.add_argument("--param", action="append", default=[], help="query parameter as NAME=VALUE")
+    parser.add_argument("--history", choices=["hot", "all"], default="hot",
+                        help="claims to read: the hot table or hot plus archived")
+    parser.add_argument("--since", type=date.fromisoformat, help="only claims made on or after this date")
+    parser.add_argument("--until", type=date.fromisoformat, help="only claims made before this date")
+    args = parser.parse_args()
+
+    if args.format == "csv" and args.compression not in (None, "gzip"):
+        parser.error("CSV exports only support gzip compression")
+
+    overrides = dict(item.split("=", 1) for item in args.param)
+    claims_window = {"history": args.history if args.history == "all" else None,
+                     "since": args.since, "until": args.until}
+
+    # Same file names the notebook uses for query results, e.g. query4_df.csv
+    targets = []
+    for name in args.names:
+        if name in EXPORT_TABLES:
+            targets.append((name, table_source(name)))
+        elif name in QUERIES_BY_ID:
+            targets.extend((f"{s['id']}_df", query_source(s["id"], overrides, claims_window))
+                           for s in QUERIES_BY_ID[name]["statements"])
+        elif name in STATEMENTS_BY_ID:
+            targets.append((f"{name}_df", query_source(name, overrides, claims_window)))
+        else:
+            parser.error(f"unknown table or query: {name}")
+
+    from db_pool import mysql_connect
+
+    os.makedirs(args.out, exist_ok=True)
+    connection = mysql_connect()
+
+    try:
+        for file_name, export_source in targets:
+            path = os.path.join(args.out, export_filename(file_name, args.format, args.compression))
+            report = export(connection, export_source, path, args.format, args.compression, args.chunk_rows)
+            print(f"{path}: {report['rows']} rows in {report['chunks']} chunks, {report['seconds']}s")
+
+    finally:
+        connection.close()
@@ -0,0 +1,112 @@
+import argparse
+import http.client
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+# Drives a running api.py server from several client threads, each on one keep-alive
+# connection, and reports requests per second and latency percentiles. Start the server
+# first, e.g. `uvicorn api:app --workers 4`, then `python load_test_api.py --seconds 30`
+
+# (weight, path) of the request mix: mostly table pages and query results, as the mobile
+# app and the partner dashboards read them
+MIX = [
+    (4, "/tables/food_listings?limit=50"),
+    (2, "/tables/providers?limit=50&sort=City"),
+    (2, "/tables/claims?limit=50&sort=Timestamp&desc=1"),
+    (1, "/queries/query1"),
+    (1, "/queries/query3?City=New%20Carol"),
+    (2, "/queries/query4"),
+    (2, "/queries/query8"),
+    (1, "/queries/query13"),
+    (1, "/queries/query15"),
+    (1, "/health"),
+]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def client(base, deadline, revalidate, seed, results, lock):
+    parts = urlsplit(base)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    rng = random.Random(seed)
+    paths = [path for weight, path in MIX for _ in range(weight)]
+    etags = {}
+    latencies, statuses, received = [], Counter(), 0
+
+    while time.perf_counter() < deadline:
+        path = rng.choice(paths)
+        headers = {"Accept-Encoding": "gzip"}
+        if revalidate and path in etags:
+            headers["If-None-Match"] = etags[path]
+
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            statuses["connection error"] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+            continue
+
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status] += 1
+        received += len(body)
+        if response.getheader("ETag"):
+            etags[path] = response.getheader("ETag")
+
+    conn.close()
+    with lock:
+        results["latencies"].extend(latencies)
+        results["statuses"].update(statuses)
+        results["bytes"] += received
+
+
+def run(base, clients, seconds, revalidate):
+    results = {"latencies": [], "statuses": Counter(), "bytes": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=client, args=(base, deadline, revalidate, i, results, lock))
+               for i in range(clients)]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = sorted(value * 1000 for value in results["latencies"])
+    if not latencies_ms:
+        raise SystemExit(f"No responses from {base}: {dict(results['statuses'])}")
+
+    return {
+        "requests": len(latencies_ms),
+        "requests_per_second": round(len(latencies_ms) / elapsed, 1),
+        "p50_ms": round(percentile(latencies_ms, 0.50), 2),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 2),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 2),
+        "max_ms": round(latencies_ms[-1], 2),
+        "kb_per_request": round(results["bytes"] / len(latencies_ms) / 1024, 2),
+        "statuses": dict(results["statuses"]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the JSON API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="server to test")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--no-revalidate", action="store_true",
+                        help="never send If-None-Match, so every response carries a full body")
+    args = parser.parse_args()
+
+    report = run(args.url, args.clients, args.seconds, not args.no_revalidate)
+    for name, value in report.items():
+        print(f"{name:<20} {value}")
@@ -0,0 +1,150 @@
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from crud import delete_row, insert_row, update_field
+from db_pool import ConnectionPool, mysql_connect
+from reservation import ReservationError, reserve
+
+# Fires many concurrent reservations at one hot listing and checks that it was never
+# over-allocated: the claims made plus the quantity left must equal the starting quantity.
+# Then cancels half the claims and deletes the rest, and checks that the listing is back
+# to its starting quantity.
+# Runs against a scratch database (benchmark.py's by default) and removes what it created
+
+
+def run_write(pool, write, table, *args):
+    with pool.cursor(commit=True) as cursor:
+        write(cursor, table, *args)
+
+
+def create_listing(pool, quantity):
+    with pool.cursor() as cursor:
+        cursor.execute("select coalesce(max(Food_ID), 0) + 1 from food_listings")
+        food_id = cursor.fetchone()[0]
+        cursor.execute("select min(Provider_ID) from providers")
+        provider_id = cursor.fetchone()[0]
+
+    run_write(pool, insert_row, "food_listings", (
+        food_id, "Load Test Bread", quantity, date.today() + timedelta(days=7), provider_id,
+        "Restaurant", "Load Test City", "Vegetarian", "Lunch",
+    ))
+    return food_id
+
+
+def run_load_test(pool, receiver_ids, quantity, claims, per_claim, workers):
+    food_id = create_listing(pool, quantity)
+    latencies, outcomes, attempts = [], {"reserved": 0, "sold_out": 0, "error": 0}, []
+    claim_ids = []
+    lock = threading.Lock()
+
+    def one(i):
+        start = time.perf_counter()
+        with pool.connection() as conn:
+            try:
+                result = reserve(conn, food_id, receiver_ids[i % len(receiver_ids)], per_claim)
+                outcome = "reserved"
+            except ReservationError:
+                result, outcome = None, "sold_out"
+            except Exception as e:
+                result, outcome = None, "error"
+                print(f"claim {i} failed: {e}")
+
+        with lock:
+            latencies.append(time.perf_counter() - start)
+            outcomes[outcome] += 1
+            if result:
+                attempts.append(result["attempts"])
+                claim_ids.append(result["claim_id"])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(one, range(claims)))
+    elapsed = time.perf_counter() - start
+
+    with pool.cursor() as cursor:
+        cursor.execute("select Quantity from food_listings where Food_ID = %s", (food_id,))
+        remaining = cursor.fetchone()[0]
+        cursor.execute("select count(*) from claims where Food_ID = %s", (food_id,))
+        claim_rows = cursor.fetchone()[0]
+
+    latencies_ms = sorted(value * 1000 for value in latencies)
+    report = {
+        "food_id": food_id,
+        "starting_quantity": quantity,
+        "remaining_quantity": remaining,
+        "claim_rows": claim_rows,
+        **outcomes,
+        "retried": sum(1 for value in attempts if value > 1),
+        "seconds": round(elapsed, 3),
+        "claims_per_second": round(claims / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies_ms), 2),
+        "p95_ms": round(latencies_ms[int(0.95 * (len(latencies_ms) - 1))], 2),
+        "max_ms": round(latencies_ms[-1], 2),
+    }
+
+    # No over-allocation: every reserved unit is accounted for by exactly one claim row
+    report["consistent"] = (
+        remaining >= 0
+        and claim_rows == outcomes["reserved"]
+        and remaining + outcomes["reserved"] * per_claim == quantity
+    )
+    return report, claim_ids
+
+
+def check_release(pool, food_id, claim_ids, quantity):
+    # Pending claims give their food back whether they are cancelled or deleted
+    for i, claim_id in enumerate(claim_ids):
+        if i % 2:
+            run_write(pool, update_field, "claims", claim_id, "Status", "Cancelled")
+        else:
+            run_write(pool, delete_row, "claims", claim_id)
+
+    with pool.cursor() as cursor:
+        cursor.execute("select Quantity from food_listings where Food_ID = %s", (food_id,))
+        restored = cursor.fetchone()[0]
+    return {"restored_quantity": restored, "released": restored == quantity}
+
+
+def clean_up(pool, food_id, claim_ids):
+    # Through crud.py so the summary tables are adjusted as well
+    for claim_id in claim_ids:
+        run_write(pool, delete_row, "claims", claim_id)
+    with pool.cursor(commit=True) as cursor:
+        cursor.execute("delete from claim_audit where Food_ID = %s", (food_id,))
+    run_write(pool, delete_row, "food_listings", food_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent claims against one listing")
+    parser.add_argument("--database", default="FOOD_BENCH", help="database to run against (see benchmark.py)")
+    parser.add_argument("--quantity", type=int, default=100, help="starting quantity of the hot listing")
+    parser.add_argument("--claims", type=int, default=500, help="reservations to fire")
+    parser.add_argument("--per-claim", type=int, default=1, help="quantity each reservation asks for")
+    parser.add_argument("--workers", type=int, default=32, help="concurrent connections")
+    parser.add_argument("--keep", action="store_true", help="leave the listing and claims in place")
+    args = parser.parse_args()
+
+    connection_pool = ConnectionPool(lambda: mysql_connect(database=args.database), size=args.workers,
+                                     timeout=60.0)
+    connection_pool.warm()
+
+    with connection_pool.cursor() as receiver_cursor:
+        receiver_cursor.execute("select Receiver_ID from receivers order by Receiver_ID limit 1000")
+        receivers = [row[0] for row in receiver_cursor.fetchall()]
+
+    results, reserved_claims = run_load_test(connection_pool, receivers, args.quantity, args.claims,
+                                             args.per_claim, args.workers)
+    if not args.keep:
+        results.update(check_release(connection_pool, results["food_id"], reserved_claims, args.quantity))
+    for name, value in results.items():
+        print(f"{name:<20} {value}")
+
+    if not args.keep:
+        clean_up(connection_pool, results["food_id"], reserved_claims)
+    connection_pool.close()
+
+    raise SystemExit(0 if results["consistent"] and results.get("released", True) else 1)
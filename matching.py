@@ -0,0 +1,243 @@
+import heapq
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+
+LISTING_COLUMNS = ["Food_ID", "Food_Name", "Quantity", "Expiry_Date", "Provider_ID",
+                   "Location", "Food_Type", "Meal_Type"]
+
+LISTINGS_QUERY = f"select {', '.join(LISTING_COLUMNS)} from food_listings"
+LISTING_QUERY = LISTINGS_QUERY + " where Food_ID = %s"
+
+RECEIVERS_QUERY = "select Receiver_ID, City from receivers"
+RECEIVER_QUERY = "select Receiver_ID, City from receivers where Receiver_ID = %s"
+
+# Ranking weights: same city first, then how soon the food expires, then preferences
+CITY_WEIGHT = 3.0
+EXPIRY_WEIGHT = 2.0
+MEAL_WEIGHT = 1.0
+QUANTITY_WEIGHT = 0.5
+QUANTITY_CAP = 50
+
+# Listings without an Expiry_Date are kept in the expiry order as never expiring
+NEVER_EXPIRES = date.max
+
+
+def _as_date(value):
+    if value is None:
+        return NEVER_EXPIRES
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), "%Y-%m-%d").date()
+
+
+class MatchEngine:
+    """Ranks unexpired food listings with quantity left for a receiver.
+
+    Listings are indexed by a heap ordered on expiry and by maps keyed on city and
+    food type. All indexes are updated incrementally through on_write, so a match
+    never touches the database.
+    """
+
+    def __init__(self, fetch):
+        # fetch(query, params) -> rows, used for the initial load and to re-read written rows
+        self._fetch = fetch
+        self._lock = threading.RLock()
+
+        self.listings = {}
+        self.receivers = {}
+
+        self.by_city = defaultdict(set)
+        self.by_food_type = defaultdict(set)
+        self._expiry_heap = []
+
+        # Listings expiring before this date have been dropped from the indexes
+        self._horizon = None
+
+        # The soonest-expiring listings are the same for every receiver until a write
+        # changes them: (today, count, food type) -> food ids
+        self._soonest_cache = {}
+
+    # Index maintenance
+
+    def _available(self, food_id):
+        # Claims reserve part of a listing and take its Quantity down (reservation.py), so
+        # a listing stays available while any quantity is left
+        listing = self.listings.get(food_id)
+        return listing is not None and listing["Quantity"] > 0
+
+    def _index(self, food_id):
+        listing = self.listings[food_id]
+        expired = self._horizon is not None and listing["Expiry_Date"] < self._horizon
+        if self._available(food_id) and not expired:
+            self.by_city[listing["Location"]].add(food_id)
+            self.by_food_type[listing["Food_Type"]].add(food_id)
+            heapq.heappush(self._expiry_heap, (listing["Expiry_Date"], food_id))
+
+    def _unindex(self, food_id):
+        # Heap entries are removed lazily: an entry is stale once its listing is gone,
+        # unavailable or has a different expiry date
+        listing = self.listings.get(food_id)
+        if listing is not None:
+            self.by_city[listing["Location"]].discard(food_id)
+            self.by_food_type[listing["Food_Type"]].discard(food_id)
+
+    def _live(self, entry):
+        expiry, food_id = entry
+        listing = self.listings.get(food_id)
+        return listing is not None and listing["Expiry_Date"] == expiry and self._available(food_id)
+
+    def _compact(self, force=False):
+        # Rebuild the heap once stale entries outnumber live ones
+        live = sum(len(ids) for ids in self.by_food_type.values())
+        if force or len(self._expiry_heap) > 2 * live + 64:
+            self._expiry_heap = [entry for entry in self._expiry_heap if self._live(entry)]
+            heapq.heapify(self._expiry_heap)
+
+    def _expire(self, today):
+        # Pops listings that expired before `today` off the heap and out of the city and
+        # food type maps. Going back to an earlier date rebuilds the indexes
+        if self._horizon is not None and today < self._horizon:
+            self._soonest_cache.clear()
+            self._horizon = today
+            self.by_city.clear()
+            self.by_food_type.clear()
+            self._expiry_heap = []
+            for food_id in self.listings:
+                self._index(food_id)
+            return
+
+        if today != self._horizon:
+            self._soonest_cache.clear()
+        self._horizon = today
+        heap = self._expiry_heap
+        while heap and heap[0][0] < today:
+            entry = heapq.heappop(heap)
+            if self._live(entry):
+                self._unindex(entry[1])
+
+    def set_listing(self, row):
+        with self._lock:
+            self._soonest_cache.clear()
+            food_id = row["Food_ID"]
+            self._unindex(food_id)
+            self.listings[food_id] = dict(row, Expiry_Date=_as_date(row["Expiry_Date"]), Quantity=row["Quantity"] or 0)
+            self._index(food_id)
+            self._compact()
+
+    def remove_listing(self, food_id):
+        with self._lock:
+            self._soonest_cache.clear()
+            self._unindex(food_id)
+            self.listings.pop(food_id, None)
+
+    def set_receiver(self, receiver_id, city=None):
+        with self._lock:
+            if city is None:
+                self.receivers.pop(receiver_id, None)
+            else:
+                self.receivers[receiver_id] = city
+
+    def load(self):
+        # The indexes are built in a new engine and swapped in. This engine's lock is held
+        # throughout, so a write arriving meanwhile waits and is applied after the swap
+        with self._lock:
+            fresh = MatchEngine(self._fetch)
+            for row in self._fetch(LISTINGS_QUERY, None):
+                fresh.set_listing(dict(zip(LISTING_COLUMNS, row)))
+            for receiver_id, city in self._fetch(RECEIVERS_QUERY, None):
+                fresh.set_receiver(receiver_id, city)
+            fresh._compact(force=True)
+
+            for name, value in vars(fresh).items():
+                if name not in ("_fetch", "_lock"):
+                    setattr(self, name, value)
+        return self
+
+    def on_write(self, table, key):
+        # Re-reads the written row by primary key after a committed CRUD write
+        if table == "food_listings":
+            rows = self._fetch(LISTING_QUERY, (key,))
+            if rows:
+                self.set_listing(dict(zip(LISTING_COLUMNS, rows[0])))
+            else:
+                self.remove_listing(key)
+
+        elif table == "receivers":
+            rows = self._fetch(RECEIVER_QUERY, (key,))
+            self.set_receiver(key, rows[0][1] if rows else None)
+
+    # Matching
+
+    def _soonest(self, today, count, food_type=None):
+        # The `count` live entries expiring soonest (none before today after _expire), read from the
+        # heap in order without popping it: a frontier heap over heap positions, O(count log count)
+        key = (today, count, food_type)
+        if key in self._soonest_cache:
+            return self._soonest_cache[key]
+
+        heap = self._expiry_heap
+        frontier = [(heap[0], 0)] if heap else []
+        found = []
+
+        while frontier and len(found) < count:
+            entry, i = heapq.heappop(frontier)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            if entry[0] >= today and self._live(entry) and (
+                    food_type is None or self.listings[entry[1]]["Food_Type"] == food_type):
+                found.append(entry[1])
+
+        self._soonest_cache[key] = found
+        return found
+
+    def _score(self, listing, city, today, meal_type):
+        days_left = (listing["Expiry_Date"] - today).days
+        return (
+            CITY_WEIGHT * (listing["Location"] == city)
+            + EXPIRY_WEIGHT / (1 + days_left)
+            + MEAL_WEIGHT * (meal_type is not None and listing["Meal_Type"] == meal_type)
+            + QUANTITY_WEIGHT * min(listing["Quantity"], QUANTITY_CAP) / QUANTITY_CAP
+        )
+
+    def _public(self, listing):
+        # The listing as stored in the database
+        if listing["Expiry_Date"] == NEVER_EXPIRES:
+            return dict(listing, Expiry_Date=None)
+        return dict(listing)
+
+    def match(self, receiver_id, today=None, limit=10, meal_type=None, food_type=None):
+        # Returns [(score, listing dict)] best first. The meal type is a preference,
+        # the food type (e.g. Vegetarian) a hard filter
+        today = today or date.today()
+
+        with self._lock:
+            self._expire(today)
+            city = self.receivers.get(receiver_id)
+
+            # Same-city listings plus the soonest-expiring ones anywhere; the candidate set
+            # stays bounded so a match costs the same however many listings there are
+            candidates = set(self.by_city.get(city, ())) if city is not None else set()
+            if food_type is not None:
+                candidates &= self.by_food_type.get(food_type, set())
+            candidates.update(self._soonest(today, limit * 4, food_type))
+
+            scored = [
+                (self._score(self.listings[fid], city, today, meal_type), fid)
+                for fid in candidates
+                if self.listings[fid]["Expiry_Date"] >= today and self._available(fid)
+            ]
+
+            return [(score, self._public(self.listings[fid])) for score, fid in heapq.nlargest(limit, scored)]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "listings": len(self.listings),
+                "available": sum(len(ids) for ids in self.by_food_type.values()),
+                "receivers": len(self.receivers),
+                "heap_entries": len(self._expiry_heap),
+            }
@@ -0,0 +1,229 @@
+import argparse
+from datetime import datetime
+
+from archive import ARCHIVE_DDL
+from changelog import CHANGE_LOG_DDL
+from queries import REGISTRY
+from query_engine import bind_params, statement_params, statement_sql
+from summaries import SUMMARY_DDL, rebuild_summaries
+from sweeper import AUDIT_DDL
+
+
+def create_index(table, name, columns):
+    # MySQL has no CREATE INDEX IF NOT EXISTS, so check information_schema first
+    def step(cursor):
+        cursor.execute("""
+            select count(*) from information_schema.STATISTICS
+            where TABLE_SCHEMA = database() and TABLE_NAME = %s and INDEX_NAME = %s
+        """, (table, name))
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(f"create index {name} on {table} ({', '.join(columns)})")
+
+    step.description = f"index {name} on {table} ({', '.join(columns)})"
+    return step
+
+
+# Versioned schema changes, applied in order and recorded in schema_migrations.
+# A step is either a SQL string or a callable taking the cursor.
+MIGRATIONS = [
+    (1, "Base tables", [
+        """
+        CREATE TABLE IF NOT EXISTS providers (
+            Provider_ID INT PRIMARY KEY,
+            Name VARCHAR(255),
+            Type VARCHAR(100),
+            Address TEXT,
+            City VARCHAR(100),
+            Contact VARCHAR(50)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS receivers (
+            Receiver_ID INT PRIMARY KEY,
+            Name VARCHAR(255),
+            Type VARCHAR(100),
+            City VARCHAR(100),
+            Contact VARCHAR(50)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS food_listings (
+            Food_ID INT PRIMARY KEY,
+            Food_Name VARCHAR(255),
+            Quantity INT,
+            Expiry_Date DATE,
+            Provider_ID INT,
+            Provider_Type VARCHAR(100),
+            Location VARCHAR(100),
+            Food_Type VARCHAR(100),
+            Meal_Type VARCHAR(100),
+
+            FOREIGN KEY (Provider_ID) REFERENCES providers(Provider_ID)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS claims (
+            Claim_ID INT PRIMARY KEY,
+            Food_ID INT,
+            Receiver_ID INT,
+            Status VARCHAR(100),
+            Timestamp DATETIME,
+
+            FOREIGN KEY (Food_ID) REFERENCES food_listings(Food_ID),
+            FOREIGN KEY (Receiver_ID) REFERENCES receivers(Receiver_ID)
+        )
+        """,
+    ]),
+    (2, "Secondary indexes for the P & R Filters and the 15 queries", [
+        # P & R Filters city lookups and query3
+        create_index("providers", "idx_providers_city", ["City"]),
+        create_index("receivers", "idx_receivers_city", ["City"]),
+        # query4, query9 and query14 filter claims on Status before joining
+        create_index("claims", "idx_claims_status_food", ["Status", "Food_ID"]),
+        create_index("claims", "idx_claims_receiver_status", ["Receiver_ID", "Status"]),
+        # query5_1, query13 and query15 group listings per provider
+        create_index("food_listings", "idx_food_provider_quantity", ["Provider_ID", "Quantity"]),
+        create_index("food_listings", "idx_food_provider_type_quantity", ["Provider_Type", "Quantity"]),
+        create_index("food_listings", "idx_food_location", ["Location"]),
+        create_index("food_listings", "idx_food_type", ["Food_Type"]),
+        create_index("food_listings", "idx_food_expiry", ["Expiry_Date"]),
+    ]),
+    (3, "Summary tables for the dashboard aggregates", SUMMARY_DDL + [
+        # Populate from the existing rows, later writes keep them current through crud.py
+        rebuild_summaries,
+    ]),
+    (4, "Audit trail for claims cancelled by the expiry sweeper", [AUDIT_DDL]),
+    (5, "Archive table for finished claims", [
+        # The archival job and the date windows on the claims queries range over Timestamp
+        create_index("claims", "idx_claims_timestamp", ["Timestamp"]),
+        ARCHIVE_DDL,
+    ]),
+    (6, "Claim ids assigned by the database for reservations", [
+        # Concurrent reservations cannot pick max(Claim_ID) + 1 safely; explicit ids still work
+        "ALTER TABLE claims MODIFY Claim_ID INT NOT NULL AUTO_INCREMENT",
+    ]),
+    (7, "Change log of committed writes for the live dashboard", [CHANGE_LOG_DDL]),
+    (8, "Quantity each claim holds of its listing", [
+        # Set by reservations and given back when a Pending claim is cancelled or deleted;
+        # claims made before reservations hold nothing
+        "ALTER TABLE claims ADD COLUMN Quantity INT NULL",
+    ]),
+]
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            Version INT PRIMARY KEY,
+            Description VARCHAR(255),
+            Applied_At DATETIME
+        )
+    """)
+
+
+def applied_versions(cursor):
+    ensure_migrations_table(cursor)
+    cursor.execute("select Version from schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(conn, target=None, log=print):
+    cursor = conn.cursor()
+
+    # A named lock keeps two app servers from migrating at the same time
+    cursor.execute("select get_lock('food_schema_migrations', 30)")
+    if cursor.fetchone()[0] != 1:
+        raise RuntimeError("Another migration is already running")
+
+    try:
+        done = applied_versions(cursor)
+        applied = []
+
+        for version, description, steps in MIGRATIONS:
+            if version in done or (target is not None and version > target):
+                continue
+
+            log(f"Applying {version}: {description}")
+            for step in steps:
+                if callable(step):
+                    step(cursor)
+                else:
+                    cursor.execute(step)
+
+            cursor.execute(
+                "insert into schema_migrations (Version, Description, Applied_At) values (%s, %s, %s)",
+                (version, description, datetime.now()),
+            )
+            conn.commit()
+            applied.append(version)
+
+        return applied
+
+    finally:
+        cursor.execute("select release_lock('food_schema_migrations')")
+        cursor.fetchall()
+        cursor.close()
+
+
+def explain_queries(conn):
+    # query id -> list of plan rows (table, access type, key used, estimated rows, extra)
+    cursor = conn.cursor(dictionary=True)
+    plans = {}
+
+    # Base-table SQL is explained since that is what the indexes serve
+    for spec in REGISTRY:
+        for statement in spec["statements"]:
+            query = statement_sql(statement, use_summaries=False).strip().rstrip(";")
+            try:
+                cursor.execute(f"explain {query}", statement_params(statement, bind_params(spec)))
+            except Exception:
+                # Tables do not exist yet on a fresh database
+                plans[statement["id"]] = []
+                continue
+
+            plans[statement["id"]] = [
+                (row["table"], row["type"], row["key"], row["rows"], row["Extra"])
+                for row in cursor.fetchall()
+            ]
+
+    cursor.close()
+    return plans
+
+
+def explain_report(before, after):
+    lines = []
+    for statement_id in after:
+        lines.append(f"== {statement_id}")
+        for label, plan in (("before", before.get(statement_id, [])), ("after", after.get(statement_id, []))):
+            for table, access, key, rows, extra in plan:
+                lines.append(f"  {label:<6} {str(table):<14} {str(access):<7} key={key} rows={rows} {extra or ''}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply schema migrations to the FOOD database")
+    parser.add_argument("--status", action="store_true", help="only list applied and pending versions")
+    parser.add_argument("--target", type=int, help="stop after this version")
+    parser.add_argument("--no-explain", action="store_true", help="skip the before/after EXPLAIN report")
+    args = parser.parse_args()
+
+    from db_pool import mysql_connect
+
+    connection = mysql_connect()
+
+    if args.status:
+        status_cursor = connection.cursor()
+        done = applied_versions(status_cursor)
+        status_cursor.close()
+        for version, description, _ in MIGRATIONS:
+            print(f"{version:>3} {'applied' if version in done else 'pending':<8} {description}")
+
+    else:
+        plans_before = {} if args.no_explain else explain_queries(connection)
+        versions = migrate(connection, args.target)
+        print(f"Applied versions: {versions or 'none, schema is up to date'}")
+
+        if not args.no_explain:
+            print(explain_report(plans_before, explain_queries(connection)))
+
+    connection.close()
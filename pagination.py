@@ -0,0 +1,96 @@
+# Keyset pagination for the View Tables page: every page is fetched with an
+# index range on (sort column, primary key) so only the visible rows are read
+
+VIEW_TABLES = {
+    "Providers": {
+        "table": "providers",
+        "key": "Provider_ID",
+        "columns": ["Provider_ID", "Name", "Type", "Address", "City", "Contact"],
+        "labels": ["Provider ID", "Name", "Type", "Address", "City", "Contact"],
+    },
+    "Receivers": {
+        "table": "receivers",
+        "key": "Receiver_ID",
+        "columns": ["Receiver_ID", "Name", "Type", "City", "Contact"],
+        "labels": ["Receiver ID", "Name", "Type", "City", "Contact"],
+    },
+    "Food Listings": {
+        "table": "food_listings",
+        "key": "Food_ID",
+        "columns": ["Food_ID", "Food_Name", "Quantity", "Expiry_Date", "Provider_ID",
+                    "Provider_Type", "Location", "Food_Type", "Meal_Type"],
+        "labels": ["Food ID", "Name", "Quantity", "Expiry Date", "Provider ID",
+                   "Provider Type", "Location", "Food Type", "Meal Type"],
+    },
+    "Claims": {
+        "table": "claims",
+        "key": "Claim_ID",
+        "columns": ["Claim_ID", "Food_ID", "Receiver_ID", "Status", "Timestamp"],
+        "labels": ["Claim ID", "Food ID", "Receiver ID", "Status", "Timestamp"],
+    },
+}
+
+# InnoDB keeps an approximate row count per table, reading it avoids a count(*) scan
+ROW_ESTIMATE_QUERY = """
+select TABLE_ROWS from information_schema.TABLES
+where TABLE_SCHEMA = database() and TABLE_NAME = %s
+"""
+
+
+def page_query(spec, sort_column=None, descending=False, page_size=50, after=None):
+    key = spec["key"]
+    sort_column = sort_column or key
+
+    # Column names cannot be bound as parameters, so only known columns are accepted
+    if sort_column not in spec["columns"]:
+        raise ValueError(f"Cannot sort {spec['table']} by {sort_column}")
+
+    direction = "desc" if descending else "asc"
+    compare = "<" if descending else ">"
+    params = []
+
+    query = f"select {', '.join(spec['columns'])} from {spec['table']}"
+
+    # `after` is the (sort value, key) of the last row on the previous page. NULLs sort first
+    # ascending and last descending, as in MySQL, so they need their own conditions
+    if after is not None:
+        if sort_column == key:
+            query += f" where {key} {compare} %s"
+            params.append(after[1])
+        elif after[0] is None and not descending:
+            query += f" where (({sort_column} is null and {key} > %s) or {sort_column} is not null)"
+            params.append(after[1])
+        elif after[0] is None:
+            query += f" where ({sort_column} is null and {key} < %s)"
+            params.append(after[1])
+        else:
+            nulls_after = f" or {sort_column} is null" if descending else ""
+            query += (f" where ({sort_column} {compare} %s or ({sort_column} = %s and {key} {compare} %s)"
+                      f"{nulls_after})")
+            params.extend([after[0], after[0], after[1]])
+
+    if sort_column == key:
+        query += f" order by {key} {direction}"
+    else:
+        query += f" order by {sort_column} {direction}, {key} {direction}"
+
+    # One extra row tells us whether there is a next page without counting
+    query += " limit %s"
+    params.append(page_size + 1)
+
+    return query, tuple(params)
+
+
+def fetch_page(fetch, spec, sort_column=None, descending=False, page_size=50, after=None):
+    # Returns the rows of one page and the cursor for the next page (None on the last page)
+    sort_column = sort_column or spec["key"]
+    query, params = page_query(spec, sort_column, descending, page_size, after)
+    rows = fetch(query, params)
+
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    next_after = (last[spec["columns"].index(sort_column)], last[spec["columns"].index(spec["key"])])
+    return rows, next_after
@@ -0,0 +1,169 @@
+import bisect
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Timing of the database calls and render stages, kept as fixed-bucket histograms so
+# recording is a couple of perf_counter calls and a bisect. PROFILER is the process-wide
+# instance the app, query_engine and charts record into
+
+# Upper bounds of the histogram buckets, in seconds (Prometheus style, the last is +Inf)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+slow_log = logging.getLogger("food.slow_queries")
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS + (self.max,), self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, self.max)
+        return self.max
+
+
+class Profiler:
+    """Per (stage, label) latency histograms plus a log of slow queries."""
+
+    def __init__(self, slow_ms=500.0, slow_log_size=200):
+        self.enabled = True
+        self.slow_ms = slow_ms
+        self.slow_queries = deque(maxlen=slow_log_size)
+
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, label, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get((stage, label))
+            if histogram is None:
+                histogram = self._histograms[(stage, label)] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def trace(self, stage, label):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, label, time.perf_counter() - start)
+
+    def query(self, label, sql, execute_seconds, fetch_seconds, rows):
+        # One database call: execute and fetch are timed separately, slow calls are logged whole
+        self.record("execute", label, execute_seconds)
+        self.record("fetch", label, fetch_seconds)
+
+        elapsed_ms = (execute_seconds + fetch_seconds) * 1000
+        if self.enabled and elapsed_ms >= self.slow_ms:
+            entry = {
+                "at": datetime.now().isoformat(timespec="seconds"),
+                "query": label,
+                "ms": round(elapsed_ms, 1),
+                "rows": rows,
+                "sql": " ".join(sql.split()),
+            }
+            self.slow_queries.append(entry)
+            slow_log.warning("slow query %s: %.1f ms, %s rows: %s", label, elapsed_ms, rows, entry["sql"])
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.slow_queries.clear()
+
+    def summary(self):
+        # One dict per (stage, label), slowest total time first
+        with self._lock:
+            items = [(key, h.count, h.total, h.max, h.quantile(0.5), h.quantile(0.95))
+                     for key, h in self._histograms.items()]
+
+        rows = [
+            {
+                "stage": stage,
+                "query": label,
+                "count": count,
+                "total_ms": round(total * 1000, 1),
+                "avg_ms": round(total / count * 1000, 2),
+                "p50_ms": round(p50 * 1000, 2),
+                "p95_ms": round(p95 * 1000, 2),
+                "max_ms": round(peak * 1000, 2),
+            }
+            for (stage, label), count, total, peak, p50, p95 in items
+        ]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def prometheus_text(self, gauges=None):
+        # Text exposition format; gauges is {name: {stat: number}}, e.g. {"pool": pool.stats()}
+        lines = [
+            "# HELP food_stage_duration_seconds Time spent per stage and query",
+            "# TYPE food_stage_duration_seconds histogram",
+        ]
+
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            for (stage, label), h in histograms:
+                labels = f'stage="{_escape(stage)}",query="{_escape(label)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, h.counts):
+                    cumulative += count
+                    lines.append(f'food_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'food_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f"food_stage_duration_seconds_sum{{{labels}}} {h.total:.6f}")
+                lines.append(f"food_stage_duration_seconds_count{{{labels}}} {h.count}")
+
+        for group, stats in (gauges or {}).items():
+            for stat, value in stats.items():
+                if isinstance(value, (int, float)):
+                    lines.append(f"# TYPE food_{group}_{stat} gauge")
+                    lines.append(f"food_{group}_{stat} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path, gauges=None):
+        # Written to a temporary file and renamed, so a textfile collector never reads half a file
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as handle:
+            handle.write(self.prometheus_text(gauges))
+        os.replace(temp_path, path)
+        return path
+
+
+def sql_label(sql, width=48):
+    # Histogram label for SQL that has no query id: its first few words
+    text = " ".join(sql.split())
+    return text if len(text) <= width else text[:width] + "..."
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+PROFILER = Profiler()
+trace = PROFILER.trace
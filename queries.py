@@ -0,0 +1,331 @@
+# Registry of the 15 queries. Every query declares its SQL, parameters, result columns,
+# charts and the tables it reads; query_engine.py runs them for the app, notebook and CLI.
+# Claims-based SQL reads from `{claims}`, which query_engine.claims_source fills with the
+# hot claims table by default, a date window over it or the hot plus archived claims
+
+QUERY1_1 = "Select City, count(*) as Provider_Count from providers group by City order by Provider_Count desc;"
+
+QUERY1_2 = "Select City, count(*) as Receiver_Count from receivers group by City order by Receiver_Count desc;"
+
+QUERY2 = "select Provider_Type, sum(Quantity) as Total_Quantity from food_listings group by Provider_Type order by Total_Quantity desc"
+
+QUERY3 = "select Name, Contact from providers where City = %s;"
+
+QUERY4 = """
+select r.Receiver_ID, r.Name, count(c.Claim_ID) as No_of_Claims
+from receivers as r
+join {claims} as c
+on r.Receiver_ID = c.Receiver_ID
+where c.Status = 'Completed'
+group by r.Name, r.Receiver_ID
+order by No_of_Claims desc;
+"""
+
+QUERY5_1 = """
+select p.Provider_ID, p.Name, sum(f.Quantity) as Total_Quantity
+from providers as p
+join food_listings as f
+on p.Provider_ID = f.Provider_ID
+group by p.Provider_ID, p.Name
+order by Total_Quantity desc
+"""
+
+# Expired listings can no longer be claimed, so they are not counted as available. The
+# summary tables have no expiry date, so this statement always reads food_listings, where
+# idx_food_expiry narrows it to the unexpired listings
+QUERY5_2 = "select sum(Quantity) as Total_Quantity_Available from food_listings where Expiry_Date >= current_date;"
+
+QUERY6 = """
+select Location, count(*) as Total_Listing
+from food_listings group by Location
+order by Total_Listing desc
+limit 1
+"""
+
+QUERY7 = """
+select Food_Type, count(*) as Total_Listing
+from food_listings group by Food_Type
+order by Total_Listing desc
+"""
+
+QUERY8 = """
+select f.Food_ID, f.Food_Name, count(c.Claim_ID) as Claim_Count
+from {claims} as c join food_listings as f
+on f.Food_ID = c.Food_ID
+group by f.Food_ID, f.Food_Name
+order by Claim_Count desc;
+"""
+
+QUERY9 = """
+select p.Provider_ID, p.Name, count(c.Claim_ID) as Successful_Claims
+from {claims} as c
+join food_listings as f on c.Food_ID = f.Food_ID
+join providers as p on f.Provider_ID = p.Provider_ID
+where c.Status = 'Completed'
+group by p.Provider_ID, p.Name
+order by Successful_Claims desc
+limit 1
+"""
+
+QUERY10 = """
+select c.Status, count(*) * 100.0 / (select count(*) from {claims} as c2) as Percentage
+from {claims} as c
+group by c.Status
+order by Percentage desc
+"""
+
+QUERY11 = """
+select r.Receiver_ID, r.Name, avg(f.Quantity) as Avg_Quantity
+from receivers as r
+join {claims} as c on r.Receiver_ID = c.Receiver_ID
+join food_listings as f on f.Food_ID = c.Food_ID
+group by r.Receiver_ID, r.Name
+order by Avg_Quantity desc
+"""
+
+QUERY12 = """
+select f.Meal_Type, count(c.Claim_ID) as Claim_Count
+from {claims} as c
+join food_listings as f on c.Food_ID = f.Food_ID
+group by f.Meal_Type
+order by Claim_Count desc
+limit 1
+"""
+
+QUERY13 = """
+select p.Provider_ID, p.Name, sum(f.Quantity) as Total_Quantity
+from food_listings as f
+join providers as p on p.Provider_ID = f.Provider_ID
+group by p.Provider_ID, p.Name
+order by Total_Quantity desc
+"""
+
+QUERY14 = """
+select f.Food_Name, count(c.Claim_ID) as Unclaim_Count
+from food_listings as f
+join {claims} as c on f.Food_ID = c.Food_ID
+where c.Status = 'Cancelled'
+group by f.Food_Name
+order by Unclaim_Count desc
+"""
+
+QUERY15 = """
+select p.Provider_ID, p.Name, count(distinct f.Food_Name) as Unique_Food_Items
+from providers p
+join food_listings f on p.Provider_ID = f.Provider_ID
+group by p.Provider_ID, p.Name
+order by Unique_Food_Items desc
+"""
+
+# Dashboard aggregates served from the incrementally maintained tables in summaries.py,
+# these read O(groups) rows instead of scanning food_listings and claims. NULL groups are
+# stored as '' (summaries.NULL_GROUP) and turned back into NULL here
+QUERY2_SUMMARY = """
+select nullif(Provider_Type, ''), Total_Quantity
+from summary_provider_type_totals
+order by Total_Quantity desc
+"""
+
+QUERY5_1_SUMMARY = """
+select p.Provider_ID, p.Name, s.Total_Quantity
+from summary_provider_totals as s
+join providers as p on p.Provider_ID = s.Provider_ID
+order by s.Total_Quantity desc
+"""
+
+QUERY6_SUMMARY = """
+select nullif(Location, ''), Listing_Count as Total_Listing
+from summary_location_totals
+order by Total_Listing desc
+limit 1
+"""
+
+QUERY7_SUMMARY = """
+select nullif(Food_Type, ''), Listing_Count as Total_Listing
+from summary_food_type_totals
+order by Total_Listing desc
+"""
+
+QUERY10_SUMMARY = """
+select nullif(Status, ''), Claim_Count * 100.0 / (select sum(Claim_Count) from summary_claim_status) as Percentage
+from summary_claim_status
+order by Percentage desc
+"""
+
+QUERY12_SUMMARY = """
+select nullif(Meal_Type, ''), Claim_Count
+from summary_meal_type_claims
+order by Claim_Count desc
+limit 1
+"""
+
+
+# P & R Filters lookups. City matching uses the City indexes and is case-insensitive
+# through the column's default (_ci) collation, so no lower() is needed around City
+PROVIDERS_BY_CITY = "select Provider_ID, Name, Address, Contact from providers where City = %s"
+PROVIDER_BY_ID = "select Name, Address, Contact from providers where Provider_ID = %s"
+RECEIVERS_BY_CITY = "select Receiver_ID, Name, Contact from receivers where City = %s"
+RECEIVER_BY_ID = "select Name, Contact from receivers where Receiver_ID = %s"
+
+# A query has one or more statements. A statement's "summary_sql" is used instead of its
+# "sql" when the summary tables exist, "params" lists the query parameters it binds in order
+# and "show" is False for statements that only feed a chart.
+# Charts: kind bar/barh/pie drawn from one statement's result, see query_engine.make_chart
+REGISTRY = [
+    {
+        "id": "query1",
+        "title": "How many food providers and receivers are there in each city?",
+        "statements": [
+            {"id": "query1_1", "sql": QUERY1_1, "tables": ["providers"],
+             "columns": ["City", "Provider Count"], "subheader": "Food Providers"},
+            {"id": "query1_2", "sql": QUERY1_2, "tables": ["receivers"],
+             "columns": ["City", "Receiver Count"], "subheader": "Food Receivers"},
+        ],
+    },
+    {
+        "id": "query2",
+        "title": "Which type of food provider (restaurant, grocery store, etc.) contributes the most food?",
+        "statements": [
+            {"id": "query2", "sql": QUERY2, "summary_sql": QUERY2_SUMMARY, "tables": ["food_listings"],
+             "columns": ["Provider Type", "Total Quantity"]},
+        ],
+        "charts": [
+            {"statement": "query2", "kind": "bar", "x": "Provider Type", "y": "Total Quantity",
+             "title": "Total Quantity by Provider Type", "rotation": 45},
+        ],
+    },
+    {
+        "id": "query3",
+        "title": "What is the contact information of food providers in a specific city?",
+        "params": {"City": "New Carol"},
+        "subheader": "Providers from {City}",
+        "statements": [
+            {"id": "query3", "sql": QUERY3, "params": ["City"], "tables": ["providers"],
+             "columns": ["Name", "Contact"]},
+        ],
+    },
+    {
+        "id": "query4",
+        "title": "Which receivers have claimed the most food?",
+        "statements": [
+            {"id": "query4", "sql": QUERY4, "tables": ["receivers", "claims"],
+             "columns": ["Receiver ID", "Name", "No of Claims"]},
+        ],
+        "charts": [
+            {"statement": "query4", "kind": "bar", "x": "Name", "y": "No of Claims", "top": 5, "color": "green",
+             "xlabel": "Receiver Name", "ylabel": "Number of Claims",
+             "title": "Top 5 Receivers by Number of Claims", "rotation": 45},
+        ],
+    },
+    {
+        "id": "query5",
+        "title": "What is the total quantity of food available from all providers?",
+        "statements": [
+            {"id": "query5_1", "sql": QUERY5_1, "summary_sql": QUERY5_1_SUMMARY,
+             "tables": ["providers", "food_listings"], "columns": ["Provider ID", "Name", "Total Quantity"],
+             "show": False},
+            {"id": "query5_2", "sql": QUERY5_2, "tables": ["food_listings"],
+             "columns": ["Total Quantity Available"]},
+        ],
+        "charts": [
+            {"statement": "query5_1", "kind": "bar", "x": "Name", "y": "Total Quantity", "top": 5, "color": "red",
+             "xlabel": "Provider Name", "title": "Top 5 Providers by Total Quantity", "rotation": 45, "ha": "right"},
+        ],
+    },
+    {
+        "id": "query6",
+        "title": "Which city has the highest number of food listings?",
+        "statements": [
+            {"id": "query6", "sql": QUERY6, "summary_sql": QUERY6_SUMMARY, "tables": ["food_listings"],
+             "columns": ["Location", "Total Listing"]},
+        ],
+    },
+    {
+        "id": "query7",
+        "title": "What are the most commonly available food types?",
+        "statements": [
+            {"id": "query7", "sql": QUERY7, "summary_sql": QUERY7_SUMMARY, "tables": ["food_listings"],
+             "columns": ["Food Type", "Total Listing"]},
+        ],
+        "charts": [
+            {"statement": "query7", "kind": "pie", "labels": "Food Type", "values": "Total Listing",
+             "title": "Food Type Distribution"},
+        ],
+    },
+    {
+        "id": "query8",
+        "title": "How many food claims have been made for each food item?",
+        "statements": [
+            {"id": "query8", "sql": QUERY8, "tables": ["claims", "food_listings"],
+             "columns": ["Food ID", "Food Name", "Claim Count"]},
+        ],
+    },
+    {
+        "id": "query9",
+        "title": "Which provider has had the highest number of successful food claims?",
+        "statements": [
+            {"id": "query9", "sql": QUERY9, "tables": ["claims", "food_listings", "providers"],
+             "columns": ["Provider ID", "Provider Name", "Successful Claims"]},
+        ],
+    },
+    {
+        "id": "query10",
+        "title": "What percentage of food claims are completed vs. pending vs. canceled?",
+        "subheader": "Completed vs Pending vs Cancelled",
+        "statements": [
+            {"id": "query10", "sql": QUERY10, "summary_sql": QUERY10_SUMMARY, "tables": ["claims"],
+             "columns": ["Status", "Percentage"]},
+        ],
+        "charts": [
+            {"statement": "query10", "kind": "pie", "labels": "Status", "values": "Percentage", "donut": True,
+             "title": "Claim Status Distribution"},
+        ],
+    },
+    {
+        "id": "query11",
+        "title": "What is the average quantity of food claimed per receiver?",
+        "statements": [
+            {"id": "query11", "sql": QUERY11, "tables": ["receivers", "claims", "food_listings"],
+             "columns": ["Receiver ID", "Receiver Name", "Average Quantity"]},
+        ],
+    },
+    {
+        "id": "query12",
+        "title": "Which meal type (breakfast, lunch, dinner, snacks) is claimed the most?",
+        "statements": [
+            {"id": "query12", "sql": QUERY12, "summary_sql": QUERY12_SUMMARY, "tables": ["claims", "food_listings"],
+             "columns": ["Meal Type", "Claim Count"]},
+        ],
+    },
+    {
+        "id": "query13",
+        "title": "What is the total quantity of food donated by each provider?",
+        "statements": [
+            {"id": "query13", "sql": QUERY13, "summary_sql": QUERY5_1_SUMMARY, "tables": ["food_listings", "providers"],
+             "columns": ["Provider ID", "Provider Name", "Total Quantity"]},
+        ],
+    },
+    {
+        "id": "query14",
+        "title": "Which food items have the highest unclaimed rate?",
+        "statements": [
+            {"id": "query14", "sql": QUERY14, "tables": ["food_listings", "claims"],
+             "columns": ["Food Name", "Cancelled Claims"]},
+        ],
+        "charts": [
+            {"statement": "query14", "kind": "barh", "x": "Food Name", "y": "Cancelled Claims", "color": "tomato",
+             "title": "Cancelled Claims by Food Item"},
+        ],
+    },
+    {
+        "id": "query15",
+        "title": "How many unique food items does each provider contribute?",
+        "statements": [
+            {"id": "query15", "sql": QUERY15, "tables": ["providers", "food_listings"],
+             "columns": ["Provider ID", "Provider Name", "Unique Food Items"]},
+        ],
+    },
+]
+
+QUERIES_BY_ID = {spec["id"]: spec for spec in REGISTRY}
+STATEMENTS_BY_ID = {statement["id"]: statement for spec in REGISTRY for statement in spec["statements"]}
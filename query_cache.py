@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """LRU cache of query results with a TTL and per-table invalidation.
+
+    Entries are keyed by (query id, params) and remember which tables the
+    query reads, so a write to one table only drops the results built from it.
+    A result loaded while one of its tables was invalidated is returned but not kept.
+    """
+
+    def __init__(self, ttl=300.0, max_entries=128):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Bumped by every invalidation of a table; clear() bumps them all through _epoch
+        self._generations = {}
+        self._epoch = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_loads = 0
+
+    @staticmethod
+    def make_key(query_id, params=None):
+        return query_id, tuple(params or ())
+
+    def get(self, query_id, params=None):
+        key = self.make_key(query_id, params)
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def _store(self, key, value, tables):
+        # Caller holds the lock
+        self._entries[key] = (time.monotonic() + self.ttl, frozenset(tables), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _generation(self, tables):
+        # Caller holds the lock
+        return self._epoch, tuple(self._generations.get(table, 0) for table in tables)
+
+    def put(self, query_id, value, tables, params=None):
+        with self._lock:
+            self._store(self.make_key(query_id, params), value, tables)
+
+    def get_or_load(self, query_id, load, tables, params=None):
+        value = self.get(query_id, params)
+        if value is None:
+            with self._lock:
+                generation = self._generation(tables)
+            value = load()
+
+            # A write committed while the query ran may not be in its result
+            with self._lock:
+                if self._generation(tables) == generation:
+                    self._store(self.make_key(query_id, params), value, tables)
+                else:
+                    self.stale_loads += 1
+        return value
+
+    def invalidate(self, query_id, params=None):
+        with self._lock:
+            if self._entries.pop(self.make_key(query_id, params), None) is not None:
+                self.invalidations += 1
+
+    def invalidate_tables(self, *tables):
+        touched = set(tables)
+        with self._lock:
+            for table in touched:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry[1] & touched]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_loads": self.stale_loads,
+            }
@@ -0,0 +1,234 @@
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date
+
+import pandas as pd
+
+from profiling import trace
+from queries import REGISTRY, QUERIES_BY_ID
+
+# Runs registry queries. `fetch(statement id, sql, tables, params)` returns the rows, so the
+# app can pass its cached fetch and scripts can pass connection_fetch(conn)
+
+
+def connection_fetch(conn):
+    def fetch(statement_id, query, tables, params=None):
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params or ())
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    return fetch
+
+
+def bind_params(spec, params=None):
+    # Declared defaults overridden by the caller's values
+    values = dict(spec.get("params", {}))
+    values.update(params or {})
+    return values
+
+
+# Claims moved out by archive.py, read together with the hot table for the long history
+CLAIMS_HISTORY = """(select Claim_ID, Food_ID, Receiver_ID, Status, Timestamp from claims
+union all
+select Claim_ID, Food_ID, Receiver_ID, Status, Timestamp from claims_archive)"""
+
+
+def claims_source(window=None):
+    # What `{claims}` reads. window is None (the hot table) or a dict with optional
+    # "history": "all" to include archived claims and "since"/"until" dates on Timestamp
+    window = window or {}
+    source = CLAIMS_HISTORY if window.get("history") == "all" else "claims"
+
+    # The bounds are date objects rendered by isoformat, never caller text
+    bounds = []
+    if window.get("since"):
+        bounds.append(f"Timestamp >= '{date.fromisoformat(str(window['since'])).isoformat()}'")
+    if window.get("until"):
+        bounds.append(f"Timestamp < '{date.fromisoformat(str(window['until'])).isoformat()}'")
+
+    if bounds:
+        source = f"(select * from {source} as w where {' and '.join(bounds)})"
+    return source
+
+
+def window_key(window=None):
+    # Suffix that keeps results of different windows apart in the result cache
+    window = window or {}
+    parts = [str(window.get(name) or "") for name in ("history", "since", "until")]
+    return ":".join(parts) if any(parts) else ""
+
+
+def statement_sql(statement, use_summaries=True, window=None):
+    # Summaries track the hot claims table only, so any window reads the base tables
+    if use_summaries and statement.get("summary_sql") and not window_key(window):
+        return statement["summary_sql"]
+    if "{claims}" in statement["sql"]:
+        return statement["sql"].replace("{claims}", claims_source(window))
+    return statement["sql"]
+
+
+def statement_tables(statement, window=None):
+    if "{claims}" in statement["sql"] and (window or {}).get("history") == "all":
+        return statement["tables"] + ["claims_archive"]
+    return statement["tables"]
+
+
+def statement_params(statement, values):
+    return tuple(values[name] for name in statement.get("params", []))
+
+
+def run_statement(fetch, statement, values, use_summaries=True, window=None):
+    key = statement["id"]
+    if "{claims}" in statement["sql"] and window_key(window):
+        key = f"{key}@{window_key(window)}"
+
+    rows = fetch(key, statement_sql(statement, use_summaries, window), statement_tables(statement, window),
+                 statement_params(statement, values))
+    with trace("dataframe", statement["id"]):
+        return pd.DataFrame(rows, columns=statement["columns"])
+
+
+def run_query(fetch, spec, params=None, use_summaries=True, window=None):
+    # Returns {statement id: DataFrame}
+    values = bind_params(spec, params)
+    return {
+        statement["id"]: run_statement(fetch, statement, values, use_summaries, window)
+        for statement in spec["statements"]
+    }
+
+
+def with_time_limit(query, limit_ms):
+    # MySQL optimizer hint that aborts the select on the server after limit_ms;
+    # other engines read it as a comment
+    head, _, rest = query.lstrip().partition(" ")
+    if head.lower() != "select":
+        return query
+    return f"{head} /*+ MAX_EXECUTION_TIME({int(limit_ms)}) */ {rest}"
+
+
+def run_concurrent(fetch, specs, params=None, use_summaries=True, max_workers=8, timeout=30.0, window=None):
+    # Runs every statement of every spec at the same time, each on its own pooled connection,
+    # so a page costs as much as its slowest statement. Returns {query id: {statement id: DataFrame}}.
+    # `fetch` must not touch per-thread state since it is called from worker threads.
+    limit_ms = timeout * 1000
+
+    def timed_fetch(statement_id, query, tables, params=None):
+        return fetch(statement_id, with_time_limit(query, limit_ms), tables, params)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query")
+    futures = {}
+
+    try:
+        for spec in specs:
+            values = bind_params(spec, params)
+            for statement in spec["statements"]:
+                future = executor.submit(run_statement, timed_fetch, statement, values, use_summaries, window)
+                futures[future] = (spec["id"], statement["id"])
+
+        done, pending = wait(futures, timeout=timeout)
+
+        if pending:
+            # Statements that have not started are cancelled, running ones stop at the server time limit
+            for future in pending:
+                future.cancel()
+            unfinished = ", ".join(sorted(futures[future][1] for future in pending))
+            raise TimeoutError(f"Queries did not finish within {timeout}s: {unfinished}")
+
+        results = {spec["id"]: {} for spec in specs}
+        for future, (query_id, statement_id) in futures.items():
+            results[query_id][statement_id] = future.result()
+        return results
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def make_chart(chart, df):
+    # Plain Figure objects are not registered with pyplot, so nothing accumulates in a
+    # long-running process; charts.py renders and caches them. matplotlib is imported on the
+    # first chart, not with the module
+    from matplotlib.artist import setp
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Circle
+
+    if chart.get("top"):
+        df = df.sort_values(by=chart["y"], ascending=False).head(chart["top"])
+
+    if chart["kind"] == "pie":
+        fig = Figure(figsize=(6, 6))
+        ax = fig.subplots()
+        ax.pie(
+            df[chart["values"]],
+            labels=df[chart["labels"]],
+            autopct="%1.1f%%",
+            startangle=90,
+            wedgeprops=dict(width=0.4) if chart.get("donut") else None,
+        )
+        if chart.get("donut"):
+            ax.add_artist(Circle((0, 0), 0.70, fc="white"))
+
+    elif chart["kind"] == "barh":
+        fig = Figure(figsize=(8, 5))
+        ax = fig.subplots()
+        ax.barh(df[chart["x"]], df[chart["y"]], color=chart.get("color"))
+        ax.set_xlabel(chart.get("xlabel", chart["y"]))
+        ax.set_ylabel(chart.get("ylabel", chart["x"]))
+
+    else:
+        fig = Figure(figsize=(8, 5))
+        ax = fig.subplots()
+        ax.bar(df[chart["x"]], df[chart["y"]], color=chart.get("color"))
+        ax.set_xlabel(chart.get("xlabel", chart["x"]))
+        ax.set_ylabel(chart.get("ylabel", chart["y"]))
+
+    if chart.get("rotation"):
+        setp(ax.get_xticklabels(), rotation=chart["rotation"], ha=chart.get("ha", "center"))
+
+    ax.set_title(chart["title"])
+    fig.tight_layout()
+    return fig
+
+
+def save_results(results, out_dir):
+    # Same file names the notebook has always written, e.g. Queries/query1_1_df.csv
+    os.makedirs(out_dir, exist_ok=True)
+    for statement_id, df in results.items():
+        df.to_csv(os.path.join(out_dir, f"{statement_id}_df.csv"), index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the registered queries against the FOOD database")
+    parser.add_argument("queries", nargs="*", help="query ids such as query4 (default: all 15)")
+    parser.add_argument("--param", action="append", default=[], help="query parameter as NAME=VALUE")
+    parser.add_argument("--out", help="write each result to <out>/<statement id>_df.csv")
+    parser.add_argument("--base-tables", action="store_true", help="ignore the summary tables")
+    parser.add_argument("--history", choices=["hot", "all"], default="hot",
+                        help="claims to read: the hot table or hot plus archived")
+    parser.add_argument("--since", type=date.fromisoformat, help="only claims made on or after this date")
+    parser.add_argument("--until", type=date.fromisoformat, help="only claims made before this date")
+    args = parser.parse_args()
+
+    from db_pool import mysql_connect
+
+    connection = mysql_connect()
+    fetch = connection_fetch(connection)
+    overrides = dict(item.split("=", 1) for item in args.param)
+    claims_window = {"history": args.history if args.history == "all" else None,
+                     "since": args.since, "until": args.until}
+
+    for query_spec in [QUERIES_BY_ID[q] for q in args.queries] or REGISTRY:
+        query_results = run_query(fetch, query_spec, overrides, use_summaries=not args.base_tables,
+                                  window=claims_window)
+
+        if args.out:
+            save_results(query_results, args.out)
+        else:
+            print(f"== {query_spec['id']}: {query_spec['title']}")
+            for result in query_results.values():
+                print(result.to_string(index=False))
+
+    connection.close()
@@ -0,0 +1,106 @@
+import random
+import time
+from datetime import date, datetime
+
+from changelog import record_changes
+from crud import TABLE_COLUMNS
+from summaries import apply_deltas
+
+# Claims that take food off a listing. The listing row is locked with SELECT ... FOR UPDATE,
+# so concurrent reservations of the same listing queue on that one row: each sees the
+# quantity the previous one left and a listing can never be over-allocated. The
+# transaction is kept to a handful of statements so the hot row is held only briefly
+
+# InnoDB errors that roll back a transaction which can simply be run again
+RETRYABLE_ERRORS = {
+    1213,  # ER_LOCK_DEADLOCK
+    1205,  # ER_LOCK_WAIT_TIMEOUT
+}
+
+LISTING_FOR_UPDATE = """
+select {columns} from food_listings
+where Food_ID = %s
+for update
+"""
+
+
+class ReservationError(Exception):
+    """The listing cannot be claimed: missing, expired or without enough quantity left."""
+
+
+def _reserve_once(conn, food_id, receiver_id, quantity, claim_id, today):
+    _, listing_columns = TABLE_COLUMNS["food_listings"]
+    _, claim_columns = TABLE_COLUMNS["claims"]
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(LISTING_FOR_UPDATE.format(columns=", ".join(listing_columns)), (food_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise ReservationError(f"Food_ID {food_id} does not exist")
+
+        listing = dict(zip(listing_columns, row))
+        if listing["Expiry_Date"] is not None and listing["Expiry_Date"] < today:
+            raise ReservationError(f"Food_ID {food_id} expired on {listing['Expiry_Date']}")
+        if (listing["Quantity"] or 0) < quantity:
+            raise ReservationError(f"Food_ID {food_id} has {listing['Quantity'] or 0} left, {quantity} requested")
+
+        cursor.execute("update food_listings set Quantity = Quantity - %s where Food_ID = %s", (quantity, food_id))
+
+        # Claim_ID is AUTO_INCREMENT (migration 6) unless the caller picks one. The claim keeps
+        # the quantity it holds (migration 8), given back if it is cancelled while Pending
+        claim = {"Claim_ID": claim_id, "Food_ID": food_id, "Receiver_ID": receiver_id,
+                 "Status": "Pending", "Timestamp": datetime.now().replace(microsecond=0)}
+        insert_columns = claim_columns if claim_id is not None else claim_columns[1:]
+        cursor.execute(
+            f"insert into claims ({', '.join(insert_columns)}, Quantity) "
+            f"values ({', '.join(['%s'] * (len(insert_columns) + 1))})",
+            tuple(claim[column] for column in insert_columns) + (quantity,),
+        )
+        claim["Claim_ID"] = claim_id if claim_id is not None else cursor.lastrowid
+
+        # The reservation is also kept in the audit trail next to the sweeper's cancellations
+        cursor.execute(
+            "insert into claim_audit (Claim_ID, Food_ID, Old_Status, New_Status, Reason, Changed_At) "
+            "values (%s, %s, %s, %s, %s, %s)",
+            (claim["Claim_ID"], food_id, None, "Pending", f"reserved {quantity}", claim["Timestamp"]),
+        )
+
+        apply_deltas(cursor, "food_listings", [listing], [dict(listing, Quantity=listing["Quantity"] - quantity)])
+        apply_deltas(cursor, "claims", [], [claim])
+        record_changes(cursor, "food_listings", "update", [food_id])
+        record_changes(cursor, "claims", "insert", [claim["Claim_ID"]])
+        conn.commit()
+
+        return {"claim_id": claim["Claim_ID"], "food_id": food_id, "remaining": listing["Quantity"] - quantity}
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+
+
+def reserve(conn, food_id, receiver_id, quantity=1, claim_id=None, today=None, max_attempts=5, backoff=0.01):
+    # Reserves `quantity` of a listing for a receiver and records a Pending claim, all in one
+    # transaction. Deadlocks and lock wait timeouts are retried with jittered exponential
+    # backoff. Returns {"claim_id", "food_id", "remaining", "attempts"}; raises
+    # ReservationError when the listing cannot be claimed
+    if quantity < 1:
+        raise ReservationError("Quantity must be at least 1")
+    today = today or date.today()
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            result = _reserve_once(conn, food_id, receiver_id, quantity, claim_id, today)
+            result["attempts"] = attempt
+            return result
+
+        except ReservationError:
+            raise
+
+        except Exception as e:
+            if getattr(e, "errno", None) not in RETRYABLE_ERRORS or attempt == max_attempts:
+                raise
+            time.sleep(backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
@@ -0,0 +1,292 @@
+import bisect
+import heapq
+import re
+import sys
+import threading
+from collections import Counter, defaultdict
+
+# Free-text search over the names and places in the four tables, answered from memory.
+# Every field is split into lower-case words; an inverted index maps each word to the rows
+# containing it, and a trigram index over the distinct words finds the ones a misspelt query
+# word is close to. Like the matcher, it is loaded once and kept current through on_write
+
+# table -> (primary key, searchable columns with their ranking weight)
+SEARCH_FIELDS = {
+    "providers": ("Provider_ID", {"Name": 2.0, "City": 1.0, "Address": 0.5}),
+    "receivers": ("Receiver_ID", {"Name": 2.0, "City": 1.0}),
+    "food_listings": ("Food_ID", {"Food_Name": 2.0, "Location": 1.0}),
+}
+
+# How well a query word matches an indexed word, before the field weight
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+FUZZY_SCORE = 0.6
+
+# Prefixes matching more words than this keep the shortest ones
+PREFIX_TERMS = 200
+
+# At most this many words of a query are used
+QUERY_TERMS = 8
+
+# Query words whose expansions are remembered between searches
+EXPANSION_CACHE = 4096
+
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return WORD.findall(str(text).lower()) if text is not None else []
+
+
+def trigrams(term):
+    padded = f"${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(term):
+    # Edits allowed for a query word: none for very short words, two for long ones
+    return 0 if len(term) <= 2 else 1 if len(term) <= 5 else 2
+
+
+def edit_distance(a, b, limit):
+    # Levenshtein distance, or limit + 1 as soon as it is known to exceed `limit`
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _select(table):
+    key, fields = SEARCH_FIELDS[table]
+    return f"select {key}, {', '.join(fields)} from {table}"
+
+
+class SearchIndex:
+    """Ranked prefix and typo-tolerant search over providers, receivers and food listings.
+
+    Postings are kept per (table, column, word) so a match in a name ranks above one in a
+    city or address. The distinct words are held sorted for prefix lookups and in a trigram
+    index for fuzzy ones.
+    """
+
+    def __init__(self, fetch):
+        # fetch(query, params) -> rows, used for the initial load and to re-read written rows
+        self._fetch = fetch
+        self._lock = threading.RLock()
+
+        # table -> {key: tuple of the searchable values}
+        self.rows = {table: {} for table in SEARCH_FIELDS}
+        # (table, column, word) -> keys
+        self.postings = defaultdict(set)
+        # word -> number of postings holding it, words are dropped when it reaches 0
+        self.vocabulary = Counter()
+        self._sorted_terms = []
+        self._by_trigram = defaultdict(set)
+
+        # Expansions of a query word, valid until the vocabulary changes
+        self._expansions = {}
+
+    # Index maintenance
+
+    def _add_term(self, term):
+        if self.vocabulary[term] == 0:
+            bisect.insort(self._sorted_terms, term)
+            for gram in trigrams(term):
+                self._by_trigram[gram].add(term)
+            self._expansions.clear()
+        self.vocabulary[term] += 1
+
+    def _drop_term(self, term):
+        self.vocabulary[term] -= 1
+        if self.vocabulary[term] <= 0:
+            del self.vocabulary[term]
+            del self._sorted_terms[bisect.bisect_left(self._sorted_terms, term)]
+            for gram in trigrams(term):
+                self._by_trigram[gram].discard(term)
+                if not self._by_trigram[gram]:
+                    del self._by_trigram[gram]
+            self._expansions.clear()
+
+    def _index(self, table, key, values):
+        # Repeated names and cities share one string
+        values = tuple(None if value is None else sys.intern(str(value)) for value in values)
+        self.rows[table][key] = values
+        for column, value in zip(SEARCH_FIELDS[table][1], values):
+            for term in set(tokenize(value)):
+                postings = self.postings[(table, column, term)]
+                if key not in postings:
+                    postings.add(key)
+                    self._add_term(term)
+
+    def _unindex(self, table, key):
+        values = self.rows[table].pop(key, None)
+        if values is None:
+            return
+        for column, value in zip(SEARCH_FIELDS[table][1], values):
+            for term in set(tokenize(value)):
+                postings = self.postings.get((table, column, term))
+                if postings is not None and key in postings:
+                    postings.discard(key)
+                    if not postings:
+                        del self.postings[(table, column, term)]
+                    self._drop_term(term)
+
+    def set_row(self, table, key, values=None):
+        # Passing no values removes the row
+        with self._lock:
+            self._unindex(table, key)
+            if values is not None:
+                self._index(table, key, values)
+
+    def load(self):
+        # Built in a new index and swapped in under this index's lock, which is held throughout
+        # so a write arriving meanwhile is applied after the swap
+        with self._lock:
+            fresh = SearchIndex(self._fetch)
+            for table in SEARCH_FIELDS:
+                for row in self._fetch(_select(table), None):
+                    fresh._index(table, row[0], row[1:])
+
+            for name, value in vars(fresh).items():
+                if name not in ("_fetch", "_lock"):
+                    setattr(self, name, value)
+        return self
+
+    def on_write(self, table, key):
+        # Re-reads the written row by primary key after a committed CRUD write
+        if table not in SEARCH_FIELDS:
+            return
+        rows = self._fetch(f"{_select(table)} where {SEARCH_FIELDS[table][0]} = %s", (key,))
+        self.set_row(table, key, rows[0][1:] if rows else None)
+
+    # Searching
+
+    def _expand(self, word, typos_always=False):
+        # [(indexed word, match score)] for one query word: the word itself and words it is a
+        # prefix of, or failing those (or with typos_always) the words within max_typos edits
+        if (word, typos_always) in self._expansions:
+            return self._expansions[(word, typos_always)]
+
+        found = {}
+        terms = self._sorted_terms
+        start = end = bisect.bisect_left(terms, word)
+        while end < len(terms) and terms[end].startswith(word):
+            end += 1
+        prefixed = terms[start:end]
+        for term in heapq.nsmallest(PREFIX_TERMS, prefixed, key=len):
+            # Completions that add little to the typed word rank higher
+            found[term] = EXACT_SCORE if term == word else PREFIX_SCORE * (0.5 + 0.5 * len(word) / len(term))
+
+        # Typos are only looked for when nothing starts with the word, so a common word does
+        # not drag in every word a couple of edits away
+        typos = max_typos(word)
+        if typos and (typos_always or not found):
+            # Words within k edits share at least |trigrams| - 3k trigrams with the query word
+            grams = trigrams(word)
+            shared = Counter()
+            for gram in grams:
+                shared.update(self._by_trigram.get(gram, ()))
+            needed = max(1, len(grams) - 3 * typos)
+            for term, count in shared.items():
+                if count >= needed and term not in found:
+                    distance = edit_distance(word, term, typos)
+                    if distance <= typos:
+                        found[term] = FUZZY_SCORE * (1 - distance / (len(word) + 1))
+
+        expansion = sorted(found.items(), key=lambda item: -item[1])
+        if len(self._expansions) >= EXPANSION_CACHE:
+            self._expansions.clear()
+        self._expansions[(word, typos_always)] = expansion
+        return expansion
+
+    def _groups(self, table, word, typos_always):
+        # [(score, keys)] best first, for every column and indexed word a query word matches
+        groups = []
+        for term, score in self._expand(word, typos_always):
+            for column, weight in SEARCH_FIELDS[table][1].items():
+                keys = self.postings.get((table, column, term))
+                if keys:
+                    groups.append((score * weight, keys))
+        groups.sort(key=lambda group: -group[0])
+        return groups
+
+    def _search_table(self, table, words, limit, typos_always):
+        per_word = [self._groups(table, word, typos_always) for word in words]
+        if not all(per_word):
+            return []
+
+        if len(per_word) == 1:
+            # One word: a row scores its best group, so the groups are read best first and
+            # reading stops at `limit` rows
+            found, seen = [], set()
+            for score, keys in per_word[0]:
+                for key in keys:
+                    if key not in seen:
+                        seen.add(key)
+                        found.append((score, key))
+                        if len(found) >= limit:
+                            return found
+            return found
+
+        # Several words: every word must match. Candidates come from the word with the fewest
+        # matching rows and are narrowed by intersecting them with the others' rows
+        per_word.sort(key=lambda groups: sum(len(keys) for _, keys in groups))
+        scores = {}
+        for score, keys in reversed(per_word[0]):
+            for key in keys:
+                scores[key] = score
+
+        for groups in per_word[1:]:
+            matched = {}
+            for score, keys in groups:
+                for key in scores.keys() & keys:
+                    if key not in matched:
+                        matched[key] = scores[key] + score
+            scores = matched
+            if not scores:
+                return []
+
+        return heapq.nsmallest(limit, ((score, key) for key, score in scores.items()),
+                               key=lambda item: (-item[0], item[1]))
+
+    def search(self, query, tables=None, limit=20):
+        # Returns [{"Table", "ID", "Score", <searchable columns>}] best first. Every word of the
+        # query has to match a row, exactly, as a prefix or with typos
+        words = list(dict.fromkeys(tokenize(query)))[:QUERY_TERMS]
+        if not words or limit < 1:
+            return []
+
+        with self._lock:
+            # A word that is spelt like another real word ("Gonzalez" for "Gonzales") only
+            # looks for typos when the search finds nothing without them
+            found = []
+            for typos_always in (False, True):
+                for table in tables or SEARCH_FIELDS:
+                    found.extend((score, table, key)
+                                 for score, key in self._search_table(table, words, limit, typos_always))
+                if found:
+                    break
+
+            results = []
+            for score, table, key in heapq.nsmallest(limit, found, key=lambda item: (-item[0], item[1], item[2])):
+                fields = SEARCH_FIELDS[table][1]
+                results.append(dict(zip(fields, self.rows[table][key]), Table=table, ID=key,
+                                    Score=round(score, 3)))
+            return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                **{table: len(rows) for table, rows in self.rows.items()},
+                "terms": len(self.vocabulary),
+                "trigrams": len(self._by_trigram),
+                "postings": sum(len(keys) for keys in self.postings.values()),
+            }
@@ -0,0 +1,466 @@
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from crud import TABLE_COLUMNS
+from profiling import trace
+from query_engine import window_key
+
+# The four tables held in memory as typed NumPy columns, shared by every session of the
+# app. Repeated strings (City, Type, Food_Type, Meal_Type, Status, ...) are stored as
+# integer codes into a per-column category list, so the 15 query aggregates are bincounts
+# over code arrays instead of round trips to the database. CRUD writes are applied row by
+# row through on_write and bump `version`
+
+# Storage per column: "int" int64, "category" int32 codes, "text" object, "date"/"datetime" datetime64
+COLUMN_KINDS = {
+    "providers": {"Provider_ID": "int", "Name": "text", "Type": "category", "Address": "text",
+                  "City": "category", "Contact": "text"},
+    "receivers": {"Receiver_ID": "int", "Name": "text", "Type": "category", "City": "category",
+                  "Contact": "text"},
+    "food_listings": {"Food_ID": "int", "Food_Name": "category", "Quantity": "int", "Expiry_Date": "date",
+                      "Provider_ID": "int", "Provider_Type": "category", "Location": "category",
+                      "Food_Type": "category", "Meal_Type": "category"},
+    "claims": {"Claim_ID": "int", "Food_ID": "int", "Receiver_ID": "int", "Status": "category",
+               "Timestamp": "datetime"},
+}
+
+DTYPES = {"int": np.int64, "category": np.int32, "text": object,
+          "date": "datetime64[D]", "datetime": "datetime64[s]"}
+
+
+class ColumnTable:
+    """One table as growable NumPy columns with a tombstone mask for deleted rows."""
+
+    def __init__(self, name):
+        self.name = name
+        self.key, self.columns = TABLE_COLUMNS[name]
+        self.kinds = COLUMN_KINDS[name]
+
+        self.size = 0
+        self.dead = 0
+        self.data = {column: np.empty(0, dtype=DTYPES[self.kinds[column]]) for column in self.columns}
+        self.alive = np.empty(0, dtype=bool)
+        self.row_of = {}
+
+        self.categories = {column: [] for column, kind in self.kinds.items() if kind == "category"}
+        self._codes = {column: {} for column in self.categories}
+
+        # (sorted keys, their rows), rebuilt after a row is added or removed
+        self._key_index = None
+
+    def _encode(self, column, values):
+        # Codes for a batch of values, new values are appended to the column's categories
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        mapping = self._codes[column]
+        categories = self.categories[column]
+
+        lookup = np.empty(len(uniques) + 1, dtype=np.int32)
+        lookup[-1] = -1
+        for i, value in enumerate(uniques):
+            if value not in mapping:
+                mapping[value] = len(categories)
+                categories.append(value)
+            lookup[i] = mapping[value]
+        return lookup[codes]
+
+    def _convert(self, column, values):
+        kind = self.kinds[column]
+        if kind == "category":
+            return self._encode(column, values)
+        if kind == "int":
+            # NULL quantities count as 0, ids are never NULL
+            return np.array(pd.to_numeric(pd.Series(values, dtype=object)).fillna(0), dtype=np.int64)
+        if kind == "text":
+            array = np.empty(len(values), dtype=object)
+            array[:] = values
+            return array
+        return np.array(pd.to_datetime(pd.Series(values, dtype=object), errors="coerce"), dtype=DTYPES[kind])
+
+    def load(self, rows):
+        values = list(zip(*rows)) if rows else [[] for _ in self.columns]
+        self.size = len(rows)
+        self.dead = 0
+        self.data = {column: self._convert(column, list(column_values))
+                     for column, column_values in zip(self.columns, values)}
+        self.alive = np.ones(self.size, dtype=bool)
+        self.row_of = {key: row for row, key in enumerate(self.data[self.key].tolist())}
+        self._key_index = None
+
+    def _grow(self):
+        capacity = max(16, 2 * len(self.alive))
+        for column, array in self.data.items():
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            self.data[column] = grown
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.size] = self.alive[:self.size]
+        self.alive = alive
+
+    def set_row(self, row):
+        key = row[0]
+        position = self.row_of.get(key)
+        if position is None:
+            if self.size == len(self.alive):
+                self._grow()
+            position = self.size
+            self.size += 1
+            self.row_of[key] = position
+            self.alive[position] = True
+            self._key_index = None
+
+        for column, value in zip(self.columns, row):
+            self.data[column][position] = self._convert(column, [value])[0]
+
+    def remove(self, key):
+        position = self.row_of.pop(key, None)
+        if position is None:
+            return
+        self.alive[position] = False
+        self.dead += 1
+        self._key_index = None
+
+        if self.dead > self.size // 4 + 64:
+            self._compact()
+
+    def _compact(self):
+        keep = self.alive[:self.size]
+        self.data = {column: array[:self.size][keep] for column, array in self.data.items()}
+        self.size = int(keep.sum())
+        self.dead = 0
+        self.alive = np.ones(self.size, dtype=bool)
+        self.row_of = {key: row for row, key in enumerate(self.data[self.key].tolist())}
+
+    def column(self, column):
+        return self.data[column][:self.size]
+
+    def mask(self):
+        return self.alive[:self.size]
+
+    def _build_key_index(self):
+        rows = np.flatnonzero(self.mask())
+        keys = self.column(self.key)[rows]
+
+        # Ids are mostly dense, so a key -> row array answers a lookup with one gather;
+        # sparse or negative keys fall back to binary search over the sorted keys
+        if len(keys) == 0 or (keys.min() >= 0 and keys.max() < 4 * len(keys) + 1024):
+            lookup = np.full(int(keys.max()) + 1 if len(keys) else 0, -1, dtype=np.int64)
+            lookup[keys] = rows
+            return ("dense", lookup)
+
+        order = np.argsort(keys, kind="stable")
+        return ("sorted", keys[order], rows[order])
+
+    def rows_of(self, keys):
+        # Row of every key (-1 where there is no live row), a vectorized primary key lookup
+        if self._key_index is None:
+            self._key_index = self._build_key_index()
+
+        keys = np.asarray(keys, dtype=np.int64)
+        if self._key_index[0] == "dense":
+            lookup = self._key_index[1]
+            inside = (keys >= 0) & (keys < len(lookup))
+            if not inside.any():
+                return np.full(len(keys), -1, dtype=np.int64)
+            return np.where(inside, lookup[np.where(inside, keys, 0)], -1)
+
+        _, sorted_keys, rows = self._key_index
+        at = np.searchsorted(sorted_keys, keys).clip(0, len(sorted_keys) - 1)
+        return np.where(sorted_keys[at] == keys, rows[at], -1)
+
+    def decode(self, column, codes):
+        categories = np.array(self.categories[column] + [None], dtype=object)
+        return categories[codes]
+
+    def code(self, column, value):
+        return self._codes[column].get(value, -2)
+
+
+def _ranked(columns, by, limit=None):
+    # DataFrame of `columns` ordered by the `by` column descending; ties keep table order
+    order = np.argsort(-np.asarray(columns[by]), kind="stable")[:limit]
+    return pd.DataFrame({name: np.asarray(values)[order] for name, values in columns.items()})
+
+
+def _count_by_category(table, column, mask):
+    # NULLs (code -1) are left out
+    codes = table.column(column)[mask]
+    codes = codes[codes >= 0]
+    counts = np.bincount(codes, minlength=len(table.categories[column]))
+    present = np.flatnonzero(counts)
+    return table.decode(column, present), counts[present]
+
+
+def _sum_by_category(table, column, weights, mask):
+    mask = mask & (table.column(column) >= 0)
+    codes = table.column(column)[mask]
+    counts = np.bincount(codes, minlength=len(table.categories[column]))
+    sums = np.bincount(codes, weights=weights[mask], minlength=len(table.categories[column]))
+    present = np.flatnonzero(counts)
+    return table.decode(column, present), sums[present].astype(np.int64)
+
+
+class Snapshot:
+    """In-memory copy of providers, receivers, food_listings and claims that serves the
+    registry queries with vectorized aggregates.
+
+    Rows written through the app arrive through on_write. Writes made outside the app
+    (the sweeper, archive job or bulk loads) are picked up by the full reload that happens
+    once the snapshot is `refresh_after` seconds old.
+    """
+
+    def __init__(self, fetch, refresh_after=300.0):
+        # fetch(query, params) -> rows, used for the load and to re-read written rows
+        self._fetch = fetch
+        self.refresh_after = refresh_after
+        self._lock = threading.RLock()
+
+        self.tables = {name: ColumnTable(name) for name in COLUMN_KINDS}
+        self.version = 0
+        self.loaded_at = None
+
+        # Query results of the current version: (query id, params, window) -> {statement id: DataFrame}
+        self._results = {}
+
+    def _select(self, table):
+        _, columns = TABLE_COLUMNS[table]
+        return f"select {', '.join(columns)} from {table}"
+
+    def load(self):
+        with self._lock, trace("snapshot", "load"):
+            for name, table in self.tables.items():
+                table.load(self._fetch(self._select(name), None))
+            self.version += 1
+            self.loaded_at = time.monotonic()
+            self._results.clear()
+        return self
+
+    def on_write(self, table, key):
+        # Re-reads the written row by primary key after a committed CRUD write
+        if table not in self.tables:
+            return
+        column_table = self.tables[table]
+        rows = self._fetch(f"{self._select(table)} where {column_table.key} = %s", (key,))
+
+        with self._lock:
+            if rows:
+                column_table.set_row(rows[0])
+            else:
+                column_table.remove(key)
+            self.version += 1
+            self._results.clear()
+
+    # Queries
+
+    def claims_mask(self, window=None):
+        # Live claims inside the window's since/until dates; None when the window needs the
+        # archived claims, which are not held in memory
+        window = window or {}
+        if window.get("history") == "all":
+            return None
+
+        claims = self.tables["claims"]
+        mask = claims.mask().copy()
+        timestamps = claims.column("Timestamp")
+        if window.get("since"):
+            mask &= timestamps >= np.datetime64(date.fromisoformat(str(window["since"])))
+        if window.get("until"):
+            mask &= timestamps < np.datetime64(date.fromisoformat(str(window["until"])))
+        return mask
+
+    def run_query(self, spec, values=None, window=None):
+        # Same result as query_engine.run_query, or None when the snapshot cannot answer it
+        if any(statement["id"] not in AGGREGATES for statement in spec["statements"]):
+            return None
+
+        with self._lock:
+            if self.loaded_at is None or time.monotonic() - self.loaded_at > self.refresh_after:
+                self.load()
+
+            values = dict(spec.get("params", {}), **(values or {}))
+            key = (spec["id"], tuple(sorted(values.items())), window_key(window))
+            results = self._results.get(key)
+            if results is not None:
+                return results
+
+            claims = self.claims_mask(window)
+            if claims is None:
+                return None
+
+            with trace("snapshot", spec["id"]):
+                results = {}
+                for statement in spec["statements"]:
+                    frame = AGGREGATES[statement["id"]](self.tables, values, claims)
+                    frame.columns = statement["columns"]
+                    results[statement["id"]] = frame
+
+            self._results[key] = results
+            return results
+
+    def stats(self):
+        with self._lock:
+            stats = {"version": self.version,
+                     "age_s": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at else None}
+            for name, table in self.tables.items():
+                stats[f"{name}_rows"] = len(table.row_of)
+            stats["bytes"] = sum(array.nbytes for table in self.tables.values() for array in table.data.values())
+            return stats
+
+
+# Aggregates, one per registry statement: (tables, parameter values, claims mask) -> DataFrame
+# with the statement's columns in order. Joins map foreign keys to parent rows with rows_of,
+# and group-bys count or sum per category code or per parent row
+
+def _city_counts(table):
+    cities, counts = _count_by_category(table, "City", table.mask())
+    return _ranked({"City": cities, "Count": counts}, "Count")
+
+
+def _query3(tables, values, claims):
+    providers = tables["providers"]
+    # City matches case-insensitively, like MySQL's default collation
+    city = str(values["City"]).strip().lower()
+    codes = [code for code, name in enumerate(providers.categories["City"]) if str(name).lower() == city]
+    rows = np.flatnonzero(providers.mask() & np.isin(providers.column("City"), codes))
+    return pd.DataFrame({"Name": providers.column("Name")[rows], "Contact": providers.column("Contact")[rows]})
+
+
+def _per_parent(parent, rows, weights=None):
+    # (parent rows that have any child row, child count, weight sum) for child rows mapped to parents
+    valid = rows >= 0
+    counts = np.bincount(rows[valid], minlength=parent.size)
+    present = np.flatnonzero(counts)
+    sums = np.bincount(rows[valid], weights=None if weights is None else weights[valid], minlength=parent.size)
+    return present, counts[present], sums[present]
+
+
+def _claims_to_listings(tables, claims):
+    listings = tables["food_listings"]
+    rows = listings.rows_of(tables["claims"].column("Food_ID")[claims])
+    return listings, rows
+
+
+def _query4(tables, values, claims):
+    claim_table, receivers = tables["claims"], tables["receivers"]
+    completed = claims & (claim_table.column("Status") == claim_table.code("Status", "Completed"))
+    present, counts, _ = _per_parent(receivers, receivers.rows_of(claim_table.column("Receiver_ID")[completed]))
+    return _ranked({"Receiver_ID": receivers.column("Receiver_ID")[present],
+                    "Name": receivers.column("Name")[present], "Count": counts}, "Count")
+
+
+def _provider_quantity(tables, values, claims):
+    listings, providers = tables["food_listings"], tables["providers"]
+    live = listings.mask()
+    rows = providers.rows_of(listings.column("Provider_ID")[live])
+    present, _, sums = _per_parent(providers, rows, listings.column("Quantity")[live])
+    return _ranked({"Provider_ID": providers.column("Provider_ID")[present],
+                    "Name": providers.column("Name")[present], "Total": sums.astype(np.int64)}, "Total")
+
+
+def _query5_2(tables, values, claims):
+    # Unexpired listings only, like QUERY5_2
+    listings = tables["food_listings"]
+    live = listings.mask() & (listings.column("Expiry_Date") >= np.datetime64(date.today()))
+    # sum() over no rows is NULL in SQL, not 0
+    total = int(listings.column("Quantity")[live].sum()) if live.any() else None
+    return pd.DataFrame({"Total": [total]})
+
+
+def _listing_counts(column, limit=None):
+    def aggregate(tables, values, claims):
+        listings = tables["food_listings"]
+        names, counts = _count_by_category(listings, column, listings.mask())
+        return _ranked({column: names, "Count": counts}, "Count", limit)
+    return aggregate
+
+
+def _query2(tables, values, claims):
+    listings = tables["food_listings"]
+    names, sums = _sum_by_category(listings, "Provider_Type", listings.column("Quantity"), listings.mask())
+    return _ranked({"Provider_Type": names, "Total": sums}, "Total")
+
+
+def _query8(tables, values, claims):
+    listings, rows = _claims_to_listings(tables, claims)
+    present, counts, _ = _per_parent(listings, rows)
+    return _ranked({"Food_ID": listings.column("Food_ID")[present],
+                    "Food_Name": listings.decode("Food_Name", listings.column("Food_Name")[present]),
+                    "Count": counts}, "Count")
+
+
+def _query9(tables, values, claims):
+    claim_table, providers = tables["claims"], tables["providers"]
+    completed = claims & (claim_table.column("Status") == claim_table.code("Status", "Completed"))
+    listings, rows = _claims_to_listings(tables, completed)
+    provider_rows = providers.rows_of(listings.column("Provider_ID")[rows[rows >= 0]])
+    present, counts, _ = _per_parent(providers, provider_rows)
+    return _ranked({"Provider_ID": providers.column("Provider_ID")[present],
+                    "Name": providers.column("Name")[present], "Count": counts}, "Count", 1)
+
+
+def _query10(tables, values, claims):
+    statuses, counts = _count_by_category(tables["claims"], "Status", claims)
+    return _ranked({"Status": statuses, "Percentage": counts * 100.0 / max(counts.sum(), 1)}, "Percentage")
+
+
+def _query11(tables, values, claims):
+    claim_table, receivers = tables["claims"], tables["receivers"]
+    listings, rows = _claims_to_listings(tables, claims)
+    joined = rows >= 0
+    receiver_rows = receivers.rows_of(claim_table.column("Receiver_ID")[claims][joined])
+    present, counts, sums = _per_parent(receivers, receiver_rows, listings.column("Quantity")[rows[joined]])
+    return _ranked({"Receiver_ID": receivers.column("Receiver_ID")[present],
+                    "Name": receivers.column("Name")[present], "Average": sums / counts}, "Average")
+
+
+def _claims_by_listing_category(column, status=None, limit=None):
+    def aggregate(tables, values, claims):
+        claim_table = tables["claims"]
+        if status is not None:
+            claims = claims & (claim_table.column("Status") == claim_table.code("Status", status))
+        listings, rows = _claims_to_listings(tables, claims)
+        codes = listings.column(column)[rows[rows >= 0]]
+        counts = np.bincount(codes[codes >= 0], minlength=len(listings.categories[column]))
+        present = np.flatnonzero(counts)
+        return _ranked({column: listings.decode(column, present), "Count": counts[present]}, "Count", limit)
+    return aggregate
+
+
+def _query15(tables, values, claims):
+    listings, providers = tables["food_listings"], tables["providers"]
+    live = listings.mask()
+    rows = providers.rows_of(listings.column("Provider_ID")[live])
+    names = listings.column("Food_Name")[live]
+    joined = (rows >= 0) & (names >= 0)
+
+    # Distinct (provider row, food name code) pairs, then pairs per provider. The pairs are
+    # sorted rather than counted into a provider x name grid, whose size grows with both tables
+    width = len(listings.categories["Food_Name"])
+    pairs = np.unique(rows[joined].astype(np.int64) * width + names[joined])
+    present, counts, _ = _per_parent(providers, pairs // width)
+    return _ranked({"Provider_ID": providers.column("Provider_ID")[present],
+                    "Name": providers.column("Name")[present], "Count": counts}, "Count")
+
+
+AGGREGATES = {
+    "query1_1": lambda tables, values, claims: _city_counts(tables["providers"]),
+    "query1_2": lambda tables, values, claims: _city_counts(tables["receivers"]),
+    "query2": _query2,
+    "query3": _query3,
+    "query4": _query4,
+    "query5_1": _provider_quantity,
+    "query5_2": _query5_2,
+    "query6": _listing_counts("Location", limit=1),
+    "query7": _listing_counts("Food_Type"),
+    "query8": _query8,
+    "query9": _query9,
+    "query10": _query10,
+    "query11": _query11,
+    "query12": _claims_by_listing_category("Meal_Type", limit=1),
+    "query13": _provider_quantity,
+    "query14": _claims_by_listing_category("Food_Name", status="Cancelled"),
+    "query15": _query15,
+}
@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+from benchmark import _timings, git_commit
+from views import PAGES
+
+# Cold start timings of the Streamlit app, tagged with the git commit like benchmark.py.
+# Every sample runs in a fresh interpreter: the import of each page module on its own, and
+# the first render of each page through Streamlit's AppTest (streamlit.testing), which runs
+# Index.py as `streamlit run` would. Pages that read data need the database, or an embedded
+# file via FOOD_BACKEND/FOOD_DB_PATH (see backends.py)
+
+# Modules that dominate a cold start; each sample records which of them got imported
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "mysql.connector", "duckdb", "pyarrow"]
+
+IMPORT_SAMPLE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                   "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+RENDER_SAMPLE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("Index.py", default_timeout={timeout})
+app.session_state["page"] = {page!r}
+ready = time.perf_counter()
+app.run()
+print(json.dumps({{"seconds": time.perf_counter() - ready, "streamlit_seconds": ready - start,
+                   "errors": [str(error.value) for error in app.exception],
+                   "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def _sample(code):
+    # Runs one sample in a new interpreter and returns the JSON it prints last
+    done = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+    if done.returncode != 0:
+        raise RuntimeError(done.stderr.strip().splitlines()[-1] if done.stderr.strip() else "sample failed")
+    return json.loads(done.stdout.strip().splitlines()[-1])
+
+
+def _summary(samples):
+    return dict(_timings([sample["seconds"] for sample in samples]), loaded=samples[-1]["loaded"])
+
+
+def bench_imports(runs):
+    # Streamlit itself is the floor every page pays; views.<page> adds what the page imports
+    modules = ["streamlit", "backends", "views"] + [f"views.{module}" for module in PAGES.values()]
+    return {module: _summary([_sample(IMPORT_SAMPLE.format(module=module, heavy=HEAVY_MODULES))
+                              for _ in range(runs)])
+            for module in modules}
+
+
+def bench_first_render(pages, runs, timeout):
+    results = {}
+    for page in pages:
+        samples = [_sample(RENDER_SAMPLE.format(page=page, timeout=timeout, heavy=HEAVY_MODULES))
+                   for _ in range(runs)]
+        results[page] = dict(_summary(samples), errors=samples[-1]["errors"])
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time cold imports and first renders of the app's pages")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per measurement")
+    parser.add_argument("--pages", nargs="*", choices=list(PAGES), help="pages to render (default: all)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed for one render")
+    parser.add_argument("--results", default="bench_results", help="directory for the JSON results")
+    args = parser.parse_args()
+
+    results = {
+        "commit": git_commit(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "backend": os.environ.get("FOOD_BACKEND", "mysql"),
+        "imports": bench_imports(args.runs),
+        "first_render": bench_first_render(args.pages or list(PAGES), args.runs, args.timeout),
+    }
+
+    os.makedirs(args.results, exist_ok=True)
+    path = os.path.join(args.results, f"startup-{results['commit']}-{datetime.now():%Y%m%d%H%M%S}.json")
+    with open(path, "w") as handle:
+        json.dump(results, handle, indent=2)
+
+    for module, timing in results["imports"].items():
+        print(f"import {module:<24} median {timing['median_ms']:>9} ms  loads {', '.join(timing['loaded']) or '-'}")
+    for page, timing in results["first_render"].items():
+        errors = f"  errors: {'; '.join(timing['errors'])}" if timing["errors"] else ""
+        print(f"render {page:<24} median {timing['median_ms']:>9} ms  loads {', '.join(timing['loaded']) or '-'}"
+              f"{errors}")
+    print(f"Results written to {path}")
@@ -0,0 +1,244 @@
+import argparse
+from collections import defaultdict
+
+# Group columns are part of each summary's primary key, so a NULL group value is stored as
+# this sentinel instead (0 for Provider_ID), in the rebuild queries and the deltas alike
+NULL_GROUP = ""
+NULL_GROUP_BY_COLUMN = {"Provider_ID": 0}
+
+# Summary table: (group columns, measure columns, full recomputation from the base tables)
+SUMMARY_TABLES = {
+    "summary_provider_totals": (
+        ["Provider_ID"], ["Total_Quantity", "Listing_Count"],
+        "select coalesce(Provider_ID, 0), sum(Quantity), count(*) from food_listings "
+        "group by coalesce(Provider_ID, 0)",
+    ),
+    "summary_provider_type_totals": (
+        ["Provider_Type"], ["Total_Quantity", "Listing_Count"],
+        "select coalesce(Provider_Type, ''), sum(Quantity), count(*) from food_listings "
+        "group by coalesce(Provider_Type, '')",
+    ),
+    "summary_location_totals": (
+        ["Location"], ["Listing_Count"],
+        "select coalesce(Location, ''), count(*) from food_listings group by coalesce(Location, '')",
+    ),
+    "summary_food_type_totals": (
+        ["Food_Type"], ["Listing_Count"],
+        "select coalesce(Food_Type, ''), count(*) from food_listings group by coalesce(Food_Type, '')",
+    ),
+    "summary_claim_status": (
+        ["Status"], ["Claim_Count"],
+        "select coalesce(Status, ''), count(*) from claims group by coalesce(Status, '')",
+    ),
+    "summary_meal_type_claims": (
+        ["Meal_Type"], ["Claim_Count"],
+        "select coalesce(f.Meal_Type, ''), count(c.Claim_ID) from claims as c "
+        "join food_listings as f on c.Food_ID = f.Food_ID group by coalesce(f.Meal_Type, '')",
+    ),
+}
+
+SUMMARY_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS summary_provider_totals (
+        Provider_ID INT PRIMARY KEY,
+        Total_Quantity BIGINT NOT NULL DEFAULT 0,
+        Listing_Count INT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_provider_type_totals (
+        Provider_Type VARCHAR(100) PRIMARY KEY,
+        Total_Quantity BIGINT NOT NULL DEFAULT 0,
+        Listing_Count INT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_location_totals (
+        Location VARCHAR(100) PRIMARY KEY,
+        Listing_Count INT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_food_type_totals (
+        Food_Type VARCHAR(100) PRIMARY KEY,
+        Listing_Count INT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_claim_status (
+        Status VARCHAR(100) PRIMARY KEY,
+        Claim_Count INT NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS summary_meal_type_claims (
+        Meal_Type VARCHAR(100) PRIMARY KEY,
+        Claim_Count INT NOT NULL DEFAULT 0
+    )
+    """,
+]
+
+
+def _group(row, column):
+    value = row[column]
+    return NULL_GROUP_BY_COLUMN.get(column, NULL_GROUP) if value is None else value
+
+
+def _in_clause(values):
+    return ", ".join(["%s"] * len(values))
+
+
+def _claim_counts(cursor, food_ids):
+    if not food_ids:
+        return {}
+    cursor.execute(
+        f"select Food_ID, count(*) from claims where Food_ID in ({_in_clause(food_ids)}) group by Food_ID",
+        tuple(food_ids),
+    )
+    return dict(cursor.fetchall())
+
+
+def _meal_types(cursor, food_ids):
+    if not food_ids:
+        return {}
+    cursor.execute(
+        f"select Food_ID, Meal_Type from food_listings where Food_ID in ({_in_clause(food_ids)})",
+        tuple(food_ids),
+    )
+    return dict(cursor.fetchall())
+
+
+def compute_deltas(cursor, table, old_rows, new_rows):
+    # Rows are dicts of the base table columns. Old rows are subtracted and new rows added,
+    # so an update is simply (old row, new row). Returns {summary: {group: [measure deltas]}}.
+    deltas = defaultdict(lambda: defaultdict(lambda: None))
+
+    def add(summary, group, values):
+        current = deltas[summary][group]
+        deltas[summary][group] = values if current is None else [a + b for a, b in zip(current, values)]
+
+    signed_rows = [(row, -1) for row in old_rows] + [(row, 1) for row in new_rows]
+
+    if table == "food_listings":
+        # A listing also carries the claims made on it into the meal type summary
+        claims = _claim_counts(cursor, {row["Food_ID"] for row, _ in signed_rows})
+
+        for row, sign in signed_rows:
+            quantity = row["Quantity"] or 0
+            add("summary_provider_totals", (_group(row, "Provider_ID"),), [sign * quantity, sign])
+            add("summary_provider_type_totals", (_group(row, "Provider_Type"),), [sign * quantity, sign])
+            add("summary_location_totals", (_group(row, "Location"),), [sign])
+            add("summary_food_type_totals", (_group(row, "Food_Type"),), [sign])
+            if claims.get(row["Food_ID"]):
+                add("summary_meal_type_claims", (_group(row, "Meal_Type"),), [sign * claims[row["Food_ID"]]])
+
+    elif table == "claims":
+        meals = _meal_types(cursor, {row["Food_ID"] for row, _ in signed_rows})
+
+        for row, sign in signed_rows:
+            add("summary_claim_status", (_group(row, "Status"),), [sign])
+            if row["Food_ID"] in meals:
+                meal_type = meals[row["Food_ID"]]
+                add("summary_meal_type_claims", (NULL_GROUP if meal_type is None else meal_type,), [sign])
+
+    # Drop groups whose changes cancel out, e.g. an update that did not move the row
+    return {
+        summary: {group: values for group, values in groups.items() if any(values)}
+        for summary, groups in deltas.items()
+    }
+
+
+def apply_deltas(cursor, table, old_rows, new_rows):
+    # Runs inside the caller's transaction so summaries commit or roll back with the write
+    for summary, groups in compute_deltas(cursor, table, old_rows, new_rows).items():
+        if not groups:
+            continue
+
+        group_columns, measures, _ = SUMMARY_TABLES[summary]
+        columns = group_columns + measures
+        increments = ", ".join(f"{m} = {m} + VALUES({m})" for m in measures)
+
+        cursor.executemany(
+            f"insert into {summary} ({', '.join(columns)}) values ({_in_clause(columns)}) "
+            f"on duplicate key update {increments}",
+            [tuple(group) + tuple(values) for group, values in groups.items()],
+        )
+
+        # Groups with no rows left disappear, exactly like they would from a GROUP BY. Only the
+        # groups that just lost rows are looked at, each by its primary key
+        shrunk = [tuple(group) for group, values in groups.items() if values[-1] < 0]
+        if shrunk:
+            matches = " and ".join(f"{column} = %s" for column in group_columns)
+            cursor.executemany(f"delete from {summary} where {matches} and {measures[-1]} <= 0", shrunk)
+
+
+def rebuild_summaries(cursor, summaries=None):
+    # Full recomputation from the base tables on the caller's transaction
+    for summary in summaries or SUMMARY_TABLES:
+        group_columns, measures, query = SUMMARY_TABLES[summary]
+        cursor.execute(f"delete from {summary}")
+        cursor.execute(f"insert into {summary} ({', '.join(group_columns + measures)}) {query}")
+
+
+def rebuild(conn, summaries=None):
+    # Used after bulk loads and to recover from drift
+    cursor = conn.cursor()
+    try:
+        rebuild_summaries(cursor, summaries)
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+
+
+def check_consistency(conn):
+    # Compares every summary with a full recomputation; returns {summary: [(group, stored, expected)]}
+    cursor = conn.cursor()
+    mismatches = {}
+
+    for summary, (group_columns, measures, query) in SUMMARY_TABLES.items():
+        width = len(group_columns)
+
+        cursor.execute(f"select {', '.join(group_columns + measures)} from {summary}")
+        stored = {row[:width]: tuple(int(v) for v in row[width:]) for row in cursor.fetchall()}
+
+        cursor.execute(query)
+        expected = {row[:width]: tuple(int(v or 0) for v in row[width:]) for row in cursor.fetchall()}
+
+        diff = [
+            (group, stored.get(group), expected.get(group))
+            for group in set(stored) | set(expected)
+            if stored.get(group) != expected.get(group)
+        ]
+        if diff:
+            mismatches[summary] = diff
+
+    conn.rollback()
+    cursor.close()
+    return mismatches
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the dashboard summary tables")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    args = parser.parse_args()
+
+    from db_pool import mysql_connect
+
+    connection = mysql_connect()
+
+    if args.command == "rebuild":
+        rebuild(connection)
+        print("Rebuilt all summary tables")
+
+    else:
+        problems = check_consistency(connection)
+        for name, rows in problems.items():
+            print(f"{name}: {len(rows)} mismatched groups, e.g. {rows[:3]}")
+        print("Summaries are consistent" if not problems else "Run `python summaries.py rebuild` to repair")
+
+    connection.close()
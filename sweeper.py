@@ -0,0 +1,173 @@
+import argparse
+import time
+from datetime import date, datetime
+
+from changelog import record_changes
+from crud import TABLE_COLUMNS, release_reservations
+from summaries import apply_deltas
+
+AUDIT_DDL = """
+CREATE TABLE IF NOT EXISTS claim_audit (
+    Audit_ID BIGINT AUTO_INCREMENT PRIMARY KEY,
+    Claim_ID INT NOT NULL,
+    Food_ID INT,
+    Old_Status VARCHAR(100),
+    New_Status VARCHAR(100),
+    Reason VARCHAR(255),
+    Changed_At DATETIME,
+
+    INDEX idx_claim_audit_claim (Claim_ID),
+    INDEX idx_claim_audit_changed (Changed_At)
+)
+"""
+
+# Expired listings in (Expiry_Date, Food_ID) order, read straight off idx_food_expiry
+# a page at a time; a plain consistent read, so nothing is locked while scanning. The first
+# page starts on the `since` date itself, later ones after the last listing of the page before
+FIRST_EXPIRED_QUERY = """
+select Expiry_Date, Food_ID from food_listings
+where Expiry_Date < %s and Expiry_Date >= %s
+order by Expiry_Date, Food_ID
+limit %s
+"""
+
+EXPIRED_LISTINGS_QUERY = """
+select Expiry_Date, Food_ID from food_listings
+where Expiry_Date < %s and (Expiry_Date > %s or (Expiry_Date = %s and Food_ID > %s))
+order by Expiry_Date, Food_ID
+limit %s
+"""
+
+# Rows another transaction holds are skipped rather than waited on; the next run picks them up
+PENDING_CLAIMS_QUERY = """
+select {columns} from claims
+where Status = 'Pending' and Food_ID in ({placeholders})
+order by Claim_ID
+limit %s
+for update skip locked
+"""
+
+
+def sweep_batch(conn, food_ids, reason, max_claims=500):
+    # One short transaction: cancel the pending claims on these listings, give the food they
+    # reserved back to the listings, audit them and move the claim status summary. Returns the
+    # number of claims cancelled.
+    _, columns = TABLE_COLUMNS["claims"]
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(
+            PENDING_CLAIMS_QUERY.format(columns=", ".join(columns), placeholders=", ".join(["%s"] * len(food_ids))),
+            tuple(food_ids) + (max_claims,),
+        )
+        old_rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        if not old_rows:
+            conn.rollback()
+            return 0
+
+        claim_ids = [row["Claim_ID"] for row in old_rows]
+        release_reservations(cursor, dict.fromkeys(claim_ids, "Cancelled"))
+        cursor.execute(
+            f"update claims set Status = 'Cancelled' where Claim_ID in ({', '.join(['%s'] * len(claim_ids))})",
+            tuple(claim_ids),
+        )
+
+        now = datetime.now()
+        cursor.executemany(
+            "insert into claim_audit (Claim_ID, Food_ID, Old_Status, New_Status, Reason, Changed_At) "
+            "values (%s, %s, %s, %s, %s, %s)",
+            [(row["Claim_ID"], row["Food_ID"], row["Status"], "Cancelled", reason, now) for row in old_rows],
+        )
+
+        apply_deltas(cursor, "claims", old_rows, [dict(row, Status="Cancelled") for row in old_rows])
+        record_changes(cursor, "claims", "update", claim_ids)
+        conn.commit()
+        return len(old_rows)
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+
+
+def sweep(conn, cutoff=None, since=None, batch_size=200, pause=0.0, log=print):
+    # Cancels pending claims on every listing that expired before `cutoff` (default today),
+    # optionally only listings that expired on or after `since`. Returns the per-batch reports.
+    cutoff = cutoff or date.today()
+    reason = f"Listing expired before {cutoff.isoformat()}"
+    after = None
+    reports = []
+
+    while True:
+        start = time.perf_counter()
+
+        cursor = conn.cursor()
+        if after is None:
+            cursor.execute(FIRST_EXPIRED_QUERY, (cutoff, since or date.min, batch_size))
+        else:
+            cursor.execute(EXPIRED_LISTINGS_QUERY, (cutoff, after[0], after[0], after[1], batch_size))
+        listings = cursor.fetchall()
+        cursor.close()
+        conn.rollback()
+
+        if not listings:
+            break
+
+        after = tuple(listings[-1])
+
+        # A batch with more pending claims than fit in one transaction is repeated until drained
+        cancelled = 0
+        while True:
+            count = sweep_batch(conn, [food_id for _, food_id in listings], reason, max_claims=batch_size)
+            cancelled += count
+            if count < batch_size:
+                break
+
+        report = {
+            "batch": len(reports) + 1,
+            "listings": len(listings),
+            "cancelled": cancelled,
+            "through": after[0],
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        reports.append(report)
+        log(f"batch {report['batch']}: {report['listings']} expired listings, {report['cancelled']} claims "
+            f"cancelled (through {report['through']}) in {report['seconds']}s")
+
+        if len(listings) < batch_size:
+            break
+        # Leaves room for other writers between batches
+        time.sleep(pause)
+
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cancel pending claims on expired food listings")
+    parser.add_argument("--cutoff", type=date.fromisoformat, help="listings expiring before this date (default today)")
+    parser.add_argument("--since", type=date.fromisoformat, help="skip listings that expired before this date")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--pause", type=float, default=0.05, help="seconds to sleep between batches")
+    parser.add_argument("--every", type=float, help="keep running, sweeping every this many seconds")
+    args = parser.parse_args()
+
+    from db_pool import mysql_connect
+
+    connection = mysql_connect()
+
+    try:
+        while True:
+            run_start = time.perf_counter()
+            batches = sweep(connection, args.cutoff, args.since, args.batch_size, args.pause)
+            print(f"Swept {sum(b['listings'] for b in batches)} expired listings, cancelled "
+                  f"{sum(b['cancelled'] for b in batches)} claims in {len(batches)} batches, "
+                  f"{time.perf_counter() - run_start:.2f}s")
+
+            if args.every is None:
+                break
+            time.sleep(args.every)
+
+    finally:
+        connection.close()
@@ -0,0 +1,268 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Column-at-a-time data quality checks for the CSV loads. Every check returns a boolean mask
+# over the chunk, so a chunk of 50,000 rows costs a handful of NumPy operations, and each
+# rejected row is reported with all the reasons it failed
+
+class KeySet:
+    """Integer keys seen so far, as a bitmap indexed by key (with a set for outsized keys)."""
+
+    MAX_BITMAP_KEY = 1 << 28
+
+    def __init__(self):
+        self._bitmap = np.zeros(1024, dtype=bool)
+        self._overflow = set()
+
+    def __len__(self):
+        return int(self._bitmap.sum()) + len(self._overflow)
+
+    def add(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        small = (keys >= 0) & (keys < self.MAX_BITMAP_KEY)
+
+        if small.any():
+            top = int(keys[small].max())
+            if top >= len(self._bitmap):
+                grown = np.zeros(max(top + 1, 2 * len(self._bitmap)), dtype=bool)
+                grown[:len(self._bitmap)] = self._bitmap
+                self._bitmap = grown
+            self._bitmap[keys[small]] = True
+
+        self._overflow.update(keys[~small].tolist())
+
+    def contains(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        found = np.zeros(len(keys), dtype=bool)
+
+        small = (keys >= 0) & (keys < len(self._bitmap))
+        found[small] = self._bitmap[keys[small]]
+        if self._overflow:
+            found[~small] = np.isin(keys[~small], list(self._overflow))
+        return found
+
+
+class ValidationState:
+    """Keys carried across chunks and tables: every key read (for uniqueness) and every key
+    accepted (for foreign keys). `existing_keys(table)` adds the keys already in the database
+    to the parent tables that foreign keys are checked against."""
+
+    def __init__(self, existing_keys=None):
+        self.seen = {}
+        self.accepted = {}
+        self._existing_keys = existing_keys
+        self._with_existing = set()
+
+    def seen_keys(self, table):
+        return self.seen.setdefault(table, KeySet())
+
+    def accepted_keys(self, table):
+        # Keys accepted in this run. The table being loaded starts empty: its rows already in
+        # the database are never read just to record the new keys
+        return self.accepted.setdefault(table, KeySet())
+
+    def parent_keys(self, table):
+        # Keys a foreign key may point at; the database's keys are read on the first lookup
+        keys = self.accepted_keys(table)
+        if self._existing_keys is not None and table not in self._with_existing:
+            self._with_existing.add(table)
+            keys.add(self._existing_keys(table))
+        return keys
+
+
+def database_keys(conn, key_columns, chunk_rows=100000):
+    # existing_keys callback reading a table's primary keys in chunks: table -> array of ints
+    def existing_keys(table):
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"select {key_columns[table]} from {table}")
+            parts = []
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                parts.append(np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows)))
+            return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        finally:
+            cursor.close()
+            conn.rollback()
+
+    return existing_keys
+
+
+def _packed(chars, mask):
+    # The masked characters of every row moved to the front in order, zero padded,
+    # and how many there are
+    order = np.argsort(~mask, axis=1, kind="stable")
+    moved = np.where(np.take_along_axis(mask, order, axis=1), np.take_along_axis(chars, order, axis=1), 0)
+    return moved, mask.sum(axis=1)
+
+
+def normalize_phones(values):
+    # '(955)922-5295', '955.922.5295', '001-955-922-5295x12' and '+1-955-922-5295' all become
+    # '+1-955-922-5295' (keeping any extension); NaN where the digits are not a 10-digit number.
+    # The strings are handled as a (rows x characters) matrix of code points, so there is no
+    # per-row Python or regex work
+    text = np.asarray(values.fillna("").astype(str).to_numpy(), dtype=str)
+    if len(text) == 0:
+        return pd.Series([], index=values.index, dtype=object)
+
+    width = max(text.dtype.itemsize // 4, 1)
+    chars = text.reshape(-1, 1).view(np.uint32).reshape(len(text), width)
+    columns = np.arange(width)
+
+    # Digits after an 'x' (as in x123 or ext. 123) are the extension
+    is_x = (chars == ord("x")) | (chars == ord("X"))
+    x_at = np.where(is_x.any(axis=1), is_x.argmax(axis=1), width)
+    digit = (chars >= ord("0")) & (chars <= ord("9"))
+
+    main, main_count = _packed(chars, digit & (columns < x_at[:, None]))
+    extension, extension_count = _packed(chars, digit & (columns > x_at[:, None]))
+    main = np.pad(main, ((0, 0), (0, max(0, 13 - width))))
+
+    # Offset of the 10-digit number once a US country code written as 1 or 001 is dropped
+    offset = np.full(len(text), -1)
+    offset[main_count == 10] = 0
+    offset[(main_count == 11) & (main[:, 0] == ord("1"))] = 1
+    offset[(main_count == 13) & (main[:, 0] == ord("0")) & (main[:, 1] == ord("0")) & (main[:, 2] == ord("1"))] = 3
+    national = np.take_along_axis(main, offset.clip(0)[:, None] + np.arange(10), axis=1)
+
+    out = np.zeros((len(text), 16 + extension.shape[1]), dtype=np.uint32)
+    out[:, [0, 1, 2, 6, 10]] = [ord("+"), ord("1"), ord("-"), ord("-"), ord("-")]
+    out[:, 3:6] = national[:, 0:3]
+    out[:, 7:10] = national[:, 3:6]
+    out[:, 11:15] = national[:, 6:10]
+    out[:, 15] = np.where(extension_count > 0, ord("x"), 0)
+    out[:, 16:] = extension
+
+    # Trailing zero code points are dropped when read back as strings
+    normalized = out.view(f"U{out.shape[1]}").ravel().astype(object)
+    return pd.Series(normalized, index=values.index).where(offset >= 0)
+
+
+def convert_dates(values, source_format, target_format):
+    # Returns (parsed mask, reformatted strings). Parsing is the expensive part and dates repeat
+    # heavily in a large file, so each distinct string is parsed and formatted only once
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), format=source_format, errors="coerce")
+
+    # Code -1 (a missing value) picks the appended invalid entry
+    valid = np.append(parsed.notna().to_numpy(), False)
+    formatted = np.append(parsed.dt.strftime(target_format).to_numpy(dtype=object), None)
+    return valid[codes], formatted[codes]
+
+
+def validate_chunk(chunk, spec, state):
+    # Returns (clean DataFrame in MySQL formats, rejected rows with Record and Reject_Reason).
+    # Record is the record number in the CSV file, 1 for the first record after the header. It
+    # is not a line number: a quoted field can span several lines
+    original = chunk[spec["columns"]]
+    chunk = original.copy()
+    failures = []
+
+    def fail(mask, reason):
+        failures.append((np.asarray(mask, dtype=bool), reason))
+
+    # Integer columns (keys, foreign keys, quantities): missing or not a whole number
+    integers = {}
+    key = spec["key"]
+    for column in dict.fromkeys([key] + spec.get("integers", [])):
+        numbers = pd.to_numeric(chunk[column], errors="coerce")
+        bad = numbers.isna() | (numbers != numbers.round())
+        fail(bad, f"{column} is not a whole number")
+        integers[column] = numbers.where(~bad)
+        chunk[column] = integers[column].astype("Int64")
+
+    # Primary key unique within the chunk and across earlier chunks of the file
+    keys = integers[key]
+    present = keys.notna().to_numpy()
+    key_values = keys.fillna(-1).astype(np.int64).to_numpy()
+
+    seen = state.seen_keys(spec["table"])
+    duplicate = keys.duplicated(keep="first").to_numpy() & present
+    duplicate |= seen.contains(key_values) & present
+    fail(duplicate, f"duplicate {key}")
+    seen.add(key_values[present])
+
+    for column, parent in spec.get("foreign_keys", {}).items():
+        values = integers[column]
+        known = state.parent_keys(parent).contains(values.fillna(-1).astype(np.int64).to_numpy())
+        fail(values.notna().to_numpy() & ~known, f"{column} not found in {parent}")
+
+    for column in spec.get("non_negative", []):
+        fail(integers[column].lt(0).fillna(False).to_numpy(), f"negative {column}")
+
+    for column, allowed in spec.get("allowed", {}).items():
+        fail(~chunk[column].isin(allowed).to_numpy(), f"{column} not one of {', '.join(allowed)}")
+
+    for column in spec.get("phones", []):
+        normalized = normalize_phones(chunk[column])
+        fail(normalized.isna().to_numpy(), f"unrecognized phone number in {column}")
+        chunk[column] = normalized.astype(object)
+
+    for column, (source_format, target_format) in spec.get("dates", {}).items():
+        valid, formatted = convert_dates(chunk[column], source_format, target_format)
+        fail(~valid, f"unparseable {column}")
+        chunk[column] = formatted
+
+    # One reason string per row, built column-wise
+    reasons = np.full(len(chunk), "", dtype=object)
+    for mask, reason in failures:
+        reasons[mask] = np.where(reasons[mask] == "", reason, reasons[mask] + "; " + reason)
+
+    bad = reasons != ""
+    rejected = original[bad].assign(Record=chunk.index[bad] + 1, Reject_Reason=reasons[bad])
+    accepted = chunk[~bad]
+    state.accepted_keys(spec["table"]).add(accepted[key].to_numpy(dtype=np.int64))
+    return accepted, rejected
+
+
+def validate_file(path, spec, state, chunksize=50000):
+    # Runs every check over a whole CSV without touching the database.
+    # Returns (report dict, rejected rows)
+    start = time.perf_counter()
+    checked = 0
+    rejected_parts = []
+
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        _, rejected = validate_chunk(chunk, spec, state)
+        checked += len(chunk)
+        rejected_parts.append(rejected)
+
+    rejected = pd.concat(rejected_parts) if rejected_parts else pd.DataFrame()
+    reasons = rejected["Reject_Reason"].str.split("; ").explode().value_counts() if len(rejected) else {}
+
+    return {
+        "table": spec["table"],
+        "rows": checked,
+        "rejected": len(rejected),
+        "reasons": dict(reasons),
+        "seconds": round(time.perf_counter() - start, 3),
+    }, rejected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the four CSV files before loading them")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--chunksize", type=int, default=50000)
+    parser.add_argument("--reject-dir", default="rejected", help="write <table>_invalid.csv reports here")
+    args = parser.parse_args()
+
+    from bulk_loader import TABLE_SPECS
+
+    validation_state = ValidationState()
+    for table_spec in TABLE_SPECS:
+        report, rejected_rows = validate_file(os.path.join(args.data_dir, table_spec["csv"]), table_spec,
+                                              validation_state, args.chunksize)
+        print(f"{report['table']}: {report['rows']} rows checked, {report['rejected']} rejected "
+              f"in {report['seconds']}s")
+        for reason, count in report["reasons"].items():
+            print(f"    {count:>8}  {reason}")
+
+        if len(rejected_rows):
+            os.makedirs(args.reject_dir, exist_ok=True)
+            rejected_rows.to_csv(os.path.join(args.reject_dir, f"{report['table']}_invalid.csv"), index=False)
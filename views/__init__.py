@@ -0,0 +1,26 @@
+import importlib
+
+# Page title -> module of this package with a render() function. A page's module, and the
+# pandas, NumPy or matplotlib it pulls in, is only imported the first time the page is opened
+PAGES = {
+    "About Project": "about_page",
+    "View Tables": "tables_page",
+    "CRUD Operations": "crud_page",
+    "P & R Filters": "filters_page",
+    "Search": "search_page",
+    "Food Matches": "matches_page",
+    "15 Queries": "queries_page",
+    "Performance": "performance_page",
+}
+
+# Pages that show no data and so never open a database connection
+STATIC_PAGES = {"About Project"}
+
+
+def render(page):
+    if page not in STATIC_PAGES:
+        from views.shared import start_change_feed
+
+        start_change_feed()
+
+    importlib.import_module(f"{__name__}.{PAGES[page]}").render()
@@ -0,0 +1,51 @@
+import streamlit as st
+
+# Static overview of the project. It imports nothing beyond Streamlit and never connects to
+# the database, so a cold start on this page is as fast as Streamlit itself
+
+
+def render():
+    st.title("Food Waste Management System")
+    st.caption("By Puneeth Sai")
+
+    # Gives a basic idea about the application
+    st.markdown("""
+    ### Overview
+    Food wastage is a significant issue, with many households and restaurants discarding
+    surplus food while numerous people struggle with food insecurity. This project aims to
+    develop a Local Food Wastage Management System, where
+
+    - Restaurants and individuals can list surplus food 
+    - NGOs or individuals in need can claim the food. 
+    - SQL stores available food details and locations.
+    - A Streamlit app enables interaction, filtering, CRUD operation and visualization.
+ 
+
+    ---
+
+    ### How It Works
+    1. **Providers** (restaurants/individuals) post surplus food with quantity, location, and expiry date.  
+    2. **Receivers** (NGOs/individuals) discover and **claim** listings that match their needs.  
+    3. All records are stored in **SQL** (food listings, providers, receivers, claims).  
+    4. The **Streamlit interface** allows:
+       - Filtering of data
+       - CRUD operations for admins
+       - Real-time visualizations that update as data changes  
+
+    ---
+
+    ### Pages in this Application
+    - **About Page** — Quick guide to understand the system and how to use it.  
+    - **View Tables Page** — Browse all database tables (providers, receivers, listings, claims).  
+    - **CRUD Operations Page** — Admins can **add**, **update**, or **delete** records.  
+    - **P & R Filters Page** — Find **Providers** or **Receivers** by **ID** or **City**, and view contact details.  
+    - **Search Page** — Find providers, receivers and food listings by name, address, city or food name, even when misspelt.  
+    - **Food Matches Page** — Unclaimed listings ranked for a receiver by city, expiry, quantity and meal type.  
+    - **15 Queries Page** — A library of common queries with results and visualizations that refresh automatically.  
+    - **Performance Page** — Query and render timings, slow queries and connection pool and cache statistics.  
+
+    ---
+    
+    **Note**: Navigate between the pages using sidebar.
+
+    """)
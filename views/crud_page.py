@@ -0,0 +1,472 @@
+import pandas as pd
+import streamlit as st
+
+from backends import BACKEND
+from batch_crud import batch_template
+from crud import insert_row, update_field, delete_row
+from pagination import VIEW_TABLES
+from reservation import ReservationError
+from views.shared import TABLES, execute_batch, execute_reservation, execute_write, parse_date, parse_ts
+
+OPERATIONS = [
+    "Insert Records",
+    "Update Records",
+    "Delete Records",
+]
+
+
+def render():
+    # Writes go to MySQL only, an embedded snapshot is read-only
+    if BACKEND.read_only:
+        st.title("CRUD Operations")
+        st.warning(f"The app is reading the {BACKEND.label}. Run it against MySQL (unset FOOD_BACKEND) "
+                   "to insert, update or delete records.")
+        return
+
+    st.title("CRUD Operations")
+
+    # Dropdown to select which table to work with
+    selectedTable = st.selectbox("Select Table", TABLES)
+
+    # Many inserts, updates and deletes at once from a CSV or the grid, applied all-or-nothing
+    if st.radio("Mode", ["Single Record", "Batch"], horizontal=True) == "Batch":
+        batchTable = VIEW_TABLES[selectedTable]["table"]
+        st.caption("Operation is insert, update or delete. Updates only change the non-empty cells, deletes "
+                   "only need the ID. Dates are YYYY-MM-DD and timestamps YYYY-MM-DD HH:MM:SS.")
+        st.download_button("Download Template", batch_template(batchTable).to_csv(index=False),
+                           file_name=f"{batchTable}_batch.csv")
+
+        upload = st.file_uploader("Upload Batch CSV", type="csv")
+        if upload is not None:
+            batch = pd.read_csv(upload, dtype=str, keep_default_na=False)
+        else:
+            batch = batch_template(batchTable)
+        batch = st.data_editor(batch, num_rows="dynamic", key=f"batch_{batchTable}")
+
+        if st.button("Apply Batch", disabled=batch.empty):
+            try:
+                outcomes, committed = execute_batch(batchTable, batch)
+            except Exception as e:
+                st.error(f"Batch failed: {e}")
+            else:
+                if committed:
+                    st.success(f"Applied all {len(outcomes)} rows.")
+                else:
+                    st.error("Nothing was applied, fix the rows below and try again.")
+                st.dataframe(outcomes)
+        st.stop()
+
+    if selectedTable == "Providers":
+
+        selectedOperation = st.selectbox("Select Operation", OPERATIONS)
+
+        # Insert to providers
+        if selectedOperation == "Insert Records":
+
+            # Input all fields
+            with st.form("insert_provider"):
+                pid_str = st.text_input("Provider ID")
+                pname = st.text_input("Name")
+                ptype = st.text_input("Type")
+                paddress = st.text_input("Address")
+                pcity = st.text_input("City")
+                pcontact = st.text_input("Contact")
+
+                submit = st.form_submit_button("Insert Records")
+
+            if submit:
+
+                # Validate the PID
+                if not pid_str.strip().isdigit():
+                    st.error("Provider ID must be a whole number.")
+
+                elif not all([pname.strip(), ptype.strip(), paddress.strip(), pcity.strip(), pcontact.strip()]):
+                    st.error("All fields are required.")
+
+                else:
+                    pid = int(pid_str.strip())
+
+                    # Handle the insert query using exceptions
+
+                    try:
+                        execute_write(insert_row, "providers", (pid, pname, ptype, paddress, pcity, pcontact))
+                        st.success("Successfully inserted the record")
+
+                    except Exception as e:
+                        st.error(f"Insert failed: {e}")
+
+        # Update to providers
+        elif selectedOperation == "Update Records":
+
+            with st.form("update_provider"):
+
+                # Dropdown to update which field
+                selectedField = st.selectbox("Update Field", ["Name", "Type", "Address", "City", "Contact"])
+                pid_str = st.text_input("Provider ID")
+                pdata = st.text_input(f"Enter {selectedField}")
+                submit = st.form_submit_button("Update Records")
+
+                if submit:
+
+                    if not pid_str.strip().isdigit():
+                        st.error("Provider ID must be a whole number.")
+                        st.stop()
+
+                    if pdata.strip() == "":
+                        st.error(f"{selectedField} cannot be empty.")
+                        st.stop()
+
+                    pid = int(pid_str.strip())
+
+                    try:
+                        rowcount = execute_write(update_field, "providers", pid, selectedField, pdata)
+
+                        if rowcount == 0:
+                            st.warning(f"No record found for Provider_ID = {pid}.")
+
+                        else:
+                            st.success("Successfully updated the record.")
+
+                    except Exception as e:
+                        st.error(f"Update failed: {e}")
+
+
+        # Delete from providers
+        elif selectedOperation == "Delete Records":
+            with st.form("delete_provider"):
+                pid_str = st.text_input("Provider ID")
+                submit = st.form_submit_button("Delete Records")
+
+                if submit:
+                    if not pid_str.strip().isdigit():
+                        st.error("Provider ID must be a whole number.")
+
+                    pid = int(pid_str.strip())
+
+                    try:
+                        execute_write(delete_row, "providers", pid)
+                        st.success("Successfully deleted the record.")
+
+                    except Exception as e:
+                        st.error(f"Delete failed: {e}")
+
+    elif selectedTable == "Receivers":
+
+        selectedOperation = st.selectbox("Select Operation", OPERATIONS)
+
+        # Insert to receivers
+        if selectedOperation == "Insert Records":
+            with st.form("insert_receiver"):
+                rid_str = st.text_input("Receiver ID")
+                rname = st.text_input("Name")
+                rtype = st.text_input("Type")
+                rcity = st.text_input("City")
+                rcontact = st.text_input("Contact")
+                submit = st.form_submit_button("Insert Records")
+
+            if submit:
+                if not rid_str.strip().isdigit():
+                    st.error("Receiver ID must be a whole number.")
+
+                elif not all([rname.strip(), rtype.strip(), rcity.strip(), rcontact.strip()]):
+                    st.error("All fields are required.")
+                else:
+                    rid = int(rid_str.strip())
+                    try:
+                        execute_write(insert_row, "receivers", (rid, rname, rtype, rcity, rcontact))
+                        st.success("Successfully inserted the record.")
+                    except Exception as e:
+                        st.error(f"Insert failed: {e}")
+
+        # Update to receivers
+        elif selectedOperation == "Update Records":
+
+            with st.form("update_receiver"):
+
+                # Dropdown to update which field
+                selectedField = st.selectbox("Update Field", ["Name", "Type", "City", "Contact"])
+                rid_str = st.text_input("Receiver ID")
+                rdata = st.text_input(f"Enter {selectedField}")
+                submit = st.form_submit_button("Update Records")
+
+            if submit:
+                if not rid_str.strip().isdigit():
+                    st.error("Receiver ID must be a whole number.")
+                    st.stop()
+                if rdata.strip() == "":
+                    st.error(f"{selectedField} cannot be empty.")
+                    st.stop()
+
+                rid = int(rid_str.strip())
+                try:
+                    rowcount = execute_write(update_field, "receivers", rid, selectedField, rdata)
+                    if rowcount == 0:
+                        st.warning(f"No record found for Receiver_ID = {rid}.")
+                    else:
+                        st.success("Successfully updated the record.")
+                except Exception as e:
+                    st.error(f"Update failed: {e}")
+
+        # Delete from receivers
+        elif selectedOperation == "Delete Records":
+            with st.form("delete_receiver"):
+                rid_str = st.text_input("Receiver ID")
+                submit = st.form_submit_button("Delete Records")
+
+            if submit:
+                if not rid_str.strip().isdigit():
+                    st.error("Receiver ID must be a whole number.")
+                else:
+                    rid = int(rid_str.strip())
+                    try:
+                        execute_write(delete_row, "receivers", rid)
+                        st.success("Successfully deleted the record.")
+                    except Exception as e:
+                        st.error(f"Delete failed: {e}")
+
+    elif selectedTable == "Food Listings":
+
+        selectedOperation = st.selectbox("Select Operation", OPERATIONS)
+
+        # Insert into food_listings
+        if selectedOperation == "Insert Records":
+            with st.form("insert_food"):
+                fid_str = st.text_input("Food ID")
+                fname = st.text_input("Food Name")
+                fqty_str = st.text_input("Quantity")
+                fexp_str = st.text_input("Expiry Date (YYYY-MM-DD)")
+                pid_str = st.text_input("Provider ID")
+                ptype = st.text_input("Provider Type")
+                flocation = st.text_input("Location")
+                ftype = st.text_input("Food Type")
+                mtype = st.text_input("Meal Type")
+                submit = st.form_submit_button("Insert Records")
+
+            if submit:
+                # numeric checks
+                if not fid_str.strip().isdigit():
+                    st.error("Food ID must be a whole number.")
+                elif not fqty_str.strip().isdigit():
+                    st.error("Quantity must be a whole number.")
+                elif not pid_str.strip().isdigit():
+                    st.error("Provider ID must be a whole number.")
+                # required text
+                elif not all([fname.strip(), ptype.strip(), flocation.strip(), ftype.strip(), mtype.strip(),
+                              fexp_str.strip()]):
+                    st.error("All fields are required.")
+                else:
+                    fexp = parse_date(fexp_str)
+                    if fexp is None:
+                        st.error("Expiry Date must be in YYYY-MM-DD format.")
+                    else:
+                        fid = int(fid_str.strip())
+                        fqty = int(fqty_str.strip())
+                        pid = int(pid_str.strip())
+
+                        try:
+                            execute_write(insert_row, "food_listings", (fid, fname, fqty, fexp, pid, ptype, flocation, ftype, mtype))
+                            st.success("Successfully inserted the record")
+
+                        except Exception as e:
+                            st.error(f"Insert failed: {e}")
+
+        # Update to food_listings
+        elif selectedOperation == "Update Records":
+            with st.form("update_food"):
+                updatable_fields = [
+                    "Food_Name", "Quantity", "Expiry_Date", "Provider_ID",
+                    "Provider_Type", "Location", "Food_Type", "Meal_Type"
+                ]
+                selectedField = st.selectbox("Update Field", updatable_fields)
+                fid_str = st.text_input("Food ID")
+                fdata = st.text_input(f"Enter {selectedField}")
+                submit = st.form_submit_button("Update Records")
+
+            if submit:
+                if not fid_str.strip().isdigit():
+                    st.error("Food ID must be a whole number.")
+                    st.stop()
+                if fdata.strip() == "":
+                    st.error(f"{selectedField} cannot be empty.")
+                    st.stop()
+
+                # type handling per field
+                value = fdata.strip()
+
+                if selectedField in ("Quantity", "Provider_ID"):
+                    if not value.isdigit():
+                        st.error(f"{selectedField} must be a whole number.")
+                        st.stop()
+                    value = int(value)
+
+
+                elif selectedField == "Expiry_Date":
+                    d = parse_date(value)
+                    if d is None:
+                        st.error("Expiry Date must be in YYYY-MM-DD format.")
+                        st.stop()
+                    value = d
+
+                fid = int(fid_str.strip())
+                try:
+                    rowcount = execute_write(update_field, "food_listings", fid, selectedField, value)
+                    if rowcount == 0:
+                        st.warning(f"No record found for Food_ID = {fid}.")
+                    else:
+                        st.success("Successfully updated the record.")
+                except Exception as e:
+                    st.error(f"Update failed: {e}")
+
+        # Delete from food_listings
+        elif selectedOperation == "Delete Records":
+            with st.form("delete_food"):
+                fid_str = st.text_input("Food ID")
+                submit = st.form_submit_button("Delete Records")
+
+            if submit:
+                if not fid_str.strip().isdigit():
+                    st.error("Food ID must be a whole number.")
+                else:
+                    fid = int(fid_str.strip())
+                    try:
+                        execute_write(delete_row, "food_listings", fid)
+                        st.success("Successfully deleted the record.")
+                    except Exception as e:
+                        st.error(f"Delete failed: {e}")
+
+    elif selectedTable == "Claims":
+
+        selectedOperation = st.selectbox("Select Operation", OPERATIONS)
+
+        # Insert into claims
+        if selectedOperation == "Insert Records":
+            with st.form("insert_claim"):
+                # Reserving takes the quantity off the listing and records a Pending claim now;
+                # unticked, the claim row is inserted exactly as entered
+                reserveListing = st.checkbox("Reserve from the listing", value=True)
+                cid_str = st.text_input("Claim ID (optional when reserving)")
+                fid_str = st.text_input("Food ID")
+                rid_str = st.text_input("Receiver ID")
+                rqty = st.number_input("Quantity to reserve", min_value=1, value=1, step=1)
+                cstatus = st.selectbox("Status", ["Pending", "Completed", "Cancelled"])
+                ctime_str = st.text_input("Timestamp (YYYY-MM-DD HH:MM:SS)")
+                submit = st.form_submit_button("Insert Records")
+
+            if submit and reserveListing:
+                if cid_str.strip() != "" and not cid_str.strip().isdigit():
+                    st.error("Claim ID must be a whole number.")
+
+                elif not fid_str.strip().isdigit():
+                    st.error("Food ID must be a whole number.")
+
+                elif not rid_str.strip().isdigit():
+                    st.error("Receiver ID must be a whole number.")
+
+                else:
+                    try:
+                        reserved = execute_reservation(int(fid_str.strip()), int(rid_str.strip()), int(rqty),
+                                                       int(cid_str.strip()) if cid_str.strip() else None)
+                        st.success(f"Reserved {int(rqty)} as Claim ID {reserved['claim_id']}, "
+                                   f"{reserved['remaining']} left on the listing.")
+
+                    except ReservationError as e:
+                        st.error(str(e))
+
+                    except Exception as e:
+                        st.error(f"Reservation failed: {e}")
+
+            elif submit:
+                if not cid_str.strip().isdigit():
+                    st.error("Claim ID must be a whole number.")
+
+                elif not fid_str.strip().isdigit():
+                    st.error("Food ID must be a whole number.")
+
+                elif not rid_str.strip().isdigit():
+                    st.error("Receiver ID must be a whole number.")
+
+                elif ctime_str.strip() == "":
+                    st.error("Timestamp is required (YYYY-MM-DD HH:MM:SS).")
+
+                else:
+                    ctime = parse_ts(ctime_str)
+                    if ctime is None:
+                        st.error("Timestamp must be in format YYYY-MM-DD HH:MM:SS.")
+
+                    else:
+                        cid = int(cid_str.strip())
+                        fid = int(fid_str.strip())
+                        rid = int(rid_str.strip())
+
+                        try:
+                            execute_write(insert_row, "claims", (cid, fid, rid, cstatus, ctime))
+                            st.success("Successfully inserted the record.")
+
+                        except Exception as e:
+                            st.error(f"Insert failed: {e}")
+
+        # Update to claims
+        elif selectedOperation == "Update Records":
+
+            with st.form("update_claim"):
+                updatable_fields = ["Food_ID", "Receiver_ID", "Status", "Timestamp"]
+                selectedField = st.selectbox("Update Field", updatable_fields)
+                cid_str = st.text_input("Claim ID")
+                cdata_str = st.text_input(f"Enter {selectedField} (for Timestamp use YYYY-MM-DD HH:MM:SS)")
+                submit = st.form_submit_button("Update Records")
+
+            if submit:
+                if not cid_str.strip().isdigit():
+                    st.error("Claim ID must be a whole number.")
+                    st.stop()
+                if cdata_str.strip() == "":
+                    st.error(f"{selectedField} cannot be empty.")
+                    st.stop()
+
+                value = cdata_str.strip()
+
+                if selectedField in ("Food_ID", "Receiver_ID"):
+
+                    if not value.isdigit():
+                        st.error(f"{selectedField} must be a whole number.")
+                        st.stop()
+                    value = int(value)
+
+                elif selectedField == "Status":
+                    if value not in ["Pending", "Completed", "Cancelled"]:
+                        st.error("Status must be one of: Pending, Completed, Cancelled.")
+                        st.stop()
+
+                elif selectedField == "Timestamp":
+                    ts = parse_ts(value)
+                    if ts is None:
+                        st.error("Timestamp must be in format YYYY-MM-DD HH:MM:SS.")
+                        st.stop()
+                    value = ts
+
+                cid = int(cid_str.strip())
+                try:
+                    rowcount = execute_write(update_field, "claims", cid, selectedField, value)
+                    if rowcount == 0:
+                        st.warning(f"No record found for Claim_ID = {cid}.")
+                    else:
+                        st.success("Successfully updated the record.")
+                except Exception as e:
+                    st.error(f"Update failed: {e}")
+
+        # Delete from claims
+        elif selectedOperation == "Delete Records":
+            with st.form("delete_claim"):
+                cid_str = st.text_input("Claim ID")
+                submit = st.form_submit_button("Delete Records")
+
+            if submit:
+                if not cid_str.strip().isdigit():
+                    st.error("Claim ID must be a whole number.")
+                else:
+                    cid = int(cid_str.strip())
+                    try:
+                        execute_write(delete_row, "claims", cid)
+                        st.success("Successfully deleted the record.")
+                    except Exception as e:
+                        st.error(f"Delete failed: {e}")
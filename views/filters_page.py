@@ -0,0 +1,68 @@
+import pandas as pd
+import streamlit as st
+
+from queries import PROVIDERS_BY_CITY, PROVIDER_BY_ID, RECEIVERS_BY_CITY, RECEIVER_BY_ID
+from views.shared import fetch_all
+
+
+def render():
+    st.title("Provider and Receiver Filters")
+
+    selectedEntity = st.selectbox("Search for", ["Providers", "Receivers"])
+
+    # Fetch Provider details
+    if selectedEntity == "Providers":
+        selectFilter = st.selectbox("Search based on", ["City", "Provider ID"])
+
+        # If searching based on City
+        if selectFilter == "City":
+            provider_city = st.text_input("Enter City")
+
+            if provider_city is not None and st.button("Search"):
+                st.subheader(f"Search results for '{provider_city}'")
+                provider_city_result = fetch_all(PROVIDERS_BY_CITY, (provider_city.strip(),))
+                provider_city_df = pd.DataFrame(provider_city_result, columns=["Provider ID", "Name",
+                                                                               "Address", "Contact"])
+                st.dataframe(provider_city_df)
+
+        # If searching based on ID
+        elif selectFilter == "Provider ID":
+            provider_id = st.text_input("Enter Provider ID")
+
+            if provider_id is not None and st.button("Search"):
+                if not provider_id.strip().isdigit():
+                    st.error("Provider ID must be a whole number.")
+                    st.stop()
+
+                st.subheader(f"Search results for '{provider_id}'")
+                provider_id_result = fetch_all(PROVIDER_BY_ID, (int(provider_id.strip()),))
+                provider_id_df = pd.DataFrame(provider_id_result, columns=["Name", "Address", "Contact"])
+                st.dataframe(provider_id_df)
+
+    # Fetch receiver details
+    elif selectedEntity == "Receivers":
+        selectFilter = st.selectbox("Search based on", ["City", "Receiver ID"])
+
+        # If searching based on City
+        if selectFilter == "City":
+            receiver_city = st.text_input("Enter City")
+
+            if receiver_city is not None and st.button("Search"):
+                st.subheader(f"Search results for '{receiver_city}'")
+                receiver_city_result = fetch_all(RECEIVERS_BY_CITY, (receiver_city.strip(),))
+                receiver_city_df = pd.DataFrame(receiver_city_result, columns=["Receiver ID", "Name", "Contact"])
+                st.dataframe(receiver_city_df)
+
+        # If searching based on ID
+        elif selectFilter == "Receiver ID":
+            receiver_id = st.text_input("Enter Receiver ID")
+
+            if receiver_id is not None and st.button("Search"):
+                if not receiver_id.strip().isdigit():
+                    st.error("Receiver ID must be a whole number.")
+                    st.stop()
+
+                st.subheader(f"Search results for '{receiver_id}'")
+                receiver_id_result = fetch_all(RECEIVER_BY_ID, (int(receiver_id.strip()),))
+                receiver_id_df = pd.DataFrame(receiver_id_result, columns=["Name", "Contact"])
+                st.dataframe(receiver_id_df)
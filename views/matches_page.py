@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from views.shared import get_matcher
+
+
+def render():
+    st.title("Food Matches")
+
+    receiverCol, dateCol = st.columns(2)
+    receiver_id = receiverCol.text_input("Enter Receiver ID")
+    match_date = dateCol.date_input("Match as of", value=datetime.now().date())
+
+    mealCol, typeCol, limitCol = st.columns(3)
+    meal_type = mealCol.selectbox("Preferred Meal Type", ["Any", "Breakfast", "Lunch", "Dinner", "Snacks"])
+    food_type = typeCol.selectbox("Food Type", ["Any", "Vegetarian", "Non-Vegetarian", "Vegan"])
+    limit = limitCol.selectbox("Matches", [10, 25, 50])
+
+    if receiver_id and st.button("Find Matches"):
+        if not receiver_id.strip().isdigit():
+            st.error("Receiver ID must be a whole number.")
+            st.stop()
+
+        matches = get_matcher().match(
+            int(receiver_id.strip()),
+            today=match_date,
+            limit=limit,
+            meal_type=None if meal_type == "Any" else meal_type,
+            food_type=None if food_type == "Any" else food_type,
+        )
+
+        if not matches:
+            st.info("No food with quantity left that has not expired matches this receiver.")
+        else:
+            matches_df = pd.DataFrame([listing for _, listing in matches])
+            matches_df.insert(0, "Score", [round(score, 3) for score, _ in matches])
+            st.dataframe(matches_df)
@@ -0,0 +1,45 @@
+import pandas as pd
+import streamlit as st
+
+from backends import BACKEND
+from profiling import PROFILER
+from views.shared import (LOADED, get_change_feed, get_chart_cache, get_pool, get_result_cache, get_search_index,
+                          get_snapshot)
+
+
+def render():
+    st.title("Performance")
+
+    # Shared resources of this server process
+    gauges = {
+        "pool": get_pool().stats(),
+        "result_cache": get_result_cache().stats(),
+        "chart_cache": get_chart_cache().stats(),
+        # The in-memory indexes are only shown once another page has built them
+        "snapshot": get_snapshot().stats() if "snapshot" in LOADED else {"status": "not loaded"},
+        "search": get_search_index().stats() if "search" in LOADED else {"status": "not loaded"},
+        **({} if BACKEND.read_only else {"change_feed": get_change_feed().stats()}),
+    }
+    for name, stats in gauges.items():
+        st.subheader(name.replace("_", " ").title())
+        st.dataframe(pd.DataFrame([stats]))
+
+    # Time per stage (execute, fetch, dataframe, plot, savefig, write) and query
+    st.subheader("Timings")
+    timings = PROFILER.summary()
+    if timings:
+        st.dataframe(pd.DataFrame(timings))
+    else:
+        st.info("Nothing has been timed yet, visit the other pages first.")
+
+    st.subheader(f"Slow Queries (over {PROFILER.slow_ms:.0f} ms)")
+    if PROFILER.slow_queries:
+        st.dataframe(pd.DataFrame(list(PROFILER.slow_queries)[::-1]))
+    else:
+        st.info("No slow queries.")
+
+    metricsCol, downloadCol, resetCol = st.columns(3)
+    if metricsCol.button("Write Prometheus File"):
+        st.success(f"Written to {PROFILER.write_prometheus('metrics/food_app.prom', gauges)}")
+    downloadCol.download_button("Download Metrics", PROFILER.prometheus_text(gauges), file_name="food_app.prom")
+    resetCol.button("Reset Timings", on_click=PROFILER.reset)
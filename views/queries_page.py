@@ -0,0 +1,73 @@
+from functools import partial
+
+import streamlit as st
+
+from backends import BACKEND
+from export import EXPORT_FORMATS, query_source
+from queries import REGISTRY
+from query_engine import bind_params, run_concurrent
+from views.shared import (cached_fetch, export_button, export_download, get_chart_cache, get_pool, get_result_cache,
+                          get_snapshot, live_query_results, show_query_results)
+
+QUERIES = [spec["title"] for spec in REGISTRY]
+
+
+def render():
+    st.title("15 Queries")
+
+    # Claims-based queries read the hot claims table unless a longer history is asked for
+    historyCol, sinceCol = st.columns(2)
+    history = historyCol.selectbox("Claims history", ["Recent (not archived)", "Full history"])
+    claimsSince = sinceCol.date_input("Only claims since", value=None)
+    claimsWindow = {"history": "all" if history == "Full history" else None, "since": claimsSince}
+
+    # Overview of all 15 queries from the in-memory snapshot; a window over the archived
+    # claims runs them concurrently on separate pooled connections instead
+    if st.checkbox("Show all 15 queries"):
+        overview = {spec["id"]: get_snapshot().run_query(spec, bind_params(spec), claimsWindow) for spec in REGISTRY}
+
+        if None in overview.values():
+            overviewFetch = partial(cached_fetch, pool=get_pool(), cache=get_result_cache())
+            try:
+                overview = run_concurrent(overviewFetch, REGISTRY, use_summaries=BACKEND.use_summaries, timeout=30,
+                                          window=claimsWindow)
+            except TimeoutError as e:
+                st.error(str(e))
+                st.stop()
+
+        for spec in REGISTRY:
+            st.header(spec["title"])
+            for statement in spec["statements"]:
+                if statement.get("show", True):
+                    st.dataframe(overview[spec["id"]][statement["id"]])
+            for i, chart in enumerate(spec.get("charts", [])):
+                st.image(get_chart_cache().render(f"{spec['id']}:{i}", chart,
+                                                  overview[spec["id"]][chart["statement"]]))
+        st.stop()
+
+    # Dropdown of all important queries
+    selectedQuery = st.selectbox("Select Queries", QUERIES)
+    spec = REGISTRY[QUERIES.index(selectedQuery)]
+    values = bind_params(spec)
+
+    # Inputs for parameterized queries, e.g. the city of query3
+    for name, default in spec.get("params", {}).items():
+        values[name] = st.text_input(f"Enter {name}", value=default).strip()
+
+    if spec.get("subheader"):
+        st.subheader(spec["subheader"].format(**values))
+
+    # Live updates redraw the results as writes come in, from this session or any other
+    if not BACKEND.read_only and st.checkbox("Live updates"):
+        live_query_results(spec, values, claimsWindow)
+    else:
+        show_query_results(spec, values, claimsWindow)
+
+    # Export of a result, streamed again from the database rather than from the cached frame
+    statementIds = [statement["id"] for statement in spec["statements"]]
+    exportIdCol, formatCol, exportCol = st.columns(3)
+    exportId = exportIdCol.selectbox("Export result", statementIds)
+    exportFormat = formatCol.selectbox("Export format", list(EXPORT_FORMATS))
+    export_button(exportCol, "Export Result", "result_export", (exportId, exportFormat, values, claimsWindow),
+                  lambda: export_download(query_source(exportId, values, claimsWindow, BACKEND.use_summaries),
+                                          f"{exportId}_df", exportFormat))
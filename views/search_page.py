@@ -0,0 +1,35 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from search import SEARCH_FIELDS
+from views.shared import get_search_index
+
+SEARCH_TABLES = {"Providers": "providers", "Receivers": "receivers", "Food Listings": "food_listings"}
+
+
+def render():
+    st.title("Search")
+
+    queryCol, limitCol = st.columns([3, 1])
+    search_query = queryCol.text_input("Search names, addresses, cities and food names")
+    search_limit = limitCol.selectbox("Results", [20, 50, 100])
+    search_in = st.multiselect("Search in", list(SEARCH_TABLES), default=list(SEARCH_TABLES))
+
+    if search_query.strip() and search_in:
+        start = time.perf_counter()
+        results = get_search_index().search(search_query, [SEARCH_TABLES[name] for name in search_in], search_limit)
+        st.caption(f"{len(results)} results in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        if not results:
+            st.info("Nothing matches every word of the search.")
+
+        # One table of results per kind of record, in rank order
+        for name in search_in:
+            table = SEARCH_TABLES[name]
+            rows = [result for result in results if result["Table"] == table]
+            if rows:
+                key, fields = SEARCH_FIELDS[table]
+                st.subheader(name)
+                st.dataframe(pd.DataFrame(rows, columns=["ID", *fields, "Score"]).rename(columns={"ID": key}))
@@ -0,0 +1,287 @@
+import logging
+import tempfile
+import threading
+import time
+from datetime import datetime
+from functools import partial
+
+import streamlit as st
+
+from backends import BACKEND
+from changelog import ChangeFeed
+from db_pool import ConnectionPool
+from profiling import PROFILER, sql_label
+from query_cache import ResultCache
+
+# Resources shared by the pages: the connection pool, caches and in-memory indexes of this
+# server process, and the write helpers. Nothing here touches the database or loads the
+# heavier modules (pandas, NumPy, matplotlib) until a page first asks for it
+
+TABLES = ["Providers", "Receivers", "Food Listings", "Claims"]
+
+feed_log = logging.getLogger("food.change_feed")
+
+# Names of the in-memory indexes this process has built, so the Performance page can show
+# their stats without loading them
+LOADED = set()
+
+
+def parse_date(date_str: str):
+    try:
+        return datetime.strptime(date_str.strip(), "%Y-%m-%d").date()
+
+    except Exception:
+        return None
+
+def parse_ts(ts: str):
+    try:
+        return datetime.strptime(ts.strip(), "%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return None
+
+# Setup the connection pool, shared by every session of this server process. It holds MySQL
+# connections, or read-only ones on an embedded SQLite/DuckDB file (see backends.py)
+@st.cache_resource
+def get_pool():
+    pool = ConnectionPool(connect=BACKEND.connect, size=8)
+    pool.warm(2)
+    return pool
+
+# Run a select on a pooled connection and return all rows. Parameterized selects use
+# the connection's cached server-side prepared statement. Execute and fetch are timed
+# under `label` (the query id, or the start of the SQL)
+def fetch_all(query, params=None, pool=None, label=None):
+    pool = pool or get_pool()
+
+    with (pool.prepared(query) if params else pool.cursor()) as cursor:
+        start = time.perf_counter()
+        cursor.execute(query, params or ())
+        executed = time.perf_counter()
+        rows = cursor.fetchall()
+
+    PROFILER.query(label or sql_label(query), query, executed - start, time.perf_counter() - executed, len(rows))
+    return rows
+
+# Cache of the 15 Queries results, shared by every session
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(ttl=300, max_entries=128)
+
+# Rendered chart images, shared by every session
+@st.cache_resource
+def get_chart_cache():
+    from charts import ChartCache
+
+    return ChartCache(max_entries=64)
+
+# Serve a select from the result cache, running it only on a miss or after expiry
+# (pass pool and cache explicitly when calling from worker threads)
+def cached_fetch(query_id, query, tables, params=None, pool=None, cache=None):
+    cache = cache or get_result_cache()
+    return cache.get_or_load(query_id, lambda: fetch_all(query, params, pool, query_id), tables, params)
+
+# Exports larger than this are not offered as a download; Streamlit holds every download in
+# memory, so big tables and results go through the export.py command line instead
+EXPORT_MAX_BYTES = 25 * 1024 * 1024
+
+# Stream an export from a pooled connection and return (bytes, file name) for
+# st.download_button. Rows arrive in chunks and spill to a temporary file past 8 MB, so only
+# the finished file, at most max_bytes, is read into memory
+def export_download(source, name, label, max_bytes=EXPORT_MAX_BYTES):
+    from export import EXPORT_FORMATS, export, export_filename
+
+    fmt, compression = EXPORT_FORMATS[label]
+    fileName = export_filename(name, fmt, compression)
+
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as out:
+        with get_pool().connection() as conn:
+            export(conn, source, out, fmt, compression)
+
+        if out.tell() > max_bytes:
+            raise RuntimeError(f"{fileName} is {out.tell() / 2 ** 20:.0f} MB, over the {max_bytes / 2 ** 20:.0f} MB "
+                               f"the app can serve. Export it with `python export.py` instead.")
+        out.seek(0)
+        return out.read(), fileName
+
+# Export button of a page. The finished export is kept in the session under `key`, so its
+# download button stays on the page across reruns until the export settings (`options`) change
+def export_button(column, label, key, options, make_export):
+    if column.button(label):
+        try:
+            st.session_state[key] = (options, *make_export())
+        except RuntimeError as e:
+            st.session_state.pop(key, None)
+            st.error(str(e))
+
+    saved = st.session_state.get(key)
+    if saved and saved[0] == options:
+        st.download_button("Download", saved[1], file_name=saved[2])
+
+# Callbacks run after every committed write as callback(table, primary key). They are called
+# from the change feed's thread, so they are given the pool rather than looking it up
+@st.cache_resource
+def get_write_listeners():
+    return []
+
+# Reloads of the in-memory indexes, run when the change feed may have missed changes
+@st.cache_resource
+def get_reloaders():
+    return []
+
+# Tails the change_log table and passes every committed write, made by this process or any
+# other (the API, the sweeper, another app server), to the result cache and the listeners
+@st.cache_resource
+def get_change_feed():
+    cache, listeners, reloaders = get_result_cache(), get_write_listeners(), get_reloaders()
+
+    def notify(change):
+        cache.invalidate_tables(change["table"])
+        for listener in list(listeners):
+            listener(change["table"], change["key"])
+
+    def resync():
+        cache.clear()
+        for reload in list(reloaders):
+            reload()
+
+    feed = ChangeFeed(partial(fetch_all, pool=get_pool(), label="change_log"), interval=0.5)
+    feed.subscribe(notify, on_resync=resync)
+    return feed.start()
+
+# Load an in-memory index and keep it current with every later write. The listener is added
+# before the load starts, and changes it gets during the load are applied once it finishes,
+# so a write committed while the tables are being read is never missed
+def load_listening(index):
+    lock = threading.Lock()
+    pending = []
+
+    def on_write(table, key):
+        with lock:
+            if pending is not None:
+                pending.append((table, key))
+                return
+        index.on_write(table, key)
+
+    get_write_listeners().append(on_write)
+    try:
+        index.load()
+    except Exception:
+        get_write_listeners().remove(on_write)
+        raise
+
+    with lock:
+        for table, key in pending:
+            index.on_write(table, key)
+        pending = None
+    get_reloaders().append(index.load)
+    return index
+
+# In-memory matching indexes, loaded on first use and kept current by every write
+@st.cache_resource
+def get_matcher():
+    from matching import MatchEngine
+
+    matcher = load_listening(MatchEngine(partial(fetch_all, pool=get_pool())))
+    LOADED.add("matcher")
+    return matcher
+
+# Columnar copy of the four tables that answers the 15 queries in memory, one per process
+# and kept current by every write like the matcher
+@st.cache_resource
+def get_snapshot():
+    from snapshot import Snapshot
+
+    snapshot = load_listening(Snapshot(partial(fetch_all, pool=get_pool())))
+    LOADED.add("snapshot")
+    return snapshot
+
+# Word index over names, addresses, cities and food names for the Search page, kept current
+# by every write like the matcher
+@st.cache_resource
+def get_search_index():
+    from search import SearchIndex
+
+    index = load_listening(SearchIndex(partial(fetch_all, pool=get_pool())))
+    LOADED.add("search")
+    return index
+
+# Read a committed write's change_log entries straight away, so the caches and indexes have
+# them before the page reruns. The write has committed whatever happens here: when the log
+# cannot be read, the cached results of its tables are dropped and the background poll
+# brings the indexes up to date later
+def refresh_after_write(*tables):
+    try:
+        get_change_feed().poll()
+    except Exception:
+        feed_log.exception("Change log poll after a write to %s failed", ", ".join(tables))
+        get_result_cache().invalidate_tables(*tables)
+
+# Run a crud.py insert/update/delete in its own transaction and return the affected row count
+def execute_write(write, table, *args):
+    with PROFILER.trace("write", f"{write.__name__} {table}"), get_pool().cursor(commit=True) as cursor:
+        rowcount = write(cursor, table, *args)
+
+    refresh_after_write(table)
+    return rowcount
+
+# Apply a batch_crud.py batch in one transaction; returns (per-row outcomes, committed)
+def execute_batch(table, batch):
+    from batch_crud import apply_batch
+
+    with PROFILER.trace("write", f"apply_batch {table}"), get_pool().connection() as conn:
+        outcomes, committed = apply_batch(conn, table, batch)
+
+    if committed:
+        refresh_after_write(table)
+    return outcomes, committed
+
+# Claim food through reservation.py: the listing is locked, its quantity taken down and the
+# claim inserted in one transaction. Returns reserve()'s result
+def execute_reservation(food_id, receiver_id, quantity, claim_id=None):
+    from reservation import reserve
+
+    with PROFILER.trace("write", "reserve food_listings"), get_pool().connection() as conn:
+        result = reserve(conn, food_id, receiver_id, quantity, claim_id=claim_id)
+
+    refresh_after_write("food_listings", "claims")
+    return result
+
+# Tables and charts of one of the 15 queries, served from the snapshot or through the shared
+# result cache when it cannot answer
+def show_query_results(spec, values, window):
+    from query_engine import run_query
+
+    results = get_snapshot().run_query(spec, values, window)
+    if results is None:
+        results = run_query(cached_fetch, spec, values, use_summaries=BACKEND.use_summaries, window=window)
+
+    for statement in spec["statements"]:
+        if statement.get("show", True):
+            if statement.get("subheader"):
+                st.subheader(statement["subheader"])
+            st.dataframe(results[statement["id"]])
+
+    # Charts are rendered once per data version and served from the shared image cache
+    for i, chart in enumerate(spec.get("charts", [])):
+        st.image(get_chart_cache().render(f"{spec['id']}:{i}", chart, results[chart["statement"]]))
+
+# The same, redrawn every second while Live updates is on. The change feed keeps the snapshot
+# and the result cache current, so a redraw reads memory and only re-queries what a write touched
+@st.fragment(run_every=1)
+def live_query_results(spec, values, window):
+    show_query_results(spec, values, window)
+
+    recent = get_change_feed().recent
+    if recent:
+        last = recent[-1]
+        st.caption(f"Last change: {last['operation']} {last['table']} {last['key']} at {last['changed_at']:%H:%M:%S}")
+
+# Pages that read data start the change feed, and with it the first database connection.
+# The embedded files take no writes and have no change log
+def start_change_feed():
+    if BACKEND.read_only:
+        return
+    try:
+        get_change_feed()
+    except Exception as e:
+        st.sidebar.warning(f"Live updates are off, the change log could not be read: {e}")
@@ -0,0 +1,51 @@
+import pandas as pd
+import streamlit as st
+
+from backends import BACKEND
+from export import EXPORT_FORMATS, table_source
+from pagination import VIEW_TABLES, fetch_page
+from views.shared import TABLES, cached_fetch, export_button, export_download, fetch_all
+
+
+def render():
+    st.title("View Tables")
+
+    # A dropdown for user to select which table to view
+    selectedTable = st.selectbox("Select Table", TABLES)
+
+    spec = VIEW_TABLES[selectedTable]
+
+    # Sorting and page size controls
+    sortCol, orderCol, sizeCol = st.columns(3)
+    sortLabel = sortCol.selectbox("Sort by", spec["labels"])
+    descending = orderCol.selectbox("Order", ["Ascending", "Descending"]) == "Descending"
+    pageSize = sizeCol.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+    sortColumn = spec["columns"][spec["labels"].index(sortLabel)]
+
+    # Start cursor of every page visited so far, reset whenever the table or sorting changes
+    viewKey = (selectedTable, sortColumn, descending, pageSize)
+    if st.session_state.get("view_key") != viewKey:
+        st.session_state.view_key = viewKey
+        st.session_state.page_starts = [None]
+
+    pageStarts = st.session_state.page_starts
+
+    # Only the visible page is fetched from the database
+    table, nextAfter = fetch_page(fetch_all, spec, sortColumn, descending, pageSize, pageStarts[-1])
+    table_df = pd.DataFrame(table, columns=spec["labels"])
+    st.dataframe(table_df)
+
+    rowQuery, rowParams = BACKEND.row_count_query(spec["table"])
+    estimate = cached_fetch(f"row_estimate_{spec['table']}", rowQuery, [spec["table"]], rowParams)
+    estimatedRows = int(estimate[0][0] or 0) if estimate else 0
+    st.caption(f"Page {len(pageStarts)} of about {max(1, -(-estimatedRows // pageSize))} (~{estimatedRows} rows)")
+
+    prevCol, nextCol = st.columns(2)
+    prevCol.button("Previous Page", disabled=len(pageStarts) == 1, on_click=pageStarts.pop)
+    nextCol.button("Next Page", disabled=nextAfter is None, on_click=pageStarts.append, args=(nextAfter,))
+
+    # Export of the whole table, not just the visible page
+    formatCol, exportCol = st.columns(2)
+    exportFormat = formatCol.selectbox("Export format", list(EXPORT_FORMATS))
+    export_button(exportCol, "Export Table", "table_export", (spec["table"], exportFormat),
+                  lambda: export_download(table_source(spec["table"]), spec["table"], exportFormat))